@@ -1,6 +1,6 @@
 @echo off
 
-CD ..
-
-rem Cleans repo by removing everything that's not tracked in git, basically reverting to a state where the repo was just cloned
-git clean -fdx
\ No newline at end of file
+rem Cleans the project with a preset (binaries, intermediate, build, all-except-ddc, all) and shows the reclaimable size first.
+rem Without arguments the presets are listed to choose from; "Clean.bat all" does what `git clean -fdx` used to.
+rem See automation\clean.py for the options (--dry-run, --trash, --yes)
+python "%~dp0automation\clean.py" %*
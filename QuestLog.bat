@@ -1,2 +1,5 @@
-# Write to the file below, only UE logs
-adb logcat -s UE > ue-quest.log
\ No newline at end of file
+@echo off
+
+rem Captures UE and VrApi logcat lines from the Quest into size-rotated logs and summarizes FPS, frame/GPU times,
+rem CPU/GPU levels, stale frames and hitches per session. Stop with Ctrl+C. See automation\quest_logcat.py for options.
+python "%~dp0automation\quest_logcat.py" %*
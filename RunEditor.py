@@ -1,20 +1,27 @@
 from __future__ import annotations
 
 import configparser
+import os
+import queue
 import subprocess
 import sys
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple
-
-import tkinter as tk
-from tkinter import ttk, messagebox
-
-from automation.common.automation_common import (
-    find_uproject,
-    get_project_root,
-    load_ue_root,
+from typing import List, Optional, Sequence, Tuple
+
+from automation.common.automation_common import find_uproject, get_automation_state_dir, get_project_context
+from automation.common.ddc import DdcSettings, ddc_command_line_args, ddc_environment, load_ddc_settings
+from automation.common.editor_session import (
+    DEFAULT_PORT,
+    DEFAULT_READY_TIMEOUT,
+    READY_LOG_PATTERN,
+    launch_session,
+    tile_windows,
 )
+from automation.common.process_supervisor import STATUS_CRASHED, STATUS_RUNNING, ProcessSupervisor
+from automation.common.capture_run import CaptureRun, capture_args, read_capture_settings
 
 
 @dataclass(frozen=True)
@@ -39,26 +46,6 @@ def _hide_own_console_window_if_any() -> None:
         pass
 
 
-def _load_dev_repo_root_from_project_config() -> Path:
-    project_root = get_project_root()
-    config_path = project_root / "UEScripts" / "automation" / "config" / "project.config"
-    if not config_path.exists():
-        raise RuntimeError(f"project.config not found at: {config_path}")
-
-    config = configparser.ConfigParser()
-    config.read(config_path)
-
-    try:
-        dev_repo_root = Path(config["Paths"]["dev_repo_root"])
-    except KeyError:
-        raise RuntimeError("Missing 'dev_repo_root' in [Paths] section of project.config")
-
-    if not dev_repo_root.exists():
-        raise RuntimeError(f"dev_repo_root path does not exist: {dev_repo_root}")
-
-    return dev_repo_root
-
-
 def _resolve_paths(argv: List[str]) -> Paths:
     ue_root_override: Path | None = None
     dev_repo_root_override: Path | None = None
@@ -86,9 +73,10 @@ def _resolve_paths(argv: List[str]) -> Paths:
         if not dev_repo_root_override.exists():
             raise RuntimeError(f"--dev_repo_root does not exist: {dev_repo_root_override}")
 
-    ue_root = ue_root_override if ue_root_override else load_ue_root()
-    dev_repo_root = dev_repo_root_override if dev_repo_root_override else _load_dev_repo_root_from_project_config()
-    uproject = find_uproject(dev_repo_root)
+    context = get_project_context()
+    ue_root = ue_root_override if ue_root_override else context.ue_root
+    dev_repo_root = dev_repo_root_override if dev_repo_root_override else context.dev_repo_root
+    uproject = find_uproject(dev_repo_root) if dev_repo_root_override else context.dev_uproject
 
     return Paths(ue_root=ue_root, dev_repo_root=dev_repo_root, uproject=uproject)
 
@@ -134,6 +122,15 @@ def _unreal_editor_exe(ue_root: Path) -> Path:
     return exe_path
 
 
+def _ddc_settings() -> Optional[DdcSettings]:
+    # [DDC] in project.config; launches with --ue_root/--dev_repo_root may run without a project.config
+    try:
+        context = get_project_context()
+        return load_ddc_settings(context.project_config, context.project_root)
+    except RuntimeError:
+        return None
+
+
 def _parse_optional_int(text: str) -> int | None:
     stripped = text.strip()
     if not stripped:
@@ -154,6 +151,8 @@ def _build_command(
     pos_y: str,
     res_x: str,
     res_y: str,
+    connect_address: str = "127.0.0.1",
+    capture_args: Sequence[str] = (),
 ) -> List[str]:
     cmd: List[str] = [str(exe_path), str(uproject)]
 
@@ -164,7 +163,7 @@ def _build_command(
             cmd.append(map_value.strip())
     else:
         # Keep your current behavior:
-        cmd.append("127.0.0.1")
+        cmd.append(connect_address)
 
     if mode_lower == "ds":
         cmd.append("-server")
@@ -195,6 +194,13 @@ def _build_command(
     if new_console:
         cmd.append("-NewConsole")
 
+    ddc_settings = _ddc_settings()
+    if ddc_settings is not None:
+        cmd.extend(ddc_command_line_args(ddc_settings))
+
+    # Capture run: trace/CSV profiler capture (see automation/common/capture_run.py)
+    cmd.extend(capture_args)
+
     if extra_args.strip():
         cmd.extend(extra_args.strip().split())
 
@@ -216,6 +222,26 @@ def _format_command_for_display(cmd: List[str]) -> str:
 # Config persistence
 # ---------------------------
 
+MODES = ("DS", "Listen Server", "Client")
+PROFILE_SECTION_PREFIX = "Profile."
+
+
+@dataclass
+class LaunchSettings:
+    # Everything stored per mode in [State.<Mode>], and per name in [Profile.<Name>] (plus the mode)
+    mode: str = "DS"
+    map_dropdown: str = ""
+    map_text: str = ""
+    extra_args: str = ""
+    log: bool = True
+    new_console: bool = True
+    pos_x: str = "0"
+    pos_y: str = "0"
+    res_x: str = ""
+    res_y: str = ""
+    capture: bool = False
+
+
 def _mode_to_section(mode: str) -> str:
     # Stable section names in config file
     normalized = mode.strip().lower()
@@ -242,10 +268,398 @@ def _save_config_file(path: Path, config: configparser.ConfigParser) -> None:
         config.write(file)
 
 
-def main() -> int:
+def _read_launch_settings(config: configparser.ConfigParser, section: str, defaults: LaunchSettings) -> LaunchSettings:
+    if not config.has_section(section):
+        return defaults
+
+    return LaunchSettings(
+        mode=config.get(section, "mode", fallback=defaults.mode),
+        map_dropdown=config.get(section, "map_dropdown", fallback=defaults.map_dropdown),
+        map_text=config.get(section, "map_text", fallback=defaults.map_text),
+        extra_args=config.get(section, "extra_args", fallback=defaults.extra_args),
+        log=config.getboolean(section, "log", fallback=defaults.log),
+        new_console=config.getboolean(section, "new_console", fallback=defaults.new_console),
+        pos_x=config.get(section, "pos_x", fallback=defaults.pos_x),
+        pos_y=config.get(section, "pos_y", fallback=defaults.pos_y),
+        res_x=config.get(section, "res_x", fallback=defaults.res_x),
+        res_y=config.get(section, "res_y", fallback=defaults.res_y),
+        capture=config.getboolean(section, "capture", fallback=defaults.capture),
+    )
+
+
+def _write_launch_settings(config: configparser.ConfigParser, section: str, settings: LaunchSettings, include_mode: bool) -> None:
+    if not config.has_section(section):
+        config.add_section(section)
+
+    if include_mode:
+        config.set(section, "mode", settings.mode)
+    config.set(section, "map_dropdown", settings.map_dropdown)
+    config.set(section, "map_text", settings.map_text)
+    config.set(section, "extra_args", settings.extra_args)
+    config.set(section, "log", "true" if settings.log else "false")
+    config.set(section, "new_console", "true" if settings.new_console else "false")
+    config.set(section, "pos_x", settings.pos_x)
+    config.set(section, "pos_y", settings.pos_y)
+    config.set(section, "res_x", settings.res_x)
+    config.set(section, "res_y", settings.res_y)
+    config.set(section, "capture", "true" if settings.capture else "false")
+
+
+def _profile_names(config: configparser.ConfigParser) -> List[str]:
+    return [section[len(PROFILE_SECTION_PREFIX):] for section in config.sections() if section.startswith(PROFILE_SECTION_PREFIX)]
+
+
+def _default_launch_settings(config: configparser.ConfigParser, predefined_maps: List[Tuple[str, str]]) -> LaunchSettings:
+    return LaunchSettings(
+        mode=config.get("State", "last_mode", fallback="DS"),
+        map_dropdown=predefined_maps[0][0] if predefined_maps else "",
+    )
+
+
+def _load_launch_target(config: configparser.ConfigParser, predefined_maps: List[Tuple[str, str]], name: Optional[str]) -> LaunchSettings:
+    """
+    Settings for a headless launch: a named profile, a mode's last state ("DS", "Client", ...)
+    or, without a name, the last used mode
+    """
+    defaults = _default_launch_settings(config, predefined_maps)
+    if name is None:
+        return _read_launch_settings(config, _mode_to_section(defaults.mode), defaults)
+
+    for profile in _profile_names(config):
+        if profile.lower() == name.lower():
+            return _read_launch_settings(config, PROFILE_SECTION_PREFIX + profile, defaults)
+
+    for mode in MODES:
+        if mode.lower() == name.lower() or _mode_to_section(mode).lower() == f"state.{name.lower()}":
+            defaults.mode = mode
+            return _read_launch_settings(config, _mode_to_section(mode), defaults)
+
+    available = ", ".join(_profile_names(config) + list(MODES))
+    raise RuntimeError(f"Unknown launch profile '{name}'. Available: {available}")
+
+
+def _resolve_map_value(settings: LaunchSettings, predefined_maps: List[Tuple[str, str]]) -> str:
+    text_value = settings.map_text.strip()
+    if text_value:
+        return text_value
+
+    selected_name = settings.map_dropdown.strip()
+    if not selected_name:
+        return ""
+
+    for name, path in predefined_maps:
+        if name == selected_name:
+            return path
+
+    return selected_name
+
+
+def _command_from_settings(
+    exe_path: Path,
+    uproject: Path,
+    settings: LaunchSettings,
+    predefined_maps: List[Tuple[str, str]],
+    capture_args: Sequence[str] = (),
+) -> List[str]:
+    return _build_command(
+        exe_path=exe_path,
+        uproject=uproject,
+        mode=settings.mode,
+        map_value=_resolve_map_value(settings, predefined_maps),
+        extra_args=settings.extra_args,
+        enable_log=settings.log,
+        new_console=settings.new_console,
+        pos_x=settings.pos_x,
+        pos_y=settings.pos_y,
+        res_x=settings.res_x,
+        res_y=settings.res_y,
+        capture_args=capture_args,
+    )
+
+
+# ---------------------------
+# Capture runs
+# ---------------------------
+
+def _capture_preview_args(config: configparser.ConfigParser, settings: LaunchSettings, predefined_maps: List[Tuple[str, str]]) -> List[str]:
+    # The session folder and git revision are only known at launch
+    if not settings.capture:
+        return []
+    return capture_args(read_capture_settings(config), _resolve_map_value(settings, predefined_maps), settings.mode,
+                        "<revision>", Path("<session>") / "<session>.utrace")
+
+
+def _start_capture_run(
+    paths: Paths,
+    exe_path: Path,
+    config: configparser.ConfigParser,
+    settings: LaunchSettings,
+    predefined_maps: List[Tuple[str, str]],
+) -> Tuple[CaptureRun, List[str]]:
+    """Creates the session folder of a capture run. Returns the capture and the command line to launch."""
+    capture = CaptureRun.create(paths.dev_repo_root, read_capture_settings(config),
+                                _resolve_map_value(settings, predefined_maps), settings.mode)
+    cmd = _command_from_settings(exe_path, paths.uproject, settings, predefined_maps, capture_args=capture.args())
+    return capture, cmd
+
+
+def _finish_capture_run(capture: CaptureRun, exit_code: Optional[int], cmd: List[str]) -> str:
+    files = capture.collect(exit_code, cmd)
+    return f"Capture run {capture.session.id}: {len(files)} file(s) in {capture.folder}"
+
+
+# ---------------------------
+# Session: DS + N clients
+# ---------------------------
+
+@dataclass
+class SessionSettings:
+    # Stored in [Session]
+    clients: int = 2
+    port: int = DEFAULT_PORT
+    timeout: float = DEFAULT_READY_TIMEOUT
+    ready_pattern: str = READY_LOG_PATTERN
+    tile: bool = True
+
+
+def _read_session_settings(config: configparser.ConfigParser) -> SessionSettings:
+    defaults = SessionSettings()
+    return SessionSettings(
+        clients=config.getint("Session", "clients", fallback=defaults.clients),
+        port=config.getint("Session", "port", fallback=defaults.port),
+        timeout=config.getfloat("Session", "timeout", fallback=defaults.timeout),
+        ready_pattern=config.get("Session", "ready_pattern", fallback=defaults.ready_pattern),
+        tile=config.getboolean("Session", "tile", fallback=defaults.tile),
+    )
+
+
+def _session_commands(
+    exe_path: Path,
+    uproject: Path,
+    config: configparser.ConfigParser,
+    predefined_maps: List[Tuple[str, str]],
+    session: SessionSettings,
+    log_path: Path,
+) -> Tuple[List[str], List[List[str]], bool, bool]:
+    """
+    Server + client command lines from the saved DS and Client state.
+    Returns (server_cmd, client_cmds, server_new_console, client_new_console).
+    """
+    defaults = _default_launch_settings(config, predefined_maps)
+    server_settings = _read_launch_settings(config, _mode_to_section("DS"), defaults)
+    server_settings.mode = "DS"
+    client_settings = _read_launch_settings(config, _mode_to_section("Client"), defaults)
+    client_settings.mode = "Client"
+
+    server_cmd = _command_from_settings(exe_path, uproject, server_settings, predefined_maps)
+    server_cmd.append(f"-ABSLOG={log_path}")
+    if session.port != DEFAULT_PORT:
+        server_cmd.append(f"-Port={session.port}")
+
+    connect_address = "127.0.0.1" if session.port == DEFAULT_PORT else f"127.0.0.1:{session.port}"
+    tiles = tile_windows(session.clients) if session.tile else [None] * session.clients
+    client_cmds: List[List[str]] = []
+    for tile in tiles:
+        if tile is not None:
+            client_settings.pos_x = str(tile.pos_x)
+            client_settings.pos_y = str(tile.pos_y)
+            client_settings.res_x = str(tile.res_x)
+            client_settings.res_y = str(tile.res_y)
+        client_cmds.append(_build_command(
+            exe_path=exe_path,
+            uproject=uproject,
+            mode="Client",
+            map_value="",
+            extra_args=client_settings.extra_args,
+            enable_log=client_settings.log,
+            new_console=client_settings.new_console,
+            pos_x=client_settings.pos_x,
+            pos_y=client_settings.pos_y,
+            res_x=client_settings.res_x,
+            res_y=client_settings.res_y,
+            connect_address=connect_address,
+        ))
+
+    return server_cmd, client_cmds, server_settings.new_console, client_settings.new_console
+
+
+def _run_session(
+    paths: Paths,
+    exe_path: Path,
+    config: configparser.ConfigParser,
+    session: SessionSettings,
+    output=print,
+    supervisor: Optional[ProcessSupervisor] = None,
+) -> List[subprocess.Popen]:
+    predefined_maps = _load_predefined_maps(config)
+    session_dir = get_automation_state_dir(paths.dev_repo_root) / "Sessions" / time.strftime("%Y%m%d-%H%M%S")
+    session_dir.mkdir(parents=True, exist_ok=True)
+    log_path = session_dir / "Server.log"
+
+    server_cmd, client_cmds, server_new_console, client_new_console = _session_commands(
+        exe_path, paths.uproject, config, predefined_maps, session, log_path
+    )
+    output(f"[Session] Server: {_format_command_for_display(server_cmd)}")
+    for index, cmd in enumerate(client_cmds, 1):
+        output(f"[Session] Client {index}: {_format_command_for_display(cmd)}")
+
+    names = iter(["Server"] + [f"Client {index}" for index in range(1, len(client_cmds) + 1)])
+
+    def spawn(cmd: List[str]) -> subprocess.Popen:
+        new_console = server_new_console if cmd is server_cmd else client_new_console
+        process = _spawn_editor(cmd, exe_path, new_console)
+        if supervisor is not None:
+            supervisor.add(next(names), cmd, process, respawn=lambda: _spawn_editor(cmd, exe_path, new_console))
+        return process
+
+    return launch_session(
+        server_cmd,
+        client_cmds,
+        spawn,
+        log_path=log_path,
+        port=session.port,
+        timeout=session.timeout,
+        ready_pattern=session.ready_pattern,
+        output=output,
+    )
+
+
+def _windows_command_line(cmd: List[str]) -> str:
+    # UE only reads a quoted value when the quote follows the '=' (-ExecCmds="stat unit, stat fps", -ABSLOG="C:\a b\x.log");
+    # subprocess would quote the whole argument instead, which UE cuts off at the first space
+    parts = []
+    for arg in cmd:
+        key, sep, value = arg.partition("=")
+        if arg.startswith("-") and sep and any(ch.isspace() for ch in value) and '"' not in value:
+            parts.append(f'{key}="{value}"')
+        else:
+            parts.append(subprocess.list2cmdline([arg]))
+    return " ".join(parts)
+
+
+def _spawn_editor(cmd: List[str], exe_path: Path, new_console: bool) -> subprocess.Popen:
+    creation_flags = 0
+    if sys.platform.startswith("win") and new_console:
+        creation_flags |= subprocess.CREATE_NEW_CONSOLE  # type: ignore[attr-defined]
+
+    # The local DDC path can only be overridden through the environment
+    ddc_settings = _ddc_settings()
+    env = {**os.environ, **ddc_environment(ddc_settings)} if ddc_settings is not None else None
+    args = _windows_command_line(cmd) if sys.platform.startswith("win") else cmd
+    return subprocess.Popen(args, cwd=str(exe_path.parent), creationflags=creation_flags, env=env)
+
+
+# ---------------------------
+# Headless launch (no tkinter)
+# ---------------------------
+
+def _pop_launch_args(argv: List[str]) -> Tuple[bool, Optional[str], bool, bool]:
+    """Returns (launch, profile, print_command, list_profiles) and removes those arguments from argv."""
+    launch = False
+    profile: Optional[str] = None
+    if "--launch" in argv:
+        index = argv.index("--launch")
+        launch = True
+        # The profile name is optional
+        if index + 1 < len(argv) and not argv[index + 1].startswith("--"):
+            profile = argv[index + 1]
+            del argv[index : index + 2]
+        else:
+            del argv[index]
+
+    print_command = "--print-command" in argv
+    if print_command:
+        index = argv.index("--print-command")
+        # '--print-command <profile>' works without --launch too
+        if profile is None and index + 1 < len(argv) and not argv[index + 1].startswith("--"):
+            profile = argv[index + 1]
+            del argv[index : index + 2]
+        else:
+            del argv[index]
+
+    list_profiles = "--list-profiles" in argv
+    if list_profiles:
+        argv.remove("--list-profiles")
+
+    return launch, profile, print_command, list_profiles
+
+
+def _pop_session_arg(argv: List[str]) -> Tuple[bool, Optional[int]]:
+    """Returns (session, client_count) for '--session [N]' and removes it from argv."""
+    if "--session" not in argv:
+        return False, None
+    index = argv.index("--session")
+    if index + 1 < len(argv) and argv[index + 1].isdigit():
+        client_count = int(argv[index + 1])
+        del argv[index : index + 2]
+        return True, client_count
+    del argv[index]
+    return True, None
+
+
+def _run_headless_session(argv: List[str], config: configparser.ConfigParser, client_count: Optional[int], print_only: bool) -> int:
+    try:
+        paths = _resolve_paths(argv)
+        exe_path = _unreal_editor_exe(paths.ue_root)
+        session = _read_session_settings(config)
+        if client_count is not None:
+            session.clients = client_count
+
+        if print_only:
+            server_cmd, client_cmds, _, _ = _session_commands(
+                exe_path, paths.uproject, config, _load_predefined_maps(config), session, Path("<session log>")
+            )
+            for cmd in [server_cmd] + client_cmds:
+                print(_format_command_for_display(cmd))
+            return 0
+
+        _run_session(paths, exe_path, config, session)
+        return 0
+    except Exception as exc:
+        print(f"[RunEditor] Error: {exc}", file=sys.stderr)
+        return 1
+
+
+def _run_headless(argv: List[str], config: configparser.ConfigParser, profile: Optional[str], print_only: bool) -> int:
+    try:
+        paths = _resolve_paths(argv)
+        exe_path = _unreal_editor_exe(paths.ue_root)
+        predefined_maps = _load_predefined_maps(config)
+        settings = _load_launch_target(config, predefined_maps, profile)
+
+        if print_only:
+            preview_args = _capture_preview_args(config, settings, predefined_maps)
+            print(_format_command_for_display(_command_from_settings(exe_path, paths.uproject, settings, predefined_maps, preview_args)))
+            return 0
+
+        if settings.capture:
+            # Waits for the run to end, so its output can be collected
+            capture, cmd = _start_capture_run(paths, exe_path, config, settings, predefined_maps)
+            print(f"[RunEditor] Capture run {profile or settings.mode}: {_format_command_for_display(cmd)}")
+            process = _spawn_editor(cmd, exe_path, settings.new_console)
+            print(f"[RunEditor] {_finish_capture_run(capture, process.wait(), cmd)}")
+            return 0
+
+        cmd = _command_from_settings(exe_path, paths.uproject, settings, predefined_maps)
+        print(f"[RunEditor] Launching {profile or settings.mode}: {_format_command_for_display(cmd)}")
+        _spawn_editor(cmd, exe_path, settings.new_console)
+        return 0
+    except Exception as exc:
+        print(f"[RunEditor] Error: {exc}", file=sys.stderr)
+        return 1
+
+
+# ---------------------------
+# GUI
+# ---------------------------
+
+def _run_gui(argv: List[str], config: configparser.ConfigParser, config_path: Path) -> int:
+    # Imported here so the headless launch never pays for tkinter
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+
     _hide_own_console_window_if_any()
 
-    argv = sys.argv[1:]
     try:
         paths = _resolve_paths(argv)
         exe_path = _unreal_editor_exe(paths.ue_root)
@@ -257,16 +671,27 @@ def main() -> int:
             print(f"[RunEditor] Error: {exc}")
         return 1
 
-    script_dir = Path(__file__).resolve().parent
-    config_path = script_dir / "RunEditor.config"
-
-    config = _load_config_file(config_path)
     predefined_maps = _load_predefined_maps(config)
 
     root = tk.Tk()
     root.title("Run Editor")
     root.columnconfigure(1, weight=1)
 
+    # Worker threads (sessions, supervisor exit callbacks) never touch tkinter: they queue calls for the UI thread
+    ui_calls: "queue.Queue[Tuple]" = queue.Queue()
+
+    def call_in_ui(func, *args) -> None:
+        ui_calls.put((func, args))
+
+    def drain_ui_calls() -> None:
+        while True:
+            try:
+                func, args = ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            func(*args)
+        root.after(100, drain_ui_calls)
+
     # Variables
     default_mode = config.get("State", "last_mode", fallback="DS")
     mode_var = tk.StringVar(value=default_mode)
@@ -280,6 +705,8 @@ def main() -> int:
     pos_y_var = tk.StringVar(value="0")
     res_x_var = tk.StringVar(value="")
     res_y_var = tk.StringVar(value="")
+    profile_var = tk.StringVar(value="")
+    capture_run_var = tk.BooleanVar(value=False)
 
     def add_row(label: str, widget: tk.Widget, row: int) -> None:
         ttk.Label(root, text=label).grid(row=row, column=0, sticky="w", padx=10, pady=6)
@@ -289,7 +716,7 @@ def main() -> int:
     mode_combo = ttk.Combobox(
         root,
         textvariable=mode_var,
-        values=["DS", "Listen Server", "Client"],
+        values=list(MODES),
         state="readonly",
     )
     add_row("Mode", mode_combo, 0)
@@ -312,6 +739,7 @@ def main() -> int:
     flags_frame = ttk.Frame(root)
     ttk.Checkbutton(flags_frame, text="Log (-log)", variable=log_var).pack(side="left", padx=(0, 12))
     ttk.Checkbutton(flags_frame, text="New Console (-NewConsole)", variable=new_console_var).pack(side="left")
+    ttk.Checkbutton(flags_frame, text="Capture run (trace + CSV)", variable=capture_run_var).pack(side="left", padx=(12, 0))
     add_row("Options", flags_frame, 4)
 
     pos_frame = ttk.Frame(root)
@@ -337,6 +765,22 @@ def main() -> int:
     command_preview.configure(state="disabled")
     add_row("Command preview", command_preview, 8)
 
+    # Named profiles, launchable without the GUI: RunEditor.py --launch <name>
+    profile_frame = ttk.Frame(root)
+    profile_combo = ttk.Combobox(profile_frame, textvariable=profile_var, values=_profile_names(config))
+    profile_combo.pack(side="left", fill="x", expand=True)
+    add_row("Profile", profile_frame, 9)
+
+    # Session: DS + N clients, clients start once the server listens
+    session_settings = _read_session_settings(config)
+    session_clients_var = tk.StringVar(value=str(session_settings.clients))
+    session_status_var = tk.StringVar(value="")
+    session_frame = ttk.Frame(root)
+    ttk.Label(session_frame, text="Clients").pack(side="left")
+    ttk.Spinbox(session_frame, from_=1, to=16, textvariable=session_clients_var, width=4).pack(side="left", padx=(6, 14))
+    ttk.Label(session_frame, textvariable=session_status_var).pack(side="left", padx=(14, 0))
+    add_row("Session", session_frame, 10)
+
     # -------------
     # State load/save logic
     # -------------
@@ -348,24 +792,39 @@ def main() -> int:
         if not config.has_section(section):
             config.add_section(section)
 
+    def current_settings() -> LaunchSettings:
+        return LaunchSettings(
+            mode=mode_var.get(),
+            map_dropdown=map_dropdown_var.get(),
+            map_text=map_text_var.get(),
+            extra_args=extra_args_var.get(),
+            log=log_var.get(),
+            new_console=new_console_var.get(),
+            pos_x=pos_x_var.get(),
+            pos_y=pos_y_var.get(),
+            res_x=res_x_var.get(),
+            res_y=res_y_var.get(),
+            capture=capture_run_var.get(),
+        )
+
+    def _apply_settings(settings: LaunchSettings) -> None:
+        map_dropdown_var.set(settings.map_dropdown)
+        map_text_var.set(settings.map_text)
+        extra_args_var.set(settings.extra_args)
+        log_var.set(settings.log)
+        new_console_var.set(settings.new_console)
+        pos_x_var.set(settings.pos_x)
+        pos_y_var.set(settings.pos_y)
+        res_x_var.set(settings.res_x)
+        res_y_var.set(settings.res_y)
+        capture_run_var.set(settings.capture)
+
     def _apply_mode_state(mode: str) -> None:
         nonlocal is_applying_mode_state
         is_applying_mode_state = True
         try:
-            section = _mode_to_section(mode)
-            if not config.has_section(section):
-                # No saved settings for this mode yet: keep current values
-                return
-
-            map_dropdown_var.set(config.get(section, "map_dropdown", fallback=map_dropdown_var.get()))
-            map_text_var.set(config.get(section, "map_text", fallback=map_text_var.get()))
-            extra_args_var.set(config.get(section, "extra_args", fallback=extra_args_var.get()))
-            log_var.set(config.getboolean(section, "log", fallback=log_var.get()))
-            new_console_var.set(config.getboolean(section, "new_console", fallback=new_console_var.get()))
-            pos_x_var.set(config.get(section, "pos_x", fallback=pos_x_var.get()))
-            pos_y_var.set(config.get(section, "pos_y", fallback=pos_y_var.get()))
-            res_x_var.set(config.get(section, "res_x", fallback=res_x_var.get()))
-            res_y_var.set(config.get(section, "res_y", fallback=res_y_var.get()))
+            # No saved settings for this mode yet: keep current values
+            _apply_settings(_read_launch_settings(config, _mode_to_section(mode), current_settings()))
         finally:
             is_applying_mode_state = False
 
@@ -375,18 +834,7 @@ def main() -> int:
         config.set("State", "last_mode", mode_var.get())
 
         # Store per-mode
-        section = _mode_to_section(mode_var.get())
-        _ensure_section(section)
-
-        config.set(section, "map_dropdown", map_dropdown_var.get())
-        config.set(section, "map_text", map_text_var.get())
-        config.set(section, "extra_args", extra_args_var.get())
-        config.set(section, "log", "true" if log_var.get() else "false")
-        config.set(section, "new_console", "true" if new_console_var.get() else "false")
-        config.set(section, "pos_x", pos_x_var.get())
-        config.set(section, "pos_y", pos_y_var.get())
-        config.set(section, "res_x", res_x_var.get())
-        config.set(section, "res_y", res_y_var.get())
+        _write_launch_settings(config, _mode_to_section(mode_var.get()), current_settings(), include_mode=False)
 
         _save_config_file(config_path, config)
 
@@ -402,36 +850,10 @@ def main() -> int:
 
         pending_save_handle = root.after(250, _write_current_state_to_config)
 
-    def resolve_selected_map() -> str:
-        text_value = map_text_var.get().strip()
-        if text_value:
-            return text_value
-
-        selected_name = map_dropdown_var.get().strip()
-        if not selected_name:
-            return ""
-
-        for name, path in predefined_maps:
-            if name == selected_name:
-                return path
-
-        return selected_name
-
     def get_current_command() -> List[str]:
-        chosen_map = resolve_selected_map()
-        return _build_command(
-            exe_path=exe_path,
-            uproject=paths.uproject,
-            mode=mode_var.get(),
-            map_value=chosen_map,
-            extra_args=extra_args_var.get(),
-            enable_log=log_var.get(),
-            new_console=new_console_var.get(),
-            pos_x=pos_x_var.get(),
-            pos_y=pos_y_var.get(),
-            res_x=res_x_var.get(),
-            res_y=res_y_var.get(),
-        )
+        settings = current_settings()
+        return _command_from_settings(exe_path, paths.uproject, settings, predefined_maps,
+                                      _capture_preview_args(config, settings, predefined_maps))
 
     def update_command_preview(*_args: object) -> None:
         try:
@@ -453,7 +875,7 @@ def main() -> int:
     # Save+preview update hooks
     for var in [map_dropdown_var, map_text_var, extra_args_var, pos_x_var, pos_y_var, res_x_var, res_y_var]:
         var.trace_add("write", update_command_preview)
-    for var in [log_var, new_console_var]:
+    for var in [log_var, new_console_var, capture_run_var]:
         var.trace_add("write", update_command_preview)
 
     def on_mode_changed(*_args: object) -> None:
@@ -468,29 +890,217 @@ def main() -> int:
     mode_var.trace_add("write", on_mode_changed)
     mode_combo.bind("<<ComboboxSelected>>", lambda _e: on_mode_changed())
 
+    def on_load_profile() -> None:
+        name = profile_var.get().strip()
+        if PROFILE_SECTION_PREFIX + name not in config:
+            messagebox.showerror("Load profile", f"No profile named '{name}'")
+            return
+        settings = _read_launch_settings(config, PROFILE_SECTION_PREFIX + name, current_settings())
+        # Switching the mode applies that mode's state first; the profile's values win
+        mode_var.set(settings.mode)
+        _apply_settings(settings)
+
+    def on_save_profile() -> None:
+        name = profile_var.get().strip()
+        if not name:
+            messagebox.showerror("Save profile", "Enter a profile name first")
+            return
+        _write_launch_settings(config, PROFILE_SECTION_PREFIX + name, current_settings(), include_mode=True)
+        _save_config_file(config_path, config)
+        profile_combo.configure(values=_profile_names(config))
+
+    ttk.Button(profile_frame, text="Load", command=on_load_profile).pack(side="left", padx=(6, 0))
+    ttk.Button(profile_frame, text="Save", command=on_save_profile).pack(side="left", padx=(6, 0))
+    profile_combo.bind("<<ComboboxSelected>>", lambda _e: on_load_profile())
+
     # Initial preview + ensure we persist at least once
     update_command_preview()
     _schedule_save()
 
-    def on_run() -> None:
-        try:
-            cmd = get_current_command()
+    # Every launched instance is tracked; samples go to Saved/Automation/Supervisor/<start time>.csv
+    supervisor = ProcessSupervisor(
+        csv_path=get_automation_state_dir(paths.dev_repo_root) / "Supervisor" / f"{time.strftime('%Y%m%d-%H%M%S')}.csv"
+    )
 
-            creation_flags = 0
-            if sys.platform.startswith("win") and new_console_var.get():
-                creation_flags |= subprocess.CREATE_NEW_CONSOLE  # type: ignore[attr-defined]
+    # Supervisor id -> (capture, command) of running capture runs, collected when the process exits
+    capture_runs: dict = {}
 
-            subprocess.Popen(cmd, cwd=str(exe_path.parent), creationflags=creation_flags)
+    def on_run() -> None:
+        try:
+            settings = current_settings()
+            capture = None
+            if settings.capture:
+                capture, cmd = _start_capture_run(paths, exe_path, config, settings, predefined_maps)
+            else:
+                cmd = get_current_command()
+            new_console = new_console_var.get()
+            process = _spawn_editor(cmd, exe_path, new_console)
+            name = f"{mode_var.get()} (capture)" if capture is not None else mode_var.get()
+            entry = supervisor.add(name, cmd, process, respawn=lambda: _spawn_editor(cmd, exe_path, new_console))
+            if capture is not None:
+                capture_runs[entry.id] = (capture, cmd)
         except Exception as exc:
             messagebox.showerror("Run failed", str(exc))
 
+    def on_run_session() -> None:
+        nonlocal pending_save_handle
+        try:
+            session_settings.clients = int(session_clients_var.get())
+        except ValueError:
+            messagebox.showerror("Run session", "Clients must be a number")
+            return
+
+        # The session uses the saved DS/Client state, so write pending edits first
+        if pending_save_handle is not None:
+            root.after_cancel(pending_save_handle)
+            pending_save_handle = None
+        _write_current_state_to_config()
+        _ensure_section("Session")
+        config.set("Session", "clients", str(session_settings.clients))
+        _save_config_file(config_path, config)
+
+        def report(text: str) -> None:
+            print(text)
+            call_in_ui(session_status_var.set, text.replace("[Session] ", ""))
+
+        def worker() -> None:
+            try:
+                _run_session(paths, exe_path, config, session_settings, output=report, supervisor=supervisor)
+            except Exception as exc:
+                call_in_ui(messagebox.showerror, "Run session failed", str(exc))
+                call_in_ui(session_status_var.set, "")
+
+        threading.Thread(target=worker, daemon=True).start()
+
     buttons = ttk.Frame(root)
+    ttk.Button(buttons, text="Run session", command=on_run_session).pack(side="left", padx=(0, 6))
     ttk.Button(buttons, text="Run", command=on_run).pack(side="left")
-    buttons.grid(row=9, column=0, columnspan=2, sticky="e", padx=10, pady=12)
+    buttons.grid(row=11, column=0, columnspan=2, sticky="e", padx=10, pady=12)
+
+    # -------------
+    # Supervisor panel
+    # -------------
+
+    root.rowconfigure(12, weight=1)
+    supervisor_frame = ttk.LabelFrame(root, text="Running instances")
+    supervisor_frame.grid(row=12, column=0, columnspan=2, sticky="nsew", padx=10, pady=(0, 10))
+    supervisor_frame.columnconfigure(0, weight=1)
+
+    columns = ("name", "pid", "status", "cpu", "rss", "peak", "handles", "uptime")
+    headings = ("Name", "PID", "Status", "CPU %", "RSS (MB)", "Peak (MB)", "Handles", "Uptime")
+    process_tree = ttk.Treeview(supervisor_frame, columns=columns, show="headings", height=5)
+    for column, heading in zip(columns, headings):
+        process_tree.heading(column, text=heading)
+        process_tree.column(column, width=140 if column in ("name", "status") else 80, anchor="w")
+    process_tree.tag_configure(STATUS_CRASHED, foreground="red")
+    process_tree.grid(row=0, column=0, sticky="nsew", padx=6, pady=6)
+
+    supervisor_status_var = tk.StringVar(value=f"Samples: {supervisor.csv_path}")
+    ttk.Label(supervisor_frame, textvariable=supervisor_status_var).grid(row=1, column=0, sticky="w", padx=6)
+
+    def on_process_exit(entry) -> None:
+        if entry.status == STATUS_CRASHED:
+            call_in_ui(supervisor_status_var.set, f"{entry.name} (pid {entry.pid}) exited abnormally with code {entry.exit_code}")
+        # Runs on the supervisor's sampling thread (or the one that killed the process), so moving the files
+        # doesn't block the UI. The supervisor calls this once per exit
+        pending = capture_runs.pop(entry.id, None)
+        if pending is not None:
+            capture, cmd = pending
+            try:
+                message = _finish_capture_run(capture, entry.exit_code, cmd)
+            except Exception as exc:
+                message = f"Collecting capture run {capture.session.id} failed: {exc}"
+            print(f"[RunEditor] {message}")
+            if entry.status != STATUS_CRASHED:
+                call_in_ui(supervisor_status_var.set, message)
+
+    supervisor.add_exit_callback(on_process_exit)
+
+    def selected_process_ids() -> List[int]:
+        return [int(item) for item in process_tree.selection()]
+
+    def on_kill() -> None:
+        for process_id in selected_process_ids():
+            supervisor.kill(process_id)
+        refresh_process_list(reschedule=False)
+
+    def on_restart() -> None:
+        try:
+            for process_id in selected_process_ids():
+                supervisor.restart(process_id)
+        except Exception as exc:
+            messagebox.showerror("Restart failed", str(exc))
+        refresh_process_list(reschedule=False)
+
+    def on_clear() -> None:
+        supervisor.forget_exited()
+        refresh_process_list(reschedule=False)
+
+    def refresh_process_list(reschedule: bool = True) -> None:
+        selection = set(process_tree.selection())
+        process_tree.delete(*process_tree.get_children())
+        for entry in supervisor.processes():
+            status = entry.status if entry.exit_code is None else f"{entry.status} ({entry.exit_code})"
+            if entry.restarts:
+                status += f", {entry.restarts} restart(s)"
+            running = entry.status == STATUS_RUNNING
+            process_tree.insert("", "end", iid=str(entry.id), tags=(entry.status,), values=(
+                entry.name,
+                entry.pid,
+                status,
+                f"{entry.cpu_percent:.0f}" if running else "",
+                f"{entry.rss_bytes / (1024 * 1024):.0f}" if running else "",
+                f"{entry.peak_rss_bytes / (1024 * 1024):.0f}",
+                entry.handles if running else "",
+                f"{int(entry.uptime // 60)}:{int(entry.uptime % 60):02d}" if running else "",
+            ))
+        process_tree.selection_set([item for item in selection if process_tree.exists(item)])
+        if reschedule:
+            root.after(1000, refresh_process_list)
+
+    supervisor_buttons = ttk.Frame(supervisor_frame)
+    ttk.Button(supervisor_buttons, text="Kill", command=on_kill).pack(side="left")
+    ttk.Button(supervisor_buttons, text="Restart", command=on_restart).pack(side="left", padx=(6, 0))
+    ttk.Button(supervisor_buttons, text="Clear exited", command=on_clear).pack(side="left", padx=(6, 0))
+    supervisor_buttons.grid(row=2, column=0, sticky="e", padx=6, pady=6)
+
+    refresh_process_list()
+    drain_ui_calls()
 
     root.mainloop()
+    supervisor.stop()
     return 0
 
 
+def main() -> int:
+    # RunEditor.py                          -> GUI
+    # RunEditor.py --launch [profile]       -> launch a saved profile/mode (default: last used mode) without the GUI
+    # RunEditor.py --print-command [profile] -> only print that command line
+    # RunEditor.py --list-profiles
+    # RunEditor.py --session [N]            -> DS + N clients (default: [Session] clients), using the saved DS and Client state
+    # Capture runs (capture = true in the mode/profile state) add trace/CSV capture arguments; --launch then waits for the
+    # process and collects its .utrace/.csv files into Saved/Automation/Captures/<session>/ (see [Capture] for the settings)
+    argv = sys.argv[1:]
+    session, client_count = _pop_session_arg(argv)
+    launch, profile, print_command, list_profiles = _pop_launch_args(argv)
+
+    script_dir = Path(__file__).resolve().parent
+    config_path = script_dir / "RunEditor.config"
+    config = _load_config_file(config_path)
+
+    if list_profiles:
+        for name in _profile_names(config) + list(MODES):
+            print(name)
+        return 0
+
+    if session:
+        return _run_headless_session(argv, config, client_count, print_only=print_command)
+
+    if launch or print_command:
+        return _run_headless(argv, config, profile, print_only=print_command)
+
+    return _run_gui(argv, config, config_path)
+
+
 if __name__ == "__main__":
-    raise SystemExit(main())
\ No newline at end of file
+    raise SystemExit(main())
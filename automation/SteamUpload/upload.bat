@@ -1,17 +1,11 @@
 @echo off
 setlocal
 
-REM === CONFIG ===
-set STEAMCMD_EXE=D:\UE\SteamCMD\steamcmd.exe
-set STEAM_USERNAME=sugarkickboy
-set APP_BUILD_VDF=D:\UE\AncientBlood\AncientBloodCore\Config\automation\Steam\app_build.vdf
-
-REM === RUN ===
-"%STEAMCMD_EXE%" ^
-	+login %STEAM_USERNAME% ^
-	+run_app_build "%APP_BUILD_VDF%" ^
-	+quit
+rem Uploads the depots configured in the [Steam], [SteamDepot <id>] and [SteamBuild <name>] sections of
+rem automation\config\project.config. Depots identical to their last upload are skipped; changed files are listed.
+rem Arguments are passed on, e.g. "upload.bat --dry-run" or "upload.bat --build beta". See automation\steam_upload.py
+python "%~dp0..\steam_upload.py" %*
 
 echo.
 echo Upload finished.
-pause
\ No newline at end of file
+pause
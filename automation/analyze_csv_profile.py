@@ -0,0 +1,132 @@
+# Summarizes a CSV profiler capture (per-stat avg/p50/p95/p99/max, hitch counts) and, with a baseline, fails when the
+# gated stats regressed beyond the thresholds in the [ProfileGate] section of project.config.
+# Usage:
+#   python analyze_csv_profile.py [CAPTURE] [--all]                        summary only
+#   python analyze_csv_profile.py [CAPTURE] --save-baseline [NAME]         store the capture's summary as a baseline
+#   python analyze_csv_profile.py [CAPTURE] --baseline [NAME|FILE.json]    compare; exit code 1 on a regression
+#   ... [--json OUT.json] [--html OUT.html] [--threshold PERCENT] [--hitch-ms N]
+#
+# CAPTURE is a .csv, or a folder (its newest .csv); default: the newest CSV of the RunEditor capture runs
+# (Saved/Automation/Captures), else the newest one in Saved/Profiling/CSV.
+# Baselines are stored in <Project>/Saved/Automation/ProfileBaselines/<NAME>.json; the default name is
+# <map>_<platform> from the capture's metadata. Install NumPy for big captures (see common/csv_profile.py).
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from common.automation_common import get_automation_state_dir, get_project_context
+from common.csv_profile import (
+    analyze_capture,
+    compare,
+    comparison_to_dict,
+    default_baseline_name,
+    format_comparison,
+    format_html,
+    load_baseline,
+    load_gate_settings,
+    np,
+    save_baseline,
+    summary_to_dict,
+)
+from common.capture_run import get_captures_root, load_index
+
+BASELINES_DIR_NAME = "ProfileBaselines"
+
+def newest_csv(folder: Path):
+    captures = [p for p in folder.rglob("*.csv") if p.is_file()]
+    return max(captures, key=lambda p: p.stat().st_mtime) if captures else None
+
+def find_capture(value: str, project_root: Path) -> Path:
+    if value:
+        path = Path(value)
+        if path.is_dir():
+            capture = newest_csv(path)
+            if capture is None:
+                raise RuntimeError(f"No .csv capture in {path}")
+            return capture
+        if not path.is_file():
+            raise RuntimeError(f"Capture not found: {path}")
+        return path
+
+    # Newest capture session first, then whatever the CSV profiler left in Saved/Profiling
+    for session in reversed(load_index(project_root)):
+        folder = get_captures_root(project_root) / session.get("id", "")
+        if folder.is_dir():
+            capture = newest_csv(folder)
+            if capture is not None:
+                return capture
+    profiling_dir = project_root / "Saved" / "Profiling" / "CSV"
+    capture = newest_csv(profiling_dir) if profiling_dir.is_dir() else None
+    if capture is None:
+        raise RuntimeError("No CSV capture found; pass a .csv file or a folder")
+    return capture
+
+def baseline_path(value: str, summary, project_root: Path) -> Path:
+    # A file path, or a name in Saved/Automation/ProfileBaselines
+    if value and (value.lower().endswith(".json") or "/" in value or "\\" in value):
+        return Path(value)
+    return get_automation_state_dir(project_root) / BASELINES_DIR_NAME / f"{value or default_baseline_name(summary)}.json"
+
+def get_gate_settings():
+    try:
+        config = get_project_context().project_config
+    except RuntimeError:
+        # No project.config (e.g. analyzing a capture on a build machine): the defaults
+        config = None
+    return load_gate_settings(config)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Summarize a CSV profiler capture and compare it against a baseline")
+    parser.add_argument("capture", nargs="?", default="", help="Capture .csv or a folder with captures (default: the newest capture run)")
+    parser.add_argument("--baseline", nargs="?", const="", default=None, help="Compare against this baseline (name or .json file)")
+    parser.add_argument("--save-baseline", nargs="?", const="", default=None, help="Store the capture's summary as a baseline")
+    parser.add_argument("--json", type=str, default=None, help="Write the summary (and comparison) as JSON to this file")
+    parser.add_argument("--html", type=str, default=None, help="Write an HTML report to this file")
+    parser.add_argument("--all", action="store_true", help="Print every stat, not only the gated and hitch stats")
+    parser.add_argument("--threshold", type=float, default=None, help="Allowed increase in percent (default: [ProfileGate] ThresholdPercent)")
+    parser.add_argument("--hitch-ms", type=float, default=None, help="Hitch threshold in ms (default: [ProfileGate] HitchMs)")
+    return parser.parse_args()
+
+def main(args) -> int:
+    project_root = get_project_context().project_root
+    settings = get_gate_settings()
+    if args.threshold is not None:
+        settings.threshold_percent = args.threshold
+    if args.hitch_ms is not None:
+        settings.hitch_ms = args.hitch_ms
+
+    capture = find_capture(args.capture, project_root)
+    if np is None:
+        print("NumPy is not installed; falling back to the (much slower) pure Python parser")
+    summary = analyze_capture(capture, settings)
+    shown = None if args.all else list(dict.fromkeys(settings.stats + settings.hitch_stats))
+    print(summary.format(shown))
+
+    comparison = None
+    if args.baseline is not None:
+        comparison = compare(summary, load_baseline(baseline_path(args.baseline, summary, project_root)), settings)
+        print(format_comparison(comparison, settings))
+
+    if args.save_baseline is not None:
+        path = baseline_path(args.save_baseline, summary, project_root)
+        save_baseline(summary, path)
+        print(f"Baseline saved to {path}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(comparison_to_dict(comparison) if comparison else summary_to_dict(summary), f, indent=2)
+        print(f"JSON written to {args.json}")
+    if args.html:
+        with open(args.html, "w", encoding="utf-8") as f:
+            f.write(format_html(summary, comparison, settings))
+        print(f"HTML report written to {args.html}")
+    return 0 if comparison is None or comparison.passed else 1
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        sys.exit(main(args))
+    except RuntimeError as e:
+        print(f"[CSV profile] {e}")
+        sys.exit(1)
@@ -1,65 +1,73 @@
-import os
-import shutil
 import subprocess
 import argparse
 import sys
+from dataclasses import dataclass
 from pathlib import Path
-import configparser
+from typing import Dict, List, Optional, Tuple
 
-from build_android_binaries import build_android
+from build_android_binaries import get_build_command as get_android_build_command
+from common.artifact_store import ArtifactStore
+from common.automation_common import get_automation_state_dir, get_project_context
+from common.build_cache import BuildCache
+from common.build_history import RunRecorder
+from common.delta_sync import sync_trees
+from common.step_scheduler import Step, StepScheduler, describe_plan
 
 # === SCRIPT ARGUMENTS ===
 # --dry-run
 # ->Only prints operations
 
-# === LOAD PROJECT CONFIGURATION ===
-SCRIPT_DIR = Path(__file__).resolve().parent / "config"
-PROJECT_CONFIG_FILE = SCRIPT_DIR / "project.config"
-
-# === ENSURE PROJECT CONFIGURATION FILE EXISTS ===
-if not PROJECT_CONFIG_FILE.exists():
-    print(f"Project configuration file not found: {PROJECT_CONFIG_FILE}")
-    print("Please create project.config in /config")
-    input("Press Enter to exit...")
-    exit(1)
-
-project_config = configparser.ConfigParser()
-project_config.optionxform = str
-project_config.read(PROJECT_CONFIG_FILE)
-
-DEV_REPO_ROOT = (SCRIPT_DIR / project_config['Paths']['dev_repo_root']).resolve()
-
-# === LOAD BUILD CONFIGURATION ===
-BUILD_CONFIG_FILE = DEV_REPO_ROOT / "Config/automation/build_and_push_to_cgi.config"
-
-# === ENSURE CONFIGURATION FILE EXISTS ===
-if not BUILD_CONFIG_FILE.exists():
-    print(f"Configuration file not found: {BUILD_CONFIG_FILE}")
-    print("Please create build_and_push_to_cgi.config in /config")
-    input("Press Enter to exit...")
-    exit(1)
-
-build_config = configparser.ConfigParser()
-build_config.optionxform = str  # keep case-sensitive
-build_config.read(BUILD_CONFIG_FILE)
-
-CGI_REPO_ROOT = (SCRIPT_DIR / project_config['Paths']['cgi_repo_root']).resolve()
-UE_ROOT = (SCRIPT_DIR / project_config['Paths']['ue_root']).resolve()
-INCLUDE_ANDROID = build_config.getboolean("Build", "IncludeAndroid", fallback=False)
-
-BUILD_COMMANDS = [value.strip() for key, value in build_config['BuildCommands'].items() if value and value.strip()]
-files_to_copy_raw = build_config.get('FilesToCopy', 'paths', fallback='')
-FILES_TO_COPY = [line.strip() for line in files_to_copy_raw.splitlines() if line.strip()]
+##
+#  Everything this script needs from project.config and build_and_push_to_cgi.config.
+#  Loaded in main() rather than at import time, so importing this module costs nothing
+##
+@dataclass
+class PushSettings:
+    dev_repo_root: Path
+    cgi_repo_root: Path
+    ue_root: Path
+    include_android: bool
+    max_parallel_jobs: int
+    # None = wait for all build commands (default), empty = no dependencies
+    android_depends_on: Optional[str]
+    build_cache_enabled: bool
+    # Empty = local cache in <DevRepo>/Saved/Automation; can point to a shared directory
+    build_cache_directory: str
+    build_cache_max_size_gb: float
+    # build_command_N = <command>, with optional build_command_N.group / build_command_N.depends_on attributes
+    build_commands: List[Tuple[str, str]]
+    build_command_attributes: Dict[str, str]
+    files_to_copy: List[str]
+
+def load_settings():
+    context = get_project_context()
+    build_config = context.build_config
+
+    return PushSettings(
+        dev_repo_root=context.dev_repo_root,
+        cgi_repo_root=context.cgi_repo_root,
+        ue_root=context.ue_root,
+        include_android=build_config.getboolean("Build", "IncludeAndroid", fallback=False),
+        max_parallel_jobs=build_config.getint("Build", "MaxParallelJobs", fallback=1),
+        android_depends_on=build_config.get("Build", "AndroidDependsOn", fallback=None),
+        build_cache_enabled=build_config.getboolean("BuildCache", "Enabled", fallback=False),
+        build_cache_directory=build_config.get("BuildCache", "Directory", fallback="").strip(),
+        build_cache_max_size_gb=build_config.getfloat("BuildCache", "MaxSizeGB", fallback=50.0),
+        build_commands=[(key, value.strip()) for key, value in build_config['BuildCommands'].items() if '.' not in key and value and value.strip()],
+        build_command_attributes={key: value.strip() for key, value in build_config['BuildCommands'].items() if '.' in key},
+        files_to_copy=context.files_to_copy,
+    )
 
 ##
-#  Runs a build command, usually like 'UnrealBuildTool.dll GrimoireEditor Win64 DebugGame -project=Grimoire.uproject -clean'
+#  Turns a configured build command, usually like 'UnrealBuildTool.dll GrimoireEditor Win64 DebugGame -project=Grimoire.uproject -clean'
+#  into the actual command line tokens
 ##
-def run_build_command(command, cwd=None, check=True):
+def resolve_build_command(settings, command, cwd=None):
     tokens = command.strip().split()
 
     # Replace 'UnrealBuildTool.dll" with that file's full absolute path
     if tokens[0] == "UnrealBuildTool.dll":
-        ubt_dll_path = UE_ROOT / "Engine" / "Binaries" / "DotNET" / "UnrealBuildTool" / "UnrealBuildTool.dll"
+        ubt_dll_path = settings.ue_root / "Engine" / "Binaries" / "DotNET" / "UnrealBuildTool" / "UnrealBuildTool.dll"
         tokens = ["dotnet", str(ubt_dll_path)] + tokens[1:]  # replace dll with dotnet + dll
 
     # Replace -project=<something> with full absolute path
@@ -68,25 +76,18 @@ def run_build_command(command, cwd=None, check=True):
             project_file = token.split("=", 1)[1].strip('"')
             project_full_path = (cwd / project_file).resolve()
             tokens[i] = f'-Project={project_full_path}'
-        
-    print(f"Running: {' '.join(tokens)}")
-    
-    result = subprocess.run(tokens, cwd=cwd, check=check, stdout=sys.stdout, stderr=sys.stderr, text=True)
-    
-    if check and result.returncode != 0:
-        raise RuntimeError(f"Command failed: {' '.join(tokens)}")
-    
-    return result
+
+    return tokens
 
 ##
 #  Runs a git command, like 'git status --porcelain'
 ##
-def run_git_command(command, cwd=None):
+def run_git_command(command, cwd=None, input_text=None):
     tokens = command.strip().split()
         
     print(f"Running: {' '.join(tokens)}")
     
-    result = subprocess.run(tokens, cwd=cwd, shell=True, capture_output=True, text=True)
+    result = subprocess.run(tokens, cwd=cwd, shell=True, capture_output=True, text=True, input=input_text)
         
     if result.returncode != 0:
         raise RuntimeError(f"Command failed: {' '.join(tokens)}")
@@ -95,71 +96,121 @@ def run_git_command(command, cwd=None):
 ##
 #  Checks if the target repo has no modified files. If it does, throws error
 ##
-def check_cgi_repo_clean():
-    result = run_git_command("git status --porcelain", cwd=CGI_REPO_ROOT)
+def check_cgi_repo_clean(settings):
+    result = run_git_command("git status --porcelain", cwd=settings.cgi_repo_root)
 
     if result.stdout.strip():
         raise RuntimeError("CGI repo has uncommitted changes. Please commit or stash them first.")
 
+def _split_names(value):
+    return [name for name in value.replace(',', ' ').split() if name]
+
+##
+#  Creates the build steps from the build config, plus the Android build if enabled
+##
+def load_build_steps(settings):
+    steps = []
+    for key, command in settings.build_commands:
+        depends_on = settings.build_command_attributes.get(f"{key}.depends_on")
+        steps.append(Step(
+            name=key,
+            command=resolve_build_command(settings, command, cwd=settings.dev_repo_root),
+            cwd=settings.dev_repo_root,
+            group=settings.build_command_attributes.get(f"{key}.group") or None,
+            depends_on=_split_names(depends_on) if depends_on is not None else None,
+        ))
+
+    unknown_attributes = [key for key in settings.build_command_attributes if key.split('.', 1)[0] not in dict(settings.build_commands)]
+    if unknown_attributes:
+        raise RuntimeError(f"Build command attributes without a command: {', '.join(unknown_attributes)}")
+
+    if settings.include_android:
+        #  Note: Only tested for Development configuration. The resulting .so might be differently named and not correctly used by package_android.py.
+        android_depends_on = [step.name for step in steps] if settings.android_depends_on is None else _split_names(settings.android_depends_on)
+        steps.append(Step(
+            name="android",
+            command=get_android_build_command(settings.ue_root, get_project_context().dev_uproject, "Development"),
+            cwd=settings.dev_repo_root,
+            depends_on=android_depends_on,
+        ))
+
+    return steps
+
 ##
-#  Builds dev binaries from the dev , by running all commands defined in the build config sequentially
+#  Builds dev binaries from the dev repo by running all commands defined in the build config.
+#  Steps run in config order unless groups/depends_on allow them to run concurrently (up to MaxParallelJobs)
 ##
-def build_dev_binaries(dry_run=False):
-    if not BUILD_COMMANDS:
+def build_dev_binaries(settings, dry_run=False, run=None):
+    steps = load_build_steps(settings)
+    if not steps:
         print("No build commands configured. Skipping build.")
         return
-    
-    print(f"Building binaries ({len(BUILD_COMMANDS)} step{'s' if len(BUILD_COMMANDS) != 1 else ''})...")
-    for idx, command in enumerate(BUILD_COMMANDS, 1):
-        print(f"Step {idx}: {command}")
-        if not dry_run:
-            run_build_command(command, cwd=DEV_REPO_ROOT)
-
-##
-#  Deletes (from CGI) all files that will be copied from dev to cgi
-#  Files to be deleted are defined in the build config file
-##
-def delete_old_files(dry_run=False):
-    for rel_path in FILES_TO_COPY:
-        target_path = CGI_REPO_ROOT / rel_path.lstrip('/')
-        if target_path.exists():
-            if target_path.is_dir():
-                print(f"Would delete directory: {target_path}" if dry_run else f"Deleting directory: {target_path}")
-                if not dry_run:
-                    shutil.rmtree(target_path)
-            else:
-                print(f"Would delete file: {target_path}" if dry_run else f"Deleting file: {target_path}")
-                if not dry_run:
-                    target_path.unlink()
-
-##
-#  Copies the files
-#  Files to be copied are defined in the build config file
-##
-def copy_new_files(dry_run=False):
-    for rel_path in FILES_TO_COPY:
-        src_path = DEV_REPO_ROOT / rel_path.lstrip('/')
-        dest_path = CGI_REPO_ROOT / rel_path.lstrip('/')
-        if src_path.is_dir():
-            print(f"Would copy directory: {src_path} -> {dest_path}" if dry_run else f"Copying directory: {src_path} -> {dest_path}")
-            if not dry_run:
-                shutil.copytree(src_path, dest_path)
-        else:
-            print(f"Would copy file: {src_path} -> {dest_path}" if dry_run else f"Copying file: {src_path} -> {dest_path}")
-            if not dry_run:
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src_path, dest_path)
-
-##
-#  Adds all changed files in the CGI repo to git
-##
-def add_to_cgi_repo(dry_run=False):
+
+    print(f"Building binaries ({len(steps)} step{'s' if len(steps) != 1 else ''}, up to {settings.max_parallel_jobs} at a time)...")
+    waves = describe_plan(steps)
+    for idx, wave in enumerate(waves, 1):
+        for step in wave:
+            print(f"Wave {idx}: [{step.name}] {' '.join(step.command)}")
+
     if dry_run:
-        print("Would stage and commit changes to CGI repo.")
+        return
+
+    build_cache = create_build_cache(settings)
+    if build_cache and settings.max_parallel_jobs > 1 and any(len(wave) > 1 for wave in waves):
+        # Stores and restores would race with the other steps writing to Binaries/
+        print("Build cache disabled: build steps can run at the same time (MaxParallelJobs > 1)")
+        build_cache = None
+    if build_cache:
+        for step in steps:
+            step.skip_check = build_cache.try_skip
+            step.on_success = build_cache.on_step_succeeded
+
+    try:
+        StepScheduler(steps, max_jobs=settings.max_parallel_jobs).run()
+    finally:
+        if run is not None:
+            for step in steps:
+                run.add_step(step.name, step.duration)
+
+    if build_cache:
+        print(f"Build cache: {build_cache.store.format_stats()}")
+
+##
+#  Creates the build cache that lets unchanged build steps restore their Binaries instead of running UBT, if enabled
+##
+def create_build_cache(settings):
+    if not settings.build_cache_enabled:
+        return None
+
+    state_dir = get_automation_state_dir(settings.dev_repo_root) / "build_cache"
+    store_dir = Path(settings.build_cache_directory) if settings.build_cache_directory else state_dir / "store"
+    store = ArtifactStore(store_dir, int(settings.build_cache_max_size_gb * 1024 ** 3))
+    return BuildCache(settings.dev_repo_root, settings.ue_root, store, state_dir)
+
+##
+#  Syncs the files defined in the build config file from dev to CGI.
+#  Only added/changed files are copied and only files that no longer exist in dev are deleted,
+#  based on the manifests persisted in <DevRepo>/Saved/Automation/cgi_sync
+##
+def sync_files(settings, dry_run=False):
+    manifest_dir = get_automation_state_dir(settings.dev_repo_root) / "cgi_sync"
+    report = sync_trees(settings.dev_repo_root, settings.cgi_repo_root, settings.files_to_copy, manifest_dir, dry_run=dry_run)
+    print(f"Sync {'preview' if dry_run else 'done'}: {report.summary()}")
+    return report
+
+##
+#  Adds the files touched by the sync in the CGI repo to git
+##
+def add_to_cgi_repo(settings, touched_paths, dry_run=False):
+    if not touched_paths:
+        print("No files changed, nothing to stage.")
+    elif dry_run:
+        print(f"Would stage {len(touched_paths)} changed file(s) in CGI repo.")
     else:
-        # run git add, capture output to prevent it from being printed
-        run_git_command("git add .", cwd=CGI_REPO_ROOT)
-        #run_git_command('git commit -m "Update pre-built binaries from Dev"', cwd=CGI_REPO_ROOT)
+        # Only stage what the sync touched, so git doesn't have to re-check the whole working tree.
+        # The paths are file names, not patterns: '*', '?', '[' or a leading ':' must not be expanded
+        run_git_command("git --literal-pathspecs add -A --pathspec-from-file=-", cwd=settings.cgi_repo_root, input_text="\n".join(touched_paths))
+        #run_git_command('git commit -m "Update pre-built binaries from Dev"', cwd=settings.cgi_repo_root)
 
 
 def main():
@@ -169,19 +220,21 @@ def main():
     dry_run = args.dry_run
 
     try:
-        check_cgi_repo_clean()
-        build_dev_binaries(dry_run=dry_run)
-        
-        if not dry_run and INCLUDE_ANDROID:
-            print("Building Android binaries")
-            #  Note: Only tested for Development configuration. The resulting .so might be differently named and not correctly used by package_android.py.
-            if not build_android("Development"):
-                raise RuntimeError("Failed to build android binaries")
-        
-        delete_old_files(dry_run=dry_run)
-        copy_new_files(dry_run=dry_run)
-        
-        add_to_cgi_repo(dry_run=dry_run)
+        settings = load_settings()
+        # Dry runs aren't recorded in the build history
+        with RunRecorder(get_project_context().project_root, "build_and_push_to_cgi", command=" ".join(sys.argv), enabled=not dry_run) as run:
+            eta = run.format_eta()
+            if eta and not dry_run:
+                print(eta)
+
+            check_cgi_repo_clean(settings)
+            build_dev_binaries(settings, dry_run=dry_run, run=run)
+
+            with run.step("sync"):
+                report = sync_files(settings, dry_run=dry_run)
+
+            with run.step("git add"):
+                add_to_cgi_repo(settings, report.touched_paths, dry_run=dry_run)
 
         print("Dry run completed!" if dry_run else "All done!")
         
@@ -8,21 +8,20 @@ import subprocess
 import shutil
 import sys
 import argparse
+import time
 from pathlib import Path
 import configparser
 
-from common.automation_common import (
-    get_project_root,
-    find_uproject,
-    load_ue_root
-)
+from common.automation_common import get_automation_state_dir, get_project_context
+from common.build_history import RunRecorder
+from common.uat_log_parser import run_uat_command
 
-def run_build(ue_root: Path, uproject_path: Path, configuration: str):
+def get_build_command(ue_root: Path, uproject_path: Path, configuration: str) -> list:
     runuat_path = ue_root / "Engine" / "Build" / "BatchFiles" / "RunUAT.bat"
     if not runuat_path.exists():
         raise RuntimeError(f"RunUAT.bat not found at {runuat_path}")
 
-    command = [
+    return [
         str(runuat_path),
         "BuildCookRun",
         f"-project={uproject_path}",
@@ -36,26 +35,38 @@ def run_build(ue_root: Path, uproject_path: Path, configuration: str):
         "-stage"
     ]
 
+def run_build(ue_root: Path, uproject_path: Path, configuration: str, run: RunRecorder = None):
+    command = get_build_command(ue_root, uproject_path, configuration)
+
     print(f"Running Unreal Automation Tool:")
     print(" ".join(command))
-    result = subprocess.run(command)
-    if result.returncode != 0:
-        raise RuntimeError("BuildCookRun failed with exit code", result.returncode)
+    summary_path = get_automation_state_dir(uproject_path.parent) / "UatLogs" / f"build_android_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    returncode, summary = run_uat_command(command, summary_path=summary_path)
+    if run is not None:
+        run.add_phase_steps(summary)
+        run.exit_code = returncode
+    if returncode != 0:
+        raise RuntimeError("BuildCookRun failed with exit code", returncode)
 
 def build_android(configuration: str) -> bool:
     try:
-        project_root = get_project_root()
+        context = get_project_context()
+        project_root = context.project_root
         print(f"Project root: {project_root}")
 
-        uproject_path = find_uproject(project_root)
+        uproject_path = context.uproject
         print(f"Found .uproject: {uproject_path.name}")
 
-        ue_root = load_ue_root()
+        ue_root = context.ue_root
         print(f"Using Unreal Engine from: {ue_root}")
         
         print(f"Build configuration: {configuration}")
 
-        run_build(ue_root, uproject_path, configuration)
+        with RunRecorder(project_root, "build_android_binaries", command=" ".join(sys.argv), config=configuration, platform="Android") as run:
+            eta = run.format_eta()
+            if eta:
+                print(eta)
+            run_build(ue_root, uproject_path, configuration, run=run)
 
         return True
         
@@ -0,0 +1,135 @@
+# Shows how long automation runs took over time, based on the history recorded by the automation scripts.
+# Usage:
+#   python build_report.py [--pipeline NAME] [--last N] [--threshold 0.2] [--json]
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+
+from common.automation_common import get_project_context
+from common.build_history import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    find_regressions,
+    format_duration,
+    load_runs,
+    percentile,
+)
+
+SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+
+
+def sparkline(values):
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    return "".join(SPARK_CHARS[1 + int((value - low) / span * (len(SPARK_CHARS) - 2))] for value in values)
+
+
+def group_runs(runs):
+    groups = defaultdict(list)
+    for run in runs:
+        groups[(run.pipeline, run.config, run.platform)].append(run)
+    return groups
+
+
+def build_report(runs, last, threshold):
+    report = {"groups": [], "regressions": []}
+    for (pipeline, config, platform), group in sorted(group_runs(runs).items()):
+        successful = [run.duration for run in group if run.succeeded]
+        step_durations = defaultdict(list)
+        for run in group:
+            if run.succeeded:
+                for name, duration in run.steps:
+                    step_durations[name].append(duration)
+        report["groups"].append({
+            "pipeline": pipeline,
+            "config": config,
+            "platform": platform,
+            "runs": len(group),
+            "failed": sum(1 for run in group if not run.succeeded),
+            "p50": percentile(successful, 50),
+            "p90": percentile(successful, 90),
+            # Oldest to newest
+            "trend": [run.duration for run in reversed(group[:last]) if run.succeeded],
+            "steps": {name: {"p50": percentile(values, 50), "p90": percentile(values, 90)} for name, values in step_durations.items()},
+            "recent": [
+                {
+                    "id": run.id,
+                    "started": time.strftime("%Y-%m-%d %H:%M", time.localtime(run.started)),
+                    "duration": run.duration,
+                    "exit_code": run.exit_code,
+                    "git_revision": run.git_revision,
+                }
+                for run in group[:last]
+            ],
+        })
+
+    for run, ratio in find_regressions(runs, threshold):
+        report["regressions"].append({
+            "id": run.id,
+            "pipeline": run.pipeline,
+            "config": run.config,
+            "platform": run.platform,
+            "started": time.strftime("%Y-%m-%d %H:%M", time.localtime(run.started)),
+            "duration": run.duration,
+            "ratio": round(ratio, 2),
+            "git_revision": run.git_revision,
+        })
+    return report
+
+
+def print_report(report, threshold):
+    if not report["groups"]:
+        print("No runs recorded yet.")
+        return
+
+    for group in report["groups"]:
+        label = " / ".join(part for part in (group["pipeline"], group["config"], group["platform"]) if part)
+        print(f"=== {label} ===")
+        print(f"  {group['runs']} run(s), {group['failed']} failed; p50 {format_duration(group['p50'])}, p90 {format_duration(group['p90'])}")
+        if group["trend"]:
+            print(f"  Trend: {sparkline(group['trend'])}")
+        for name, stats in group["steps"].items():
+            print(f"    {name:<24} p50 {format_duration(stats['p50'])}  p90 {format_duration(stats['p90'])}")
+        print("  Recent:")
+        for run in group["recent"]:
+            status = "ok" if run["exit_code"] == 0 else f"failed ({run['exit_code']})"
+            print(f"    {run['started']}  {format_duration(run['duration'])}  {status:<12} {run['git_revision']}")
+        print()
+
+    if report["regressions"]:
+        print(f"=== Regressions (>{threshold * 100:.0f}% slower than the median of earlier runs) ===")
+        for run in report["regressions"]:
+            print(f"  {run['started']}  {run['pipeline']} {run['config']} {run['platform']}: "
+                  f"{format_duration(run['duration'])} ({run['ratio']:.2f}x)  {run['git_revision']}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Timing trends of the automation scripts")
+    parser.add_argument("--pipeline", type=str, default=None, help="Only this pipeline, e.g. package, build_and_push_to_cgi")
+    parser.add_argument("--last", type=int, default=10, help="Number of recent runs to list per pipeline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Flag runs slower than the median of earlier runs by more than this fraction")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    runs = load_runs(get_project_context().project_root, args.pipeline)
+    report = build_report(runs, args.last, args.threshold)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.threshold)
+    # Non-zero exit when the most recent run of any pipeline regressed, so it can be used in CI
+    latest_ids = {group["recent"][0]["id"] for group in report["groups"]}
+    regressed = any(run["id"] in latest_ids for run in report["regressions"])
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
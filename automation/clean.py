@@ -0,0 +1,125 @@
+# Cleans the project workspace with a named preset, keeping the expensive caches `git clean -fdx` used to throw away.
+# Usage:
+#   python clean.py [PRESET] [--dry-run] [--yes] [--trash] [--jobs N]
+#   python clean.py --empty-trash                 delete what earlier --trash runs moved aside
+#
+# Presets:
+#   binaries        Binaries/ of the project and its plugins
+#   intermediate    Intermediate/ of the project and its plugins
+#   build           both of the above
+#   all-except-ddc  everything untracked by git, except DerivedDataCache/ and Saved/Automation/
+#   all             everything untracked by git (what Clean.bat used to do)
+#
+# The reclaimable size is shown before anything is deleted. --trash renames the folders into <Project>/.CleanTrash
+# and returns right away; a background process deletes them.
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from common.automation_common import get_project_context
+from common.delta_sync import format_bytes
+from common.workspace_clean import (
+    DEFAULT_MAX_WORKERS,
+    PRESETS,
+    delete_paths,
+    empty_trash,
+    get_trash_dir,
+    measure,
+    move_to_trash,
+    resolve_targets,
+    start_trash_emptier,
+)
+from common.workspace_journal import recover_interrupted_journals
+
+##
+## Shows the presets and asks for one (used when Clean.bat is started without arguments)
+##
+def choose_preset() -> str:
+    names = list(PRESETS)
+    for index, name in enumerate(names, 1):
+        print(f"  {index}. {name:<16} {PRESETS[name].description}")
+    choice = input("Preset to clean (number or name, empty to cancel): ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(names):
+        return names[int(choice) - 1]
+    if choice in PRESETS:
+        return choice
+    return ""
+
+##
+## Prints every target with its size, largest first, and the total
+##
+def print_sizes(project_root: Path, sizes) -> int:
+    total = sum(size.bytes for size in sizes)
+    for size in sorted(sizes, key=lambda s: s.bytes, reverse=True):
+        print(f"  {format_bytes(size.bytes):>10}  {size.files:>8} file(s)  {os.path.relpath(size.path, project_root)}")
+    print(f"Reclaimable: {format_bytes(total)} in {sum(size.files for size in sizes)} file(s), {len(sizes)} path(s)")
+    return total
+
+def clean(project_root: Path, preset_name: str, dry_run: bool, assume_yes: bool, use_trash: bool, jobs: int) -> int:
+    preset = PRESETS[preset_name]
+    print(f"Preset '{preset_name}': {preset.description}")
+
+    # Roll back files a killed build left edited before its journal (in Saved/Automation) can be cleaned away
+    recover_interrupted_journals(project_root)
+
+    targets = resolve_targets(project_root, preset)
+    trash_dir = get_trash_dir(project_root)
+    if not use_trash and trash_dir.exists():
+        # Leftovers of a --trash run whose background delete didn't finish
+        targets.append(trash_dir)
+    if not targets:
+        print("Nothing to clean.")
+        return 0
+
+    print_sizes(project_root, measure(targets, max_workers=jobs))
+    if dry_run:
+        print("[DryRun] Nothing deleted.")
+        return 0
+    if not assume_yes and input(f"Delete {len(targets)} path(s)? [y/N] ").strip().lower() not in ("y", "yes"):
+        print("Cancelled.")
+        return 0
+
+    to_delete = targets
+    if use_trash:
+        moved, to_delete = move_to_trash(project_root, targets)
+        print(f"Moved {len(moved.removed)} path(s) to {trash_dir} in {moved.seconds:.2f}s; deleting them in the background")
+        start_trash_emptier(Path(__file__).resolve(), project_root)
+        if to_delete:
+            print(f"{len(to_delete)} path(s) couldn't be moved (files in use?), deleting them in place")
+    if not to_delete:
+        return 0
+
+    report = delete_paths(to_delete, max_workers=jobs)
+    for path, error in report.failed:
+        print(f"[ERROR] {os.path.relpath(path, project_root)}: {error}")
+    print(f"Deleted {len(report.removed)} path(s) in {report.seconds:.2f}s"
+          + (f", {len(report.failed)} failure(s) (is the editor still running?)" if report.failed else ""))
+    return 1 if report.failed else 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Clean the project workspace while keeping expensive caches")
+    parser.add_argument("preset", nargs="?", choices=list(PRESETS), help="What to clean (asked for if omitted)")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what would be deleted and how much space it takes")
+    parser.add_argument("-y", "--yes", action="store_true", help="Don't ask for confirmation")
+    parser.add_argument("--trash", action="store_true", help="Move the folders aside instantly and delete them in the background")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_MAX_WORKERS, help="Parallel scan/delete workers")
+    parser.add_argument("--empty-trash", action="store_true", help="Delete what earlier --trash runs moved aside, then exit")
+    parser.add_argument("--project-root", type=str, default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    project_root = Path(args.project_root) if args.project_root else get_project_context().project_root
+    try:
+        if args.empty_trash:
+            sys.exit(1 if empty_trash(project_root, max_workers=args.jobs).failed else 0)
+        preset_name = args.preset or choose_preset()
+        if not preset_name:
+            print("Cancelled.")
+            sys.exit(0)
+        sys.exit(clean(project_root, preset_name, args.dry_run, args.yes, args.trash, args.jobs))
+    except RuntimeError as e:
+        print(f"Clean failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,203 @@
+# Installs an APK on every connected Android device (Quest headsets) at once.
+#
+# Devices come from "adb devices -l"; each selected serial gets its own "adb -s <serial> install -r".
+# A device is skipped when the APK installed for the package is byte-identical to the one being deployed
+# (sha256 of the on-device base.apk), so re-running a deploy only touches headsets that are out of date.
+# "adb" is looked up on PATH at call time, so a fake adb executable can stand in for real devices.
+from __future__ import annotations
+
+import hashlib
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional
+
+ADB_TIMEOUT = 30
+INSTALL_TIMEOUT = 600
+
+RESULT_INSTALLED = "installed"
+RESULT_SKIPPED = "skipped"
+RESULT_FAILED = "failed"
+
+# UE's default when no PackageName is configured; [PROJECT] is replaced with the project name
+DEFAULT_PACKAGE_NAME = "com.YourCompany.[PROJECT]"
+_PACKAGE_NAME_RE = re.compile(r"^\s*PackageName\s*=\s*(.+?)\s*$")
+
+
+@dataclass
+class AdbDevice:
+    serial: str
+    state: str
+    model: str = ""
+    product: str = ""
+
+    @property
+    def label(self) -> str:
+        return f"{self.serial} ({self.model})" if self.model else self.serial
+
+
+@dataclass
+class InstallResult:
+    device: AdbDevice
+    status: str
+    duration: float
+    message: str = ""
+
+
+def find_adb() -> str:
+    adb = shutil.which("adb")
+    if adb is None:
+        raise RuntimeError("adb not found on PATH")
+    return adb
+
+
+def _run_adb(args: List[str], timeout: float = ADB_TIMEOUT) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [find_adb()] + args,
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+        stdin=subprocess.DEVNULL, timeout=timeout,
+    )
+
+
+def parse_devices(output: str) -> List[AdbDevice]:
+    """Parses "adb devices -l" output, e.g. "1WMHH000000000 device product:eureka model:Quest_3 device:eureka"."""
+    devices = []
+    for line in output.splitlines():
+        line = line.strip()
+        if not line or line.startswith("List of devices") or line.startswith("*"):
+            continue
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        properties = dict(part.split(":", 1) for part in parts[2:] if ":" in part)
+        devices.append(AdbDevice(
+            serial=parts[0],
+            state=parts[1],
+            model=properties.get("model", ""),
+            product=properties.get("product", ""),
+        ))
+    return devices
+
+
+def list_devices() -> List[AdbDevice]:
+    """All devices adb knows about, including unauthorized/offline ones (check AdbDevice.state)."""
+    result = _run_adb(["devices", "-l"])
+    if result.returncode != 0:
+        raise RuntimeError(f"adb devices failed with exit code {result.returncode}: {result.stderr.strip()}")
+    return parse_devices(result.stdout)
+
+
+def select_devices(devices: List[AdbDevice], serials: Optional[List[str]] = None) -> List[AdbDevice]:
+    """The ready devices, optionally limited to the given serials (an unknown or unready serial is an error)."""
+    if not serials:
+        return [device for device in devices if device.state == "device"]
+    by_serial = {device.serial: device for device in devices}
+    selected = []
+    for serial in serials:
+        device = by_serial.get(serial)
+        if device is None:
+            raise RuntimeError(f"Device {serial} is not connected")
+        if device.state != "device":
+            raise RuntimeError(f"Device {serial} is {device.state}")
+        selected.append(device)
+    return selected
+
+
+def get_android_package_name(project_root: Path, project_name: str) -> str:
+    """PackageName from Config/DefaultEngine.ini ([/Script/AndroidRuntimeSettings.AndroidRuntimeSettings])."""
+    ini_path = Path(project_root) / "Config" / "DefaultEngine.ini"
+    package_name = DEFAULT_PACKAGE_NAME
+    if ini_path.exists():
+        # UE ini files aren't strict enough for configparser (duplicate keys, +/- prefixes), so scan for the key
+        in_section = False
+        with open(ini_path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                stripped = line.strip()
+                if stripped.startswith("["):
+                    in_section = stripped == "[/Script/AndroidRuntimeSettings.AndroidRuntimeSettings]"
+                    continue
+                match = _PACKAGE_NAME_RE.match(stripped) if in_section else None
+                if match:
+                    package_name = match.group(1).strip('"')
+    return package_name.replace("[PROJECT]", project_name)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_installed_apk_sha256(serial: str, package_name: str) -> Optional[str]:
+    """sha256 of the installed base.apk, or None if the package isn't installed or the hash can't be read."""
+    result = _run_adb(["-s", serial, "shell", "pm", "path", package_name])
+    paths = [line[len("package:"):].strip() for line in result.stdout.splitlines() if line.startswith("package:")]
+    base_apk = next((path for path in paths if path.endswith("base.apk")), paths[0] if paths else None)
+    if result.returncode != 0 or base_apk is None:
+        return None
+    result = _run_adb(["-s", serial, "shell", "sha256sum", base_apk], timeout=120)
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    return result.stdout.split()[0].lower()
+
+
+def install_on_device(device: AdbDevice, apk_path: Path, package_name: Optional[str], apk_sha256: Optional[str],
+                      force: bool = False) -> InstallResult:
+    start = time.perf_counter()
+    try:
+        if not force and package_name and apk_sha256:
+            if get_installed_apk_sha256(device.serial, package_name) == apk_sha256:
+                return InstallResult(device, RESULT_SKIPPED, time.perf_counter() - start, "same APK already installed")
+
+        result = _run_adb(["-s", device.serial, "install", "-r", str(apk_path)], timeout=INSTALL_TIMEOUT)
+        output = (result.stdout + result.stderr).strip()
+        # Older adb versions exit with 0 even when the install failed, the output has the verdict
+        if result.returncode != 0 or "Failure" in output:
+            message = output.splitlines()[-1] if output else f"exit code {result.returncode}"
+            return InstallResult(device, RESULT_FAILED, time.perf_counter() - start, message)
+        return InstallResult(device, RESULT_INSTALLED, time.perf_counter() - start)
+    except (OSError, subprocess.TimeoutExpired, RuntimeError) as e:
+        return InstallResult(device, RESULT_FAILED, time.perf_counter() - start, str(e))
+
+
+def install_apk(
+    apk_path: Path,
+    devices: List[AdbDevice],
+    package_name: Optional[str] = None,
+    force: bool = False,
+    max_workers: Optional[int] = None,
+    output: Callable[[str], None] = print,
+) -> List[InstallResult]:
+    """
+    Installs the APK on all given devices concurrently. Without package_name every device gets the install.
+    Returns one result per device, in the order of devices.
+    """
+    if not devices:
+        raise RuntimeError("No Android devices connected (check 'adb devices -l')")
+    apk_sha256 = file_sha256(apk_path) if package_name and not force else None
+
+    output(f"Installing {apk_path.name} on {len(devices)} device(s): {', '.join(device.label for device in devices)}")
+    with ThreadPoolExecutor(max_workers=max_workers or len(devices)) as pool:
+        futures = [pool.submit(install_on_device, device, apk_path, package_name, apk_sha256, force) for device in devices]
+        for future in as_completed(futures):
+            result = future.result()
+            output(f"  [{result.device.label}] {result.status} after {result.duration:.1f}s"
+                   + (f": {result.message}" if result.message else ""))
+    return [future.result() for future in futures]
+
+
+def format_results(results: List[InstallResult], wall_clock: float) -> str:
+    lines = ["", "=== APK install summary ==="]
+    for result in results:
+        lines.append(f"  {result.device.label:<32} {result.status:<10} {result.duration:7.1f}s  {result.message}".rstrip())
+    counts = {status: sum(1 for result in results if result.status == status)
+              for status in (RESULT_INSTALLED, RESULT_SKIPPED, RESULT_FAILED)}
+    lines.append(f"  {counts[RESULT_INSTALLED]} installed, {counts[RESULT_SKIPPED]} skipped, {counts[RESULT_FAILED]} failed; "
+                 f"wall-clock {wall_clock:.1f}s")
+    return "\n".join(lines)
@@ -0,0 +1,241 @@
+# Content-addressed store for build artifacts (sets of files), usable on a local or shared directory.
+#
+# Layout:
+#   <root>/objects/<ab>/<digest>   file contents, deduplicated across entries
+#   <root>/entries/<key>.json      file list of one entry: rel path -> (digest, size, mtime_ns)
+#   <root>/stats.json              hit/miss/store/eviction counters
+# Entries are evicted least-recently-used first once the objects exceed the size budget.
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .delta_sync import Manifest, format_bytes
+from .fast_copy import copy_files
+
+
+@dataclass
+class ArtifactEntry:
+    key: str
+    created: float
+    last_used: float
+    # rel path -> (digest, size, mtime_ns)
+    files: Dict[str, Tuple[str, int, int]] = field(default_factory=dict)
+    metadata: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.files.values())
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    # Unique temp name: several machines may write to a shared store at the same time
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class ArtifactStore:
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects_dir = self.root / "objects"
+        self.entries_dir = self.root / "entries"
+        self.stats_path = self.root / "stats.json"
+        self._stats_lock = threading.Lock()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---------------------------
+    # Statistics
+    # ---------------------------
+
+    def stats(self) -> Dict[str, int]:
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            stats = self.stats()
+            stats[name] = stats.get(name, 0) + amount
+            _write_json_atomic(self.stats_path, stats)
+
+    def format_stats(self) -> str:
+        stats = self.stats()
+        hits = stats.get("hits", 0)
+        misses = stats.get("misses", 0)
+        lookups = hits + misses
+        hit_rate = f"{100.0 * hits / lookups:.0f}%" if lookups else "n/a"
+        return (
+            f"{hits} hit(s), {misses} miss(es) (hit rate {hit_rate}), {stats.get('stores', 0)} stored, "
+            f"{stats.get('evictions', 0)} evicted, {format_bytes(self.total_size())} of {format_bytes(self.max_bytes)} used"
+        )
+
+    # ---------------------------
+    # Entries
+    # ---------------------------
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _entry_path(self, key: str) -> Path:
+        return self.entries_dir / f"{key}.json"
+
+    def _load_entry(self, path: Path) -> Optional[ArtifactEntry]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return ArtifactEntry(
+            key=data["key"],
+            created=data["created"],
+            last_used=data["last_used"],
+            files={rel: tuple(value) for rel, value in data["files"].items()},
+            metadata=data.get("metadata", {}),
+        )
+
+    def _save_entry(self, entry: ArtifactEntry) -> None:
+        _write_json_atomic(self._entry_path(entry.key), {
+            "key": entry.key,
+            "created": entry.created,
+            "last_used": entry.last_used,
+            "files": entry.files,
+            "metadata": entry.metadata,
+        })
+
+    def lookup(self, key: str) -> Optional[ArtifactEntry]:
+        """Returns the entry for key (marking it as recently used), or None. Counts as a hit or miss."""
+        entry = self._load_entry(self._entry_path(key))
+        if entry is not None and all(self._object_path(digest).exists() for digest, _, _ in entry.files.values()):
+            entry.last_used = time.time()
+            self._save_entry(entry)
+            self._count("hits")
+            return entry
+        self._count("misses")
+        return None
+
+    def store(self, key: str, manifest: Manifest, metadata: Optional[Dict[str, str]] = None) -> ArtifactEntry:
+        """Stores every file of a scanned manifest under key. Only contents not in the store yet are copied."""
+        entry = ArtifactEntry(key=key, created=time.time(), last_used=time.time(), metadata=metadata or {})
+        pairs: List[Tuple[Path, Path]] = []
+        tmp_to_final: List[Tuple[Path, Path]] = []
+        pending_digests: set = set()
+        for rel, state in manifest.files.items():
+            digest = manifest.digest(rel)
+            entry.files[rel] = (digest, state.size, state.mtime_ns)
+            object_path = self._object_path(digest)
+            if digest not in pending_digests and not object_path.exists():
+                pending_digests.add(digest)
+                tmp_path = object_path.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+                pairs.append((manifest.root / rel, tmp_path))
+                tmp_to_final.append((tmp_path, object_path))
+
+        stats = copy_files(pairs)
+        if stats.failed:
+            for tmp_path, _ in tmp_to_final:
+                tmp_path.unlink(missing_ok=True)
+            raise RuntimeError(f"Failed to store {len(stats.failed)} file(s) in the artifact store: {stats.failed[0][1]}")
+        for tmp_path, object_path in tmp_to_final:
+            os.replace(tmp_path, object_path)
+
+        self._save_entry(entry)
+        self._count("stores")
+        print(f"[ArtifactStore] Stored {key[:12]}: {len(entry.files)} file(s), {len(pairs)} new object(s) ({format_bytes(stats.bytes)})")
+        self.evict()
+        return entry
+
+    def restore(self, entry: ArtifactEntry, dest: Manifest) -> Tuple[int, int]:
+        """
+        Makes the files of a scanned destination manifest match the entry exactly: changed files are copied
+        from the store, files not in the entry are deleted. Returns (copied, deleted).
+        """
+        pairs: List[Tuple[Path, Path]] = []
+        for rel, (digest, size, mtime_ns) in entry.files.items():
+            current = dest.files.get(rel)
+            if current is not None and current.size == size and (current.mtime_ns == mtime_ns or dest.digest(rel) == digest):
+                continue
+            pairs.append((self._object_path(digest), dest.root / rel))
+
+        stale = [rel for rel in dest.files if rel not in entry.files]
+        for rel in stale:
+            (dest.root / rel).unlink()
+            dest.forget(rel)
+
+        stats = copy_files(pairs)
+        if stats.failed:
+            raise RuntimeError(f"Failed to restore {len(stats.failed)} file(s) from the artifact store: {stats.failed[0][1]}")
+        # Objects carry the mtime of whichever file stored them first; give each file back its own
+        for _, dest_path in pairs:
+            rel = dest_path.relative_to(dest.root).as_posix()
+            digest, _, mtime_ns = entry.files[rel]
+            os.utime(dest_path, ns=(mtime_ns, mtime_ns))
+            dest.record(rel, digest)
+        return len(pairs), len(stale)
+
+    # ---------------------------
+    # Eviction
+    # ---------------------------
+
+    def _object_sizes(self) -> Dict[str, int]:
+        sizes: Dict[str, int] = {}
+        for prefix_dir in self.objects_dir.iterdir():
+            if not prefix_dir.is_dir():
+                continue
+            with os.scandir(prefix_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".tmp"):
+                        sizes[entry.name] = entry.stat().st_size
+        return sizes
+
+    def total_size(self) -> int:
+        return sum(self._object_sizes().values())
+
+    def entries(self) -> Iterable[ArtifactEntry]:
+        for path in self.entries_dir.glob("*.json"):
+            entry = self._load_entry(path)
+            if entry is not None:
+                yield entry
+
+    def evict(self) -> int:
+        """Drops least-recently-used entries until the objects fit in the budget. Returns the number of evicted entries."""
+        object_sizes = self._object_sizes()
+        entries = sorted(self.entries(), key=lambda e: e.last_used)
+        referenced: Dict[str, int] = {}
+        for entry in entries:
+            for digest in {digest for digest, _, _ in entry.files.values()}:
+                referenced[digest] = referenced.get(digest, 0) + 1
+
+        # Objects no entry refers to anymore are dropped first
+        total = 0
+        for digest, size in object_sizes.items():
+            if digest in referenced:
+                total += size
+            else:
+                self._object_path(digest).unlink(missing_ok=True)
+
+        evicted = 0
+        while total > self.max_bytes and entries:
+            entry = entries.pop(0)
+            self._entry_path(entry.key).unlink(missing_ok=True)
+            evicted += 1
+            for digest in {digest for digest, _, _ in entry.files.values()}:
+                referenced[digest] -= 1
+                if referenced[digest] == 0:
+                    total -= object_sizes.get(digest, 0)
+                    self._object_path(digest).unlink(missing_ok=True)
+
+        if evicted:
+            self._count("evictions", evicted)
+            print(f"[ArtifactStore] Evicted {evicted} least recently used entr{'y' if evicted == 1 else 'ies'}")
+        return evicted
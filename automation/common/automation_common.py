@@ -1,6 +1,11 @@
 from pathlib import Path
 import configparser
 import ctypes
+import os
+from typing import Dict, List, Optional
+
+PROJECT_CONFIG_PATH = Path(__file__).resolve().parents[1] / "config" / "project.config"
+BUILD_CONFIG_REL_PATH = Path("Config") / "automation" / "build_and_push_to_cgi.config"
 
 def get_project_root() -> Path:
     return Path(__file__).resolve().parents[3]
@@ -11,23 +16,161 @@ def find_uproject(project_root: Path) -> Path:
         raise RuntimeError(f"No .uproject file found in project root: {project_root}")
     return uproject_files[0]
 
-def load_ue_root() -> Path:
-    config_path = Path(__file__).resolve().parents[1] / "config" / "project.config"
-    if not config_path.exists():
-        raise RuntimeError(f"project.config not found at: {config_path}")
+class _CachedConfig:
+    """A config file that is only (re)parsed when its modification time changes."""
 
-    config = configparser.ConfigParser()
-    config.read(config_path)
+    def __init__(self, path: Path):
+        self.path = path
+        self._mtime_ns: Optional[int] = None
+        self._config: Optional[configparser.ConfigParser] = None
 
-    try:
-        ue_root = Path(config["Paths"]["ue_root"])
-    except KeyError:
-        raise RuntimeError("Missing 'ue_root' in [Paths] section of project.config")
+    def get(self) -> configparser.ConfigParser:
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            raise RuntimeError(f"{self.path.name} not found at: {self.path}")
+
+        if self._config is None or mtime_ns != self._mtime_ns:
+            config = configparser.ConfigParser()
+            config.optionxform = str  # keep case-sensitive
+            config.read(self.path)
+            self._config = config
+            self._mtime_ns = mtime_ns
+        return self._config
+
+    @property
+    def mtime_ns(self) -> Optional[int]:
+        return self._mtime_ns
+
+class ProjectContext:
+    """
+    Project paths and configuration shared by all automation scripts.
+    Nothing is read until it's first used; everything derived from project.config is
+    recomputed when that file changes on disk.
+    """
+
+    def __init__(self, config_path: Path = PROJECT_CONFIG_PATH):
+        self.project_config_file = _CachedConfig(config_path)
+        self._build_config_file: Optional[_CachedConfig] = None
+        self._derived: Dict[str, object] = {}
+        self._derived_mtime_ns: Optional[int] = None
+
+    def _refresh(self) -> configparser.ConfigParser:
+        # Drops everything derived from project.config if the file changed since
+        config = self.project_config_file.get()
+        if self.project_config_file.mtime_ns != self._derived_mtime_ns:
+            self._derived.clear()
+            self._build_config_file = None
+            self._derived_mtime_ns = self.project_config_file.mtime_ns
+        return config
+
+    @property
+    def project_config(self) -> configparser.ConfigParser:
+        return self._refresh()
+
+    def _memoized(self, name: str, compute):
+        self._refresh()
+        if name not in self._derived:
+            self._derived[name] = compute()
+        return self._derived[name]
+
+    def _config_path(self, key: str) -> Path:
+        try:
+            value = self.project_config["Paths"][key]
+        except KeyError:
+            raise RuntimeError(f"Missing '{key}' in [Paths] section of project.config")
+
+        # Relative paths are relative to the config folder (as build_and_push_to_cgi.py always resolved them).
+        # Scripts that used load_ue_root() resolved them against the working directory; that still works as a fallback
+        path = (self.project_config_file.path.parent / value).resolve()
+        if not path.exists() and Path(value).exists():
+            path = Path(value).resolve()
+        if not path.exists():
+            raise RuntimeError(f"{key} path does not exist: {path}")
+        return path
+
+    @property
+    def project_root(self) -> Path:
+        return get_project_root()
+
+    @property
+    def uproject(self) -> Path:
+        return self._memoized("uproject", lambda: find_uproject(self.project_root))
 
-    if not ue_root.exists():
-        raise RuntimeError(f"ue_root path does not exist: {ue_root}")
+    @property
+    def project_name(self) -> str:
+        return self.uproject.stem
 
-    return ue_root
+    @property
+    def ue_root(self) -> Path:
+        return self._memoized("ue_root", lambda: self._config_path("ue_root"))
+
+    @property
+    def dev_repo_root(self) -> Path:
+        return self._memoized("dev_repo_root", lambda: self._config_path("dev_repo_root"))
+
+    @property
+    def dev_uproject(self) -> Path:
+        return self._memoized("dev_uproject", lambda: find_uproject(self.dev_repo_root))
+
+    @property
+    def cgi_repo_root(self) -> Path:
+        return self._memoized("cgi_repo_root", lambda: self._config_path("cgi_repo_root"))
+
+    @property
+    def build_config(self) -> configparser.ConfigParser:
+        """<DevRepo>/Config/automation/build_and_push_to_cgi.config"""
+        self._refresh()
+        if self._build_config_file is None:
+            self._build_config_file = _CachedConfig(self.dev_repo_root / BUILD_CONFIG_REL_PATH)
+        return self._build_config_file.get()
+
+    @property
+    def files_to_copy(self) -> List[str]:
+        files_to_copy_raw = self.build_config.get('FilesToCopy', 'paths', fallback='')
+        return [line.strip() for line in files_to_copy_raw.splitlines() if line.strip()]
+
+_project_context: Optional[ProjectContext] = None
+
+def get_project_context() -> ProjectContext:
+    global _project_context
+    if _project_context is None:
+        _project_context = ProjectContext()
+    return _project_context
+
+def load_ue_root() -> Path:
+    return get_project_context().ue_root
+
+def get_automation_state_dir(project_root: Path) -> Path:
+    # Local, untracked state the automation scripts persist between runs (manifests, caches, ...).
+    # Not created here: whoever writes state creates the folder, so dry runs leave no trace
+    return project_root / "Saved" / "Automation"
+
+def get_total_memory_gb() -> float:
+    # Physical memory, used to size parallel job budgets. Falls back to 32 GB if it can't be queried
+    if os.name == "nt":
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.WinDLL('kernel32').GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys / 1024 ** 3
+        return 32.0
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 ** 3
+    except (ValueError, OSError, AttributeError):
+        return 32.0
 
 def bring_console_to_front():
     kernel32 = ctypes.WinDLL('kernel32')
@@ -36,4 +179,4 @@ def bring_console_to_front():
     hWnd = kernel32.GetConsoleWindow()
     if hWnd:
         user32.ShowWindow(hWnd, 9)  # SW_RESTORE
-        user32.SetForegroundWindow(hWnd)
\ No newline at end of file
+        user32.SetForegroundWindow(hWnd)
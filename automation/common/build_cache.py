@@ -0,0 +1,160 @@
+# Skips UBT build steps whose inputs didn't change since they last ran, by restoring the Binaries they produced.
+#
+# A step's cache key is a fingerprint of Source/, Plugins/*/Source, the .uproject/.uplugin files,
+# the engine version and the step's command line. After a step actually ran, the build products listed in the
+# receipts (.target files) it wrote are stored in an ArtifactStore under that key - only that step's own outputs,
+# so a hit restores exactly those files and leaves every other target's and platform's Binaries alone.
+# Steps that write no receipt (e.g. -clean) aren't cached and simply run every time.
+#
+# Receipts are attributed to a step by what changed while it ran, and hits are restored before the next step
+# starts, so the cache must only be used while build steps run one at a time.
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .artifact_store import ArtifactStore
+from .delta_sync import Manifest
+
+OUTPUT_DIR_NAME = "Binaries"
+RECEIPT_EXTENSION = ".target"
+# Folders never searched for plugin Source/Binaries folders
+_SKIPPED_PLUGIN_DIRS = {"Content", "Intermediate", "Resources", "Config", "Source", "Binaries"}
+
+
+def _find_plugin_dirs(project_root: Path, name: str) -> List[str]:
+    """Returns the project-relative paths of all <name> folders that belong to a plugin (Plugins/**/<Plugin>/<name>)."""
+    results: List[str] = []
+    plugins_root = project_root / "Plugins"
+    if not plugins_root.is_dir():
+        return results
+    for dir_path, dir_names, file_names in os.walk(plugins_root):
+        if name in dir_names and any(file_name.endswith(".uplugin") for file_name in file_names):
+            results.append(Path(dir_path, name).relative_to(project_root).as_posix())
+        dir_names[:] = [d for d in dir_names if d not in _SKIPPED_PLUGIN_DIRS and not d.startswith(".")]
+    return results
+
+
+def _find_plugin_descriptors(project_root: Path) -> List[str]:
+    plugins_root = project_root / "Plugins"
+    if not plugins_root.is_dir():
+        return []
+    return [p.relative_to(project_root).as_posix() for p in plugins_root.rglob("*.uplugin")]
+
+
+def _read_build_products(receipt_path: Path, project_root: Path) -> List[str]:
+    """Project-relative paths of the build products a receipt lists (engine products are left out)."""
+    try:
+        with open(receipt_path, "r", encoding="utf-8-sig") as f:
+            receipt = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    project_dir = receipt.get("ProjectDir") or str(project_root)
+    results: List[str] = []
+    for product in receipt.get("BuildProducts", []):
+        path = str(product.get("Path", "")).replace("$(ProjectDir)", project_dir)
+        try:
+            results.append(Path(path).resolve().relative_to(project_root.resolve()).as_posix())
+        except ValueError:
+            continue
+    return results
+
+
+class BuildCache:
+    def __init__(self, project_root: Path, engine_root: Path, store: ArtifactStore, state_dir: Path):
+        self.project_root = project_root
+        self.engine_root = engine_root
+        self.store = store
+        self.state_dir = state_dir
+        self._lock = threading.Lock()
+        self._input_fingerprint: Optional[str] = None
+        # Receipts (rel path -> mtime) before the step that is running now
+        self._receipts_before: Dict[str, int] = {}
+        # Steps that ran and produced new outputs this build; anything depending on them has to run as well
+        self._ran: set = set()
+
+    def input_fingerprint(self) -> str:
+        with self._lock:
+            if self._input_fingerprint is None:
+                self._input_fingerprint = self._compute_input_fingerprint()
+            return self._input_fingerprint
+
+    def _compute_input_fingerprint(self) -> str:
+        roots = ["Source"] + _find_plugin_dirs(self.project_root, "Source") + _find_plugin_descriptors(self.project_root)
+        roots += [p.name for p in self.project_root.glob("*.uproject")]
+        manifest = Manifest(self.project_root, self.state_dir / "inputs_manifest.json")
+        manifest.scan(roots)
+
+        digest = hashlib.blake2b(digest_size=20)
+        build_version = self.engine_root / "Engine" / "Build" / "Build.version"
+        if build_version.exists():
+            digest.update(build_version.read_bytes())
+        for rel in sorted(manifest.files):
+            digest.update(f"{rel}\0{manifest.digest(rel)}\n".encode("utf-8"))
+        manifest.save()
+        return digest.hexdigest()
+
+    def step_key(self, command: List[str]) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(self.input_fingerprint().encode("utf-8"))
+        digest.update("\0".join(command).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _scan_receipts(self) -> Dict[str, int]:
+        receipts: Dict[str, int] = {}
+        for rel_dir in [OUTPUT_DIR_NAME] + _find_plugin_dirs(self.project_root, OUTPUT_DIR_NAME):
+            for path in (self.project_root / rel_dir).rglob(f"*{RECEIPT_EXTENSION}"):
+                try:
+                    receipts[path.relative_to(self.project_root).as_posix()] = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return receipts
+
+    def _output_manifest(self, step, rel_paths: List[str]) -> Manifest:
+        # One manifest per step, so unchanged outputs aren't hashed again
+        manifest = Manifest(self.project_root, self.state_dir / "outputs" / f"{step.name}.json")
+        manifest.scan(rel_paths)
+        return manifest
+
+    def try_skip(self, step) -> bool:
+        """Scheduler skip check: True if the step's outputs are cached (and restored), so it doesn't have to run."""
+        if any(name in self._ran for name in step.requires):
+            entry = None
+        else:
+            entry = self.store.lookup(self.step_key(step.command))
+
+        if entry is not None:
+            with self._lock:
+                manifest = self._output_manifest(step, list(entry.files))
+                copied, _ = self.store.restore(entry, manifest)
+                manifest.save()
+            print(f"[{step.name}] Build cache hit, skipping ({copied} of {len(entry.files)} file(s) restored)")
+            return True
+
+        print(f"[{step.name}] Build cache miss")
+        with self._lock:
+            self._receipts_before = self._scan_receipts()
+        return False
+
+    def on_step_succeeded(self, step) -> None:
+        """Scheduler callback: stores the products of the receipts a step that actually ran wrote."""
+        key = self.step_key(step.command)
+        with self._lock:
+            written = [rel for rel, mtime_ns in self._scan_receipts().items() if self._receipts_before.get(rel) != mtime_ns]
+            if not written:
+                print(f"[{step.name}] No build receipt written, nothing to cache")
+                return
+            self._ran.add(step.name)
+            products = set(written)
+            for rel in written:
+                products.update(_read_build_products(self.project_root / rel, self.project_root))
+            try:
+                manifest = self._output_manifest(step, sorted(products))
+                self.store.store(key, manifest, metadata={"command": " ".join(step.command)})
+                manifest.save()
+            except (OSError, RuntimeError) as e:
+                print(f"[{step.name}] Warning: failed to store build outputs in cache: {e}")
@@ -0,0 +1,260 @@
+# Local history of automation runs (packaging, CGI pushes, Android builds) in a SQLite database.
+#
+# Every entry point wraps its work in a RunRecorder, which stores one row per run plus its step timings
+# in <Project>/Saved/Automation/build_history.sqlite. build_report.py turns that into trends,
+# percentiles and regression flags; estimate() gives ETAs for runs in progress.
+# Recording is best effort: a broken or locked database only prints a warning, it never fails a build.
+from __future__ import annotations
+
+import contextlib
+import socket
+import sqlite3
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from .automation_common import get_automation_state_dir
+
+DATABASE_NAME = "build_history.sqlite"
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+# Number of earlier successful runs a run is compared against
+DEFAULT_BASELINE_RUNS = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pipeline TEXT NOT NULL,
+    command TEXT,
+    config TEXT,
+    platform TEXT,
+    git_revision TEXT,
+    host TEXT,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    exit_code INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_pipeline ON runs (pipeline, config, platform, started);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS steps_by_run ON steps (run_id);
+"""
+
+
+@dataclass
+class RunRecord:
+    id: int
+    pipeline: str
+    command: str
+    config: str
+    platform: str
+    git_revision: str
+    host: str
+    started: float
+    duration: float
+    exit_code: int
+    steps: List[Tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.exit_code == 0
+
+
+def get_database_path(project_root: Path) -> Path:
+    return get_automation_state_dir(project_root) / DATABASE_NAME
+
+
+def connect(database_path: Path) -> sqlite3.Connection:
+    database_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(database_path), timeout=10)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA foreign_keys=ON")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def get_git_revision(repo_root: Path) -> str:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(repo_root), capture_output=True, text=True, stdin=subprocess.DEVNULL, timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Linear-interpolated percentile (p in 0..100), or None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * p / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+# ---------------------------
+# Recording
+# ---------------------------
+
+class RunRecorder:
+    """
+    with RunRecorder(project_root, "package", command, config="Shipping", platform="Win64") as run:
+        with run.step("cook"):
+            ...
+    The run counts as failed if the block raises, or if exit_code is set to something else than 0.
+    """
+
+    def __init__(self, project_root: Path, pipeline: str, command: str = "", config: str = "", platform: str = "",
+                 enabled: bool = True):
+        self.project_root = Path(project_root)
+        self.pipeline = pipeline
+        self.command = command
+        self.config = config
+        self.platform = platform
+        self.enabled = enabled
+        self.exit_code: Optional[int] = None
+        self.steps: List[Tuple[str, float]] = []
+        self.started = 0.0
+        self._start_perf = 0.0
+
+    def __enter__(self) -> "RunRecorder":
+        self.started = time.time()
+        self._start_perf = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None and self.exit_code in (None, 0):
+            self.exit_code = 1
+        if self.enabled:
+            self.save(time.perf_counter() - self._start_perf)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start_perf
+
+    @contextlib.contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_step(name, time.perf_counter() - start)
+
+    def add_step(self, name: str, duration: float) -> None:
+        self.steps.append((name, duration))
+
+    def add_phase_steps(self, summary) -> None:
+        """Adds the phases of a uat_log_parser.LogSummary as steps."""
+        for phase in summary.phases:
+            if phase.duration is not None:
+                self.add_step(phase.name, phase.duration)
+
+    def estimate(self) -> Tuple[Optional[float], Optional[float]]:
+        """(p50, p90) duration of earlier successful runs of the same pipeline/config/platform."""
+        try:
+            return estimate(self.project_root, self.pipeline, self.config, self.platform)
+        except sqlite3.Error:
+            return None, None
+
+    def format_eta(self) -> str:
+        p50, p90 = self.estimate()
+        if p50 is None:
+            return ""
+        remaining = max(p50 - self.elapsed, 0.0)
+        return f"ETA {format_duration(remaining)} (usually {format_duration(p50)}, p90 {format_duration(p90)})"
+
+    def save(self, duration: float) -> None:
+        try:
+            with contextlib.closing(connect(get_database_path(self.project_root))) as connection, connection:
+                cursor = connection.execute(
+                    "INSERT INTO runs (pipeline, command, config, platform, git_revision, host, started, duration, exit_code) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.pipeline, self.command, self.config, self.platform, get_git_revision(self.project_root),
+                     socket.gethostname(), self.started, duration, self.exit_code or 0),
+                )
+                connection.executemany(
+                    "INSERT INTO steps (run_id, ordinal, name, duration) VALUES (?, ?, ?, ?)",
+                    [(cursor.lastrowid, ordinal, name, step_duration) for ordinal, (name, step_duration) in enumerate(self.steps)],
+                )
+        except (sqlite3.Error, OSError) as e:
+            print(f"[BuildHistory] Warning: failed to record run: {e}")
+
+
+# ---------------------------
+# Queries
+# ---------------------------
+
+def load_runs(project_root: Path, pipeline: Optional[str] = None, limit: int = 200) -> List[RunRecord]:
+    """Most recent runs first."""
+    database_path = get_database_path(project_root)
+    if not database_path.exists():
+        return []
+    with contextlib.closing(connect(database_path)) as connection:
+        query = "SELECT id, pipeline, command, config, platform, git_revision, host, started, duration, exit_code FROM runs"
+        params: list = []
+        if pipeline:
+            query += " WHERE pipeline = ?"
+            params.append(pipeline)
+        query += " ORDER BY started DESC LIMIT ?"
+        params.append(limit)
+        runs = [RunRecord(*row) for row in connection.execute(query, params)]
+
+        by_id = {run.id: run for run in runs}
+        if by_id:
+            placeholders = ",".join("?" * len(by_id))
+            for run_id, name, duration in connection.execute(
+                f"SELECT run_id, name, duration FROM steps WHERE run_id IN ({placeholders}) ORDER BY run_id, ordinal",
+                list(by_id),
+            ):
+                by_id[run_id].steps.append((name, duration))
+    return runs
+
+
+def estimate(project_root: Path, pipeline: str, config: str = "", platform: str = "",
+             sample_size: int = 20) -> Tuple[Optional[float], Optional[float]]:
+    """(p50, p90) of the last successful runs with the same pipeline, config and platform."""
+    database_path = get_database_path(project_root)
+    if not database_path.exists():
+        return None, None
+    with contextlib.closing(connect(database_path)) as connection:
+        durations = [row[0] for row in connection.execute(
+            "SELECT duration FROM runs WHERE pipeline = ? AND config = ? AND platform = ? AND exit_code = 0 "
+            "ORDER BY started DESC LIMIT ?",
+            (pipeline, config, platform, sample_size),
+        )]
+    return percentile(durations, 50), percentile(durations, 90)
+
+
+def find_regressions(runs: List[RunRecord], threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+                     baseline_runs: int = DEFAULT_BASELINE_RUNS) -> List[Tuple[RunRecord, float]]:
+    """
+    Successful runs that took more than (1 + threshold) times the median of the successful runs
+    before them (same pipeline/config/platform). Returns (run, ratio) pairs, most recent first.
+    """
+    regressions: List[Tuple[RunRecord, float]] = []
+    ordered = sorted((run for run in runs if run.succeeded), key=lambda run: run.started)
+    previous: dict = {}
+    for run in ordered:
+        key = (run.pipeline, run.config, run.platform)
+        history = previous.setdefault(key, [])
+        baseline = percentile(history[-baseline_runs:], 50)
+        if baseline and len(history) >= 3 and run.duration > baseline * (1.0 + threshold):
+            regressions.append((run, run.duration / baseline))
+        history.append(run.duration)
+    regressions.reverse()
+    return regressions
@@ -0,0 +1,188 @@
+# Capture runs: a launch with CSV profiler / Unreal Insights capture arguments whose output ends up in its own folder.
+#
+#   capture = CaptureRun.create(project_root, settings, map_value, mode)
+#   cmd += capture.args()              # -trace/-tracefile, -csvCaptureFrames, -csvMetadata, -ExecCmds
+#   ...launch and wait for the process to exit...
+#   capture.collect(exit_code)         # moves the new .csv/.utrace files into the session folder
+#
+# Sessions live in <Project>/Saved/Automation/Captures/<start time>_<mode>_<map>/ with a session.json (map, mode,
+# git revision, command, exit code, files); Captures/index.json lists every session, newest last.
+# The trace is written straight into the session folder (-tracefile). The CSV profiler always writes to
+# Saved/Profiling/CSV/, so CSVs written there after the launch are moved over when the process has exited.
+from __future__ import annotations
+
+import configparser
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from .automation_common import get_automation_state_dir
+
+CAPTURES_DIR_NAME = "Captures"
+INDEX_FILE_NAME = "index.json"
+SESSION_FILE_NAME = "session.json"
+CAPTURE_SECTION = "Capture"
+# Files the CSV profiler and trace write below Saved/Profiling
+PROFILE_SUFFIXES = (".csv", ".csv.bin", ".utrace")
+
+_index_lock = threading.Lock()
+
+
+@dataclass
+class CaptureSettings:
+    # Stored in [Capture] of RunEditor.config
+    # Frames the CSV profiler records from startup; 0 = no CSV capture
+    capture_frames: int = 1800
+    # Unreal Insights channels; empty = no trace
+    trace_channels: str = "default,memory"
+    # Console commands run at startup (comma-separated, like -ExecCmds)
+    exec_cmds: str = ""
+    # Quit once the CSV capture is done, so every run covers the same timed window
+    exit_when_done: bool = True
+
+
+@dataclass
+class CaptureSession:
+    id: str
+    folder: str
+    map: str
+    mode: str
+    revision: str
+    started: float
+    command: List[str] = field(default_factory=list)
+    ended: Optional[float] = None
+    exit_code: Optional[int] = None
+    files: List[str] = field(default_factory=list)
+
+
+def read_capture_settings(config: configparser.ConfigParser) -> CaptureSettings:
+    defaults = CaptureSettings()
+    return CaptureSettings(
+        capture_frames=config.getint(CAPTURE_SECTION, "capture_frames", fallback=defaults.capture_frames),
+        trace_channels=config.get(CAPTURE_SECTION, "trace_channels", fallback=defaults.trace_channels),
+        exec_cmds=config.get(CAPTURE_SECTION, "exec_cmds", fallback=defaults.exec_cmds),
+        exit_when_done=config.getboolean(CAPTURE_SECTION, "exit_when_done", fallback=defaults.exit_when_done),
+    )
+
+
+def get_git_revision(repo_root: Path) -> str:
+    """Short HEAD hash, with "-dirty" when there are local changes; "unknown" outside git."""
+    try:
+        head = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=repo_root, capture_output=True,
+                              text=True, stdin=subprocess.DEVNULL, timeout=10)
+        if head.returncode != 0:
+            return "unknown"
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repo_root,
+                                capture_output=True, text=True, stdin=subprocess.DEVNULL, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+    return head.stdout.strip() + ("-dirty" if status.stdout.strip() else "")
+
+
+def _slug(text: str) -> str:
+    # "/Game/Maps/Arena" -> "Arena", "Listen Server" -> "ListenServer"
+    return re.sub(r"[^A-Za-z0-9_-]", "", text.strip().rstrip("/").split("/")[-1].split(".")[0]) or "none"
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def get_captures_root(project_root: Path) -> Path:
+    return get_automation_state_dir(project_root) / CAPTURES_DIR_NAME
+
+
+def load_index(project_root: Path) -> List[dict]:
+    try:
+        with open(get_captures_root(project_root) / INDEX_FILE_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+
+
+class CaptureRun:
+    def __init__(self, project_root: Path, settings: CaptureSettings, session: CaptureSession):
+        self.project_root = Path(project_root)
+        self.settings = settings
+        self.session = session
+
+    @classmethod
+    def create(cls, project_root: Path, settings: CaptureSettings, map_value: str, mode: str) -> "CaptureRun":
+        started = time.time()
+        session_id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(started))}_{_slug(mode)}_{_slug(map_value)}"
+        folder = get_captures_root(project_root) / session_id
+        suffix = 1
+        while folder.exists():
+            suffix += 1
+            folder = folder.with_name(f"{session_id}_{suffix}")
+        folder.mkdir(parents=True)
+        session = CaptureSession(
+            id=folder.name,
+            folder=str(folder),
+            map=map_value,
+            mode=mode,
+            revision=get_git_revision(project_root),
+            started=started,
+        )
+        return cls(project_root, settings, session)
+
+    @property
+    def folder(self) -> Path:
+        return Path(self.session.folder)
+
+    def args(self) -> List[str]:
+        return capture_args(self.settings, self.session.map, self.session.mode, self.session.revision, self.folder / f"{self.session.id}.utrace")
+
+    def collect(self, exit_code: Optional[int], command: Optional[List[str]] = None) -> List[Path]:
+        """Moves the profiling files written since the launch into the session folder and indexes the session."""
+        self.session.ended = time.time()
+        self.session.exit_code = exit_code
+        if command is not None:
+            self.session.command = [str(arg) for arg in command]
+
+        profiling_dir = self.project_root / "Saved" / "Profiling"
+        if profiling_dir.is_dir():
+            for dir_path, _, file_names in os.walk(profiling_dir):
+                for name in file_names:
+                    source = Path(dir_path, name)
+                    if not name.lower().endswith(PROFILE_SUFFIXES):
+                        continue
+                    try:
+                        # A second of slack: some filesystems round modification times
+                        if source.stat().st_mtime < self.session.started - 1:
+                            continue
+                        os.replace(source, self.folder / name)
+                    except OSError as e:
+                        print(f"[Capture] Could not collect {source}: {e}")
+
+        self.session.files = sorted(p.name for p in self.folder.iterdir() if p.name != SESSION_FILE_NAME)
+        _write_json_atomic(self.folder / SESSION_FILE_NAME, asdict(self.session))
+        with _index_lock:
+            index = [entry for entry in load_index(self.project_root) if entry.get("id") != self.session.id]
+            index.append({key: value for key, value in asdict(self.session).items() if key != "command"})
+            _write_json_atomic(get_captures_root(self.project_root) / INDEX_FILE_NAME, index)
+        return [self.folder / name for name in self.session.files]
+
+
+def capture_args(settings: CaptureSettings, map_value: str, mode: str, revision: str, trace_path: Path) -> List[str]:
+    args: List[str] = []
+    if settings.trace_channels.strip():
+        args += [f"-trace={settings.trace_channels.strip()}", f"-tracefile={trace_path}", "-statnamedevents"]
+    if settings.capture_frames > 0:
+        args.append(f"-csvCaptureFrames={settings.capture_frames}")
+        # Shown by CsvToSVG/PerfReportTool and kept in the CSV itself
+        args.append(f"-csvMetadata=Map={_slug(map_value)},Mode={_slug(mode)},Revision={revision}")
+        if settings.exit_when_done:
+            args.append("-ExitAfterCsvProfiling")
+    if settings.exec_cmds.strip():
+        args.append(f"-ExecCmds={settings.exec_cmds.strip()}")
+    return args
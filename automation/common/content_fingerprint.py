@@ -0,0 +1,166 @@
+# Decides whether a content-only package has to cook again, by comparing its inputs with the last successful run.
+#
+# Inputs are Content/, Config/, the .uproject, every plugin's Content/, Config/ and .uplugin, and the prebuilt
+# Binaries/Android libraries. Their (size, mtime, hash) state is kept in a delta_sync.Manifest, so a check
+# only stats the tree and hashes just the files whose size or mtime changed (a touched but identical file
+# still counts as unchanged). The snapshot is taken before cooking and only saved once the package succeeded.
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .build_cache import _find_plugin_descriptors, _find_plugin_dirs
+from .delta_sync import Manifest, format_bytes
+
+STATE_VERSION = 1
+# Outputs of the package itself or files rewritten by the packaging scripts, not inputs
+_IGNORED_BINARY_SUFFIXES = {".apk", ".obb", ".bak", ".target", ".tmp"}
+MAX_LISTED_CHANGES = 10
+
+
+@dataclass
+class ContentCheck:
+    needs_cook: bool
+    reason: str
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        lines = [self.reason]
+        changes = [(rel, "added") for rel in self.added] + [(rel, "modified") for rel in self.modified] + \
+                  [(rel, "removed") for rel in self.removed]
+        for rel, kind in changes[:MAX_LISTED_CHANGES]:
+            lines.append(f"  {kind:<8} {rel}")
+        if len(changes) > MAX_LISTED_CHANGES:
+            lines.append(f"  ... and {len(changes) - MAX_LISTED_CHANGES} more")
+        return "\n".join(lines)
+
+
+class ContentFingerprint:
+    """
+    fingerprint = ContentFingerprint(project_root, engine_root, state_dir, "content_only_android")
+    check = fingerprint.check(settings, apk_path)
+    if check.needs_cook:
+        ...cook and package...
+        fingerprint.save(settings, apk_path)
+    """
+
+    def __init__(self, project_root: Path, engine_root: Path, state_dir: Path, name: str):
+        self.project_root = Path(project_root)
+        self.engine_root = Path(engine_root)
+        self.state_path = Path(state_dir) / f"{name}.json"
+        self.manifest = Manifest(self.project_root, Path(state_dir) / f"{name}_inputs_manifest.json")
+        self._scanned = False
+
+    def _input_roots(self) -> List[str]:
+        roots = ["Content", "Config", "Binaries/Android"]
+        roots += [p.name for p in self.project_root.glob("*.uproject")]
+        roots += _find_plugin_dirs(self.project_root, "Content") + _find_plugin_dirs(self.project_root, "Config")
+        roots += _find_plugin_descriptors(self.project_root)
+        return roots
+
+    def scan(self) -> None:
+        self.manifest.scan(self._input_roots())
+        self.manifest.files = {
+            rel: state for rel, state in self.manifest.files.items()
+            if not (rel.startswith("Binaries/") and os.path.splitext(rel)[1].lower() in _IGNORED_BINARY_SUFFIXES)
+        }
+        self._scanned = True
+
+    def _settings_key(self, settings: Dict[str, str]) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        build_version = self.engine_root / "Engine" / "Build" / "Build.version"
+        if build_version.exists():
+            digest.update(build_version.read_bytes())
+        digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _load_state(self) -> Optional[dict]:
+        if not self.state_path.exists():
+            return None
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return state if state.get("version") == STATE_VERSION else None
+
+    def check(self, settings: Dict[str, str], apk_path: Path) -> ContentCheck:
+        """Compares the current inputs, settings (configuration, command line) and APK with the last successful run."""
+        self.scan()
+        state = self._load_state()
+        if state is None or not self.manifest.manifest_path.exists():
+            self._hash_all()
+            return ContentCheck(True, "Cooking: no successful package recorded yet")
+        if state.get("settings_key") != self._settings_key(settings):
+            previous = state.get("settings", {})
+            changed = [f"{key} {previous.get(key)!r} -> {value!r}" for key, value in settings.items() if previous.get(key) != value]
+            self._hash_all()
+            return ContentCheck(True, "Cooking: " + ("; ".join(changed) if changed else "engine version changed"))
+        if not apk_path.exists():
+            self._hash_all()
+            return ContentCheck(True, f"Cooking: APK not found at {apk_path}")
+        apk_stat = apk_path.stat()
+        if [apk_stat.st_size, apk_stat.st_mtime_ns] != state.get("apk"):
+            self._hash_all()
+            return ContentCheck(True, f"Cooking: APK changed since the last successful package ({apk_path.name})")
+
+        previous_files = self.manifest._cached
+        result = ContentCheck(False, "")
+        for rel, current in self.manifest.files.items():
+            previous = previous_files.get(rel)
+            if previous is None:
+                result.added.append(rel)
+            elif current.size != previous.size:
+                result.modified.append(rel)
+            elif current.digest is None:
+                # mtime changed: the content decides
+                if previous.digest is None or self.manifest.digest(rel) != previous.digest:
+                    result.modified.append(rel)
+        result.removed = sorted(set(previous_files) - set(self.manifest.files))
+        result.added.sort()
+        result.modified.sort()
+
+        changes = len(result.added) + len(result.modified) + len(result.removed)
+        hashed = f", {format_bytes(self.manifest.hashed_bytes)} hashed" if self.manifest.hashed_bytes else ""
+        if changes:
+            result.needs_cook = True
+            result.reason = f"Cooking: {changes} input file(s) changed since the last successful package{hashed}:"
+            self._hash_all()
+        else:
+            # Keeps the hashes of touched-but-identical files, so they aren't hashed again next time
+            self.manifest.save()
+            result.reason = (f"Skipping cook: {len(self.manifest.files)} input file(s) unchanged since the last successful package"
+                             f"{hashed}; reusing {apk_path.name}")
+        return result
+
+    def _hash_all(self) -> None:
+        # Done before cooking, so the snapshot matches what the cook saw even if files are edited meanwhile.
+        # Only the first run hashes everything; after that only files whose size or mtime changed are hashed.
+        for rel in self.manifest.files:
+            self.manifest.digest(rel)
+
+    def save(self, settings: Dict[str, str], apk_path: Path) -> None:
+        """Records the inputs as scanned by check() (i.e. before cooking) as the last successful state."""
+        if not self._scanned:
+            self.scan()
+            self._hash_all()
+        self.manifest.save()
+
+        apk_stat = apk_path.stat()
+        state = {
+            "version": STATE_VERSION,
+            "settings": settings,
+            "settings_key": self._settings_key(settings),
+            "apk": [apk_stat.st_size, apk_stat.st_mtime_ns],
+        }
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,293 @@
+# DerivedDataCache (DDC) management: shared DDC overrides for launches and packaging, stats, LRU pruning and warming.
+#
+# The engine's filesystem DDC nodes can be redirected without touching DefaultEngine.ini:
+#   Shared: -SharedDataCachePath=<path> on the command line, or the UE-SharedDataCachePath environment variable
+#   Local:  the UE-LocalDataCachePath environment variable
+# Editor command lines get the argument (visible in previews); UAT gets the environment variables, which the
+# cook and every other process it starts inherit.
+#
+# A cache is scanned in parallel (one os.scandir walk per sub folder of the two top levels, the DDC's hash
+# buckets) into (path, size, last use) records. Last use is the newest of access and modification time: the
+# engine refreshes the timestamps of files it reads from a filesystem DDC, and last-access updates may be off.
+from __future__ import annotations
+
+import configparser
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .delta_sync import format_bytes
+
+DDC_SECTION = "DDC"
+SHARED_PATH_ENV = "UE-SharedDataCachePath"
+LOCAL_PATH_ENV = "UE-LocalDataCachePath"
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+# Files used this recently are never pruned: a running editor or cook may be about to read them again
+MIN_PRUNE_AGE_SECONDS = 60 * 60
+# (upper bound in days, label); None = everything older
+AGE_BUCKETS: Tuple[Tuple[Optional[float], str], ...] = (
+    (1, "< 1 day"),
+    (7, "1-7 days"),
+    (30, "7-30 days"),
+    (90, "30-90 days"),
+    (None, "> 90 days"),
+)
+
+_GB = 1024 ** 3
+
+
+@dataclass
+class DdcSettings:
+    # None = the engine's default (no shared DDC)
+    shared_path: Optional[Path]
+    local_path: Path
+    # True if local_path was configured, i.e. it must be passed to the engine
+    local_path_override: bool
+    local_max_size_gb: float
+    # 0 = never pruned (a shared DDC is usually pruned by the machine hosting it)
+    shared_max_size_gb: float
+    warm_maps: List[str] = field(default_factory=list)
+    warm_platforms: List[str] = field(default_factory=list)
+
+
+@dataclass
+class CacheFile:
+    path: str
+    size: int
+    last_used: float
+
+
+@dataclass
+class CacheStats:
+    root: Path
+    files: int = 0
+    bytes: int = 0
+    # label -> [files, bytes], in AGE_BUCKETS order
+    ages: Dict[str, List[int]] = field(default_factory=dict)
+
+    def format(self, max_size_gb: float = 0) -> str:
+        lines = [f"{self.root}: {format_bytes(self.bytes)} in {self.files} file(s)"
+                 + (f", {self.bytes / (max_size_gb * _GB):.0%} of the {max_size_gb:g} GB budget" if max_size_gb > 0 else "")]
+        lines.append("  Last used       Files        Size   Share")
+        for label, (files, num_bytes) in self.ages.items():
+            share = num_bytes / self.bytes if self.bytes else 0.0
+            lines.append(f"  {label:<12} {files:>8} {format_bytes(num_bytes):>11} {share:>7.0%}")
+        return "\n".join(lines)
+
+
+@dataclass
+class PruneReport:
+    scanned_files: int = 0
+    scanned_bytes: int = 0
+    removed_files: int = 0
+    removed_bytes: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (f"{self.removed_files} of {self.scanned_files} file(s) pruned ({format_bytes(self.removed_bytes)} of "
+                f"{format_bytes(self.scanned_bytes)}) in {self.seconds:.2f}s"
+                + (f", {len(self.failed)} failed" if self.failed else ""))
+
+
+def _default_local_path(project_root: Path) -> Path:
+    # Projects that set Path=%GAMEDIR%DerivedDataCache keep it in the project, otherwise the engine's per-user default
+    project_ddc = Path(project_root) / "DerivedDataCache"
+    if project_ddc.is_dir():
+        return project_ddc
+    local_app_data = os.environ.get("LOCALAPPDATA", str(Path.home() / "AppData" / "Local"))
+    return Path(local_app_data) / "UnrealEngine" / "Common" / "DerivedDataCache"
+
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in value.replace("\n", ",").split(",") if item.strip()]
+
+
+def load_ddc_settings(project_config: configparser.ConfigParser, project_root: Path) -> DdcSettings:
+    shared = project_config.get(DDC_SECTION, "SharedPath", fallback="").strip()
+    local = project_config.get(DDC_SECTION, "LocalPath", fallback="").strip()
+    return DdcSettings(
+        shared_path=Path(shared) if shared else None,
+        local_path=Path(local) if local else _default_local_path(project_root),
+        local_path_override=bool(local),
+        local_max_size_gb=project_config.getfloat(DDC_SECTION, "LocalMaxSizeGB", fallback=0.0),
+        shared_max_size_gb=project_config.getfloat(DDC_SECTION, "SharedMaxSizeGB", fallback=0.0),
+        warm_maps=_split_list(project_config.get(DDC_SECTION, "WarmMaps", fallback="")),
+        warm_platforms=_split_list(project_config.get(DDC_SECTION, "WarmPlatforms", fallback="")),
+    )
+
+
+def ddc_command_line_args(settings: DdcSettings) -> List[str]:
+    """Arguments for editor/commandlet command lines. The local path has no command-line override, see ddc_environment()."""
+    return [f"-SharedDataCachePath={settings.shared_path}"] if settings.shared_path is not None else []
+
+
+def ddc_environment(settings: DdcSettings) -> Dict[str, str]:
+    """Environment overrides for processes that start the engine themselves (UAT, and the cook it runs)."""
+    env: Dict[str, str] = {}
+    if settings.shared_path is not None:
+        env[SHARED_PATH_ENV] = str(settings.shared_path)
+    if settings.local_path_override:
+        env[LOCAL_PATH_ENV] = str(settings.local_path)
+    return env
+
+
+def apply_ddc_environment(settings: DdcSettings, output=print) -> Dict[str, str]:
+    """Sets the overrides in os.environ, so every process started afterwards inherits them. Returns the overrides."""
+    env = ddc_environment(settings)
+    os.environ.update(env)
+    for name, value in env.items():
+        output(f"[DDC] {name}={value}")
+    return env
+
+
+# ---------------------------
+# Scanning
+# ---------------------------
+
+def _walk_files(folder: str) -> List[CacheFile]:
+    files: List[CacheFile] = []
+    stack = [folder]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            files.append(CacheFile(entry.path, st.st_size, max(st.st_atime, st.st_mtime)))
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+    return files
+
+
+def scan_cache(root: Path, max_workers: int = DEFAULT_MAX_WORKERS) -> List[CacheFile]:
+    """Every file below root. The sub folders of the top two levels are walked in parallel."""
+    files: List[CacheFile] = []
+    level = [str(root)]
+    for _ in range(2):
+        next_level: List[str] = []
+        for folder in level:
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            next_level.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            files.append(CacheFile(entry.path, st.st_size, max(st.st_atime, st.st_mtime)))
+            except OSError:
+                pass
+        level = next_level
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for folder_files in pool.map(_walk_files, level):
+            files.extend(folder_files)
+    return files
+
+
+def compute_stats(root: Path, files: List[CacheFile], now: Optional[float] = None) -> CacheStats:
+    now = time.time() if now is None else now
+    stats = CacheStats(root=Path(root), files=len(files), bytes=sum(f.size for f in files))
+    stats.ages = {label: [0, 0] for _, label in AGE_BUCKETS}
+    for f in files:
+        age_days = (now - f.last_used) / 86400
+        for max_days, label in AGE_BUCKETS:
+            if max_days is None or age_days < max_days:
+                stats.ages[label][0] += 1
+                stats.ages[label][1] += f.size
+                break
+    return stats
+
+
+# ---------------------------
+# Pruning
+# ---------------------------
+
+def select_lru(files: List[CacheFile], max_bytes: int, now: Optional[float] = None,
+               min_age_seconds: float = MIN_PRUNE_AGE_SECONDS) -> List[CacheFile]:
+    """The least recently used files to delete to get the total down to max_bytes (recently used ones are kept)."""
+    now = time.time() if now is None else now
+    excess = sum(f.size for f in files) - max_bytes
+    selected: List[CacheFile] = []
+    for f in sorted(files, key=lambda f: f.last_used):
+        if excess <= 0 or now - f.last_used < min_age_seconds:
+            break
+        selected.append(f)
+        excess -= f.size
+    return selected
+
+
+def _remove_file(path: str) -> Optional[str]:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return str(e)
+    return None
+
+
+def prune_cache(root: Path, max_size_gb: float, dry_run: bool = False,
+                max_workers: int = DEFAULT_MAX_WORKERS) -> PruneReport:
+    """Deletes the least recently used files until the cache fits in max_size_gb; emptied folders are removed too."""
+    start = time.perf_counter()
+    root = Path(root)
+    files = scan_cache(root, max_workers=max_workers)
+    report = PruneReport(scanned_files=len(files), scanned_bytes=sum(f.size for f in files))
+    selected = select_lru(files, int(max_size_gb * _GB))
+    if dry_run:
+        report.removed_files = len(selected)
+        report.removed_bytes = sum(f.size for f in selected)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for f, error in zip(selected, pool.map(lambda f: _remove_file(f.path), selected)):
+            if error:
+                report.failed.append((f.path, error))
+            else:
+                report.removed_files += 1
+                report.removed_bytes += f.size
+
+    # Deepest first, so parents emptied by their children go too; rmdir fails on anything still in use
+    folders = {os.path.dirname(f.path) for f in selected}
+    for folder in sorted(folders, key=len, reverse=True):
+        current = Path(folder)
+        while current != root and root in current.parents:
+            try:
+                current.rmdir()
+            except OSError:
+                break
+            current = current.parent
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+# ---------------------------
+# Warming
+# ---------------------------
+
+def build_warm_command(editor_cmd: Path, uproject: Path, settings: DdcSettings,
+                       maps: Optional[List[str]] = None, platforms: Optional[List[str]] = None) -> List[str]:
+    """
+    A headless DerivedDataCache commandlet run that loads the given maps (every package if none) and stores what it
+    derives (textures, meshes, shaders for the target platforms) in the configured caches.
+    """
+    maps = settings.warm_maps if maps is None else maps
+    platforms = settings.warm_platforms if platforms is None else platforms
+    command = [str(editor_cmd), str(uproject), "-run=DerivedDataCache", "-fill"]
+    if maps:
+        command.append("-Map=" + "+".join(maps))
+    if platforms:
+        command.append("-TargetPlatform=" + "+".join(platforms))
+    command += ["-unattended", "-nop4", "-nosplash", "-stdout", "-FullStdOutLogOutput", "-utf8output"]
+    return command + ddc_command_line_args(settings)
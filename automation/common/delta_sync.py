@@ -0,0 +1,233 @@
+# Manifest-based delta sync between two repository trees.
+# Only files whose content actually differs are copied, and only files that vanished from the
+# source are deleted, so the destination working tree (and git's index) only changes where needed.
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .fast_copy import copy_files
+
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class FileState:
+    size: int
+    mtime_ns: int
+    digest: Optional[str] = None
+
+
+@dataclass
+class SyncReport:
+    copied_files: int = 0
+    copied_bytes: int = 0
+    deleted_files: int = 0
+    deleted_bytes: int = 0
+    unchanged_files: int = 0
+    hashed_bytes: int = 0
+    touched_paths: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"{self.copied_files} file(s) copied ({format_bytes(self.copied_bytes)}), "
+            f"{self.deleted_files} file(s) deleted ({format_bytes(self.deleted_bytes)}), "
+            f"{self.unchanged_files} unchanged, {format_bytes(self.hashed_bytes)} hashed"
+        )
+
+
+def format_bytes(num_bytes: int) -> str:
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    value = num_bytes / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    Persisted (size, mtime, content hash) state of the files below a root.
+    Hashes are computed lazily and reused for as long as size and mtime stay the same.
+    """
+
+    def __init__(self, root: Path, manifest_path: Path):
+        self.root = root
+        self.manifest_path = manifest_path
+        self.files: Dict[str, FileState] = {}
+        self.hashed_bytes = 0
+        self._cached: Dict[str, FileState] = self._load()
+
+    def _load(self) -> Dict[str, FileState]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            print(f"[Sync] Ignoring unreadable manifest: {self.manifest_path}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return {rel: FileState(*entry) for rel, entry in data.get("files", {}).items()}
+
+    def save(self) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        data = {
+            "version": MANIFEST_VERSION,
+            "root": str(self.root),
+            "files": {rel: [s.size, s.mtime_ns, s.digest] for rel, s in sorted(self.files.items())},
+        }
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def scan(self, rel_roots: Iterable[str]) -> Dict[str, FileState]:
+        """Stats every file below the given root-relative paths. Does not hash anything."""
+        self.files = {}
+        for rel_root in rel_roots:
+            rel_root = normalize_rel_path(rel_root)
+            path = self.root / rel_root
+            if path.is_dir():
+                self._scan_dir(path, rel_root)
+            elif path.is_file():
+                self._add(rel_root, path.stat())
+        return self.files
+
+    def _scan_dir(self, path: Path, rel_dir: str) -> None:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    self._scan_dir(Path(entry.path), rel)
+                elif entry.is_file():
+                    self._add(rel, entry.stat())
+
+    def _add(self, rel: str, stat: os.stat_result) -> None:
+        state = FileState(stat.st_size, stat.st_mtime_ns)
+        cached = self._cached.get(rel)
+        if cached and cached.size == state.size and cached.mtime_ns == state.mtime_ns:
+            state.digest = cached.digest
+        self.files[rel] = state
+
+    def digest(self, rel: str) -> str:
+        state = self.files[rel]
+        if state.digest is None:
+            state.digest = hash_file(self.root / rel)
+            self.hashed_bytes += state.size
+        return state.digest
+
+    def record(self, rel: str, digest: Optional[str]) -> None:
+        stat = (self.root / rel).stat()
+        self.files[rel] = FileState(stat.st_size, stat.st_mtime_ns, digest)
+
+    def forget(self, rel: str) -> None:
+        self.files.pop(rel, None)
+
+
+def normalize_rel_path(rel_path: str) -> str:
+    return rel_path.replace("\\", "/").strip("/")
+
+
+def _is_same_content(src: Manifest, dst: Manifest, rel: str) -> bool:
+    src_state = src.files[rel]
+    dst_state = dst.files.get(rel)
+    if dst_state is None or dst_state.size != src_state.size:
+        return False
+    # copy2 preserves mtime, so an untouched copy matches without hashing either side
+    if dst_state.mtime_ns == src_state.mtime_ns:
+        return True
+    return src.digest(rel) == dst.digest(rel)
+
+
+def _remove_empty_parents(path: Path, stop_at: Path) -> None:
+    parent = path.parent
+    while parent != stop_at and stop_at in parent.parents:
+        try:
+            parent.rmdir()
+        except OSError:
+            return
+        parent = parent.parent
+
+
+def sync_trees(
+    src_root: Path,
+    dst_root: Path,
+    rel_paths: Iterable[str],
+    manifest_dir: Path,
+    dry_run: bool = False,
+) -> SyncReport:
+    """
+    Makes every rel_path below dst_root match src_root.
+    Manifests of both sides are stored in manifest_dir and reused on the next sync.
+    """
+    rel_paths = [normalize_rel_path(p) for p in rel_paths]
+    src = Manifest(src_root, manifest_dir / "src_manifest.json")
+    dst = Manifest(dst_root, manifest_dir / "dst_manifest.json")
+
+    print(f"[Sync] Scanning {src_root}")
+    src.scan(rel_paths)
+    print(f"[Sync] Scanning {dst_root}")
+    dst.scan(rel_paths)
+
+    report = SyncReport()
+    to_copy: List[str] = []
+
+    for rel in sorted(src.files):
+        if _is_same_content(src, dst, rel):
+            report.unchanged_files += 1
+            continue
+
+        print(f"Would copy: {rel}" if dry_run else f"Copying: {rel}")
+        to_copy.append(rel)
+        report.copied_files += 1
+        report.copied_bytes += src.files[rel].size
+        report.touched_paths.append(rel)
+
+    if to_copy and not dry_run:
+        stats = copy_files((src_root / rel, dst_root / rel) for rel in to_copy)
+        print(f"[Sync] Copied {stats.summary()}")
+        if stats.failed:
+            failed = "\n".join(f" - {path}: {error}" for path, error in stats.failed)
+            raise RuntimeError(f"Failed to copy {len(stats.failed)} file(s):\n{failed}")
+        for rel in to_copy:
+            dst.record(rel, src.files[rel].digest)
+
+    for rel in sorted(set(dst.files) - set(src.files)):
+        size = dst.files[rel].size
+        print(f"Would delete: {rel}" if dry_run else f"Deleting: {rel}")
+        if not dry_run:
+            target_path = dst_root / rel
+            target_path.unlink()
+            _remove_empty_parents(target_path, dst_root)
+            dst.forget(rel)
+        report.deleted_files += 1
+        report.deleted_bytes += size
+        report.touched_paths.append(rel)
+
+    report.hashed_bytes = src.hashed_bytes + dst.hashed_bytes
+
+    if not dry_run:
+        src.save()
+        dst.save()
+
+    return report
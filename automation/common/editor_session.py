@@ -0,0 +1,215 @@
+# Launches a multiplayer test session: one dedicated server plus N clients.
+#
+# Clients are only started once the server is actually ready to accept them, detected by either
+#  - a line in the server log matching READY_LOG_PATTERN (the server is launched with -ABSLOG so we know where it logs), or
+#  - the server's UDP game port showing up in the OS socket table (/proc/net/udp, netstat).
+# Client windows are tiled over the primary monitor's work area through -PosX/-PosY/-ResX/-ResY.
+from __future__ import annotations
+
+import math
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+
+from .process_runner import kill_process_tree
+
+DEFAULT_PORT = 7777
+DEFAULT_READY_TIMEOUT = 180.0
+# e.g. "LogNet: GameNetDriver IpNetDriver_0 IpNetDriver listening on port 7777"
+READY_LOG_PATTERN = r"listening on port \d+"
+# Fallback when the work area can't be queried
+DEFAULT_WORK_AREA = (0, 0, 1920, 1080)
+# Room for the window title bar, which -ResY doesn't include
+TITLE_BAR_HEIGHT = 32
+
+_POLL_INTERVAL = 0.2
+# The socket table is read less often than the log: netstat takes a while on Windows
+_PORT_POLL_INTERVAL = 1.0
+_PORT_SUFFIX_RE = re.compile(r"[:.](\d+)$")
+
+
+@dataclass
+class Tile:
+    pos_x: int
+    pos_y: int
+    res_x: int
+    res_y: int
+
+
+def get_work_area() -> Tuple[int, int, int, int]:
+    """(x, y, width, height) of the primary monitor without the taskbar."""
+    if not sys.platform.startswith("win"):
+        return DEFAULT_WORK_AREA
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        rect = wintypes.RECT()
+        SPI_GETWORKAREA = 0x0030
+        if ctypes.windll.user32.SystemParametersInfoW(SPI_GETWORKAREA, 0, ctypes.byref(rect), 0):
+            return rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top
+    except Exception:
+        pass
+    return DEFAULT_WORK_AREA
+
+
+def tile_windows(count: int, work_area: Optional[Tuple[int, int, int, int]] = None) -> List[Tile]:
+    """Splits the work area into a grid of count cells, as square as possible, filled row by row."""
+    if count <= 0:
+        return []
+    x, y, width, height = work_area or get_work_area()
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    cell_width = width // columns
+    cell_height = height // rows
+
+    tiles: List[Tile] = []
+    for index in range(count):
+        row, column = divmod(index, columns)
+        tiles.append(Tile(
+            pos_x=x + column * cell_width,
+            pos_y=y + row * cell_height,
+            res_x=cell_width,
+            res_y=max(cell_height - TITLE_BAR_HEIGHT, 1),
+        ))
+    return tiles
+
+
+def _bound_udp_ports_linux() -> Set[int]:
+    ports: Set[int] = set()
+    for table in ("/proc/net/udp", "/proc/net/udp6"):
+        try:
+            with open(table, "r", encoding="ascii") as f:
+                next(f, None)
+                for line in f:
+                    # "  sl  local_address rem_address ...": local_address is <hex ip>:<hex port>
+                    fields = line.split()
+                    if len(fields) > 1:
+                        ports.add(int(fields[1].rsplit(":", 1)[1], 16))
+        except (OSError, ValueError):
+            continue
+    return ports
+
+
+def _bound_udp_ports_netstat() -> Set[int]:
+    windows = sys.platform.startswith("win")
+    command = ["netstat", "-ano", "-p", "UDP"] if windows else ["netstat", "-an", "-p", "udp"]
+    # No console window flashing up every second while RunEditor waits
+    creation_flags = subprocess.CREATE_NO_WINDOW if windows else 0  # type: ignore[attr-defined]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, errors="replace", timeout=10,
+                                stdin=subprocess.DEVNULL, creationflags=creation_flags)
+    except (OSError, subprocess.TimeoutExpired):
+        return set()
+    ports: Set[int] = set()
+    for line in result.stdout.splitlines():
+        # Windows: "  UDP    0.0.0.0:7777    *:*    1234", macOS: "udp4  0  0  *.7777  *.*"
+        fields = line.split()
+        if len(fields) > 1 and fields[0].lower().startswith("udp"):
+            local = fields[1] if windows else fields[3] if len(fields) > 3 else ""
+            match = _PORT_SUFFIX_RE.search(local)
+            if match:
+                ports.add(int(match.group(1)))
+    return ports
+
+
+def is_udp_port_bound(port: int) -> bool:
+    """
+    True if some process bound the UDP port, read from the OS socket table. Binding the port ourselves to find out
+    would race with the server binding it (it would fail, or move to another port the clients don't know about).
+    """
+    ports = _bound_udp_ports_linux() if sys.platform.startswith("linux") else _bound_udp_ports_netstat()
+    return port in ports
+
+
+class _LogTail:
+    """Reads what was appended to a log file since the last call; the file may not exist yet."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._offset = 0
+        self._partial = ""
+
+    def read_lines(self) -> List[str]:
+        try:
+            with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                f.seek(self._offset)
+                data = f.read()
+                self._offset = f.tell()
+        except FileNotFoundError:
+            return []
+        lines = (self._partial + data).split("\n")
+        self._partial = lines.pop()
+        return lines
+
+
+def wait_for_server(
+    process: subprocess.Popen,
+    log_path: Optional[Path],
+    port: Optional[int],
+    timeout: float = DEFAULT_READY_TIMEOUT,
+    ready_pattern: str = READY_LOG_PATTERN,
+) -> str:
+    """
+    Blocks until the server is ready. Returns how readiness was detected.
+    Raises RuntimeError if the server exits or doesn't become ready in time.
+    """
+    pattern = re.compile(ready_pattern, re.IGNORECASE)
+    log_tail = _LogTail(log_path) if log_path else None
+    deadline = time.monotonic() + timeout
+    next_port_check = time.monotonic()
+
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} before it was ready")
+        if log_tail is not None:
+            for line in log_tail.read_lines():
+                if pattern.search(line):
+                    return f"log: {line.strip()}"
+        if port is not None and time.monotonic() >= next_port_check:
+            if is_udp_port_bound(port):
+                return f"UDP port {port} bound"
+            next_port_check = time.monotonic() + _PORT_POLL_INTERVAL
+        time.sleep(_POLL_INTERVAL)
+
+    raise RuntimeError(f"Server was not ready after {timeout:.0f}s")
+
+
+def launch_session(
+    server_command: List[str],
+    client_commands: List[List[str]],
+    spawn: Callable[[List[str]], subprocess.Popen],
+    log_path: Optional[Path],
+    port: Optional[int] = DEFAULT_PORT,
+    timeout: float = DEFAULT_READY_TIMEOUT,
+    ready_pattern: str = READY_LOG_PATTERN,
+    output: Callable[[str], None] = print,
+) -> List[subprocess.Popen]:
+    """
+    Starts the server, waits until it's ready, then starts all clients at once.
+    Returns the processes, server first. The caller is responsible for -ABSLOG=<log_path> in server_command.
+    """
+    start = time.perf_counter()
+    if port is not None and is_udp_port_bound(port):
+        output(f"[Session] Warning: UDP port {port} is already in use, readiness is only detected from the log")
+        port = None
+
+    server = spawn(server_command)
+    output(f"[Session] Server started (pid {server.pid}), waiting until it's ready...")
+    try:
+        reason = wait_for_server(server, log_path, port, timeout, ready_pattern)
+    except RuntimeError:
+        kill_process_tree(server)
+        raise
+    output(f"[Session] Server ready after {time.perf_counter() - start:.1f}s ({reason})")
+
+    processes = [server]
+    for index, command in enumerate(client_commands, 1):
+        client = spawn(command)
+        output(f"[Session] Client {index} started (pid {client.pid})")
+        processes.append(client)
+    return processes
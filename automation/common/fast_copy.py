@@ -0,0 +1,220 @@
+# Parallel file copy used by the packaging and CGI push scripts.
+# Per file, the cheapest available method is used:
+#   reflink (copy-on-write clone) -> hardlink (only if allowed and on the same volume) -> kernel copy -> large-buffer copy
+# File metadata (mtime, permissions) is always preserved, like shutil.copy2.
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+
+# Linux FICLONE ioctl (btrfs, xfs, ...)
+_FICLONE = 0x40049409
+
+METHOD_REFLINK = "reflink"
+METHOD_HARDLINK = "hardlink"
+METHOD_KERNEL = "kernel"
+METHOD_BUFFERED = "buffered"
+
+
+@dataclass
+class CopyStats:
+    files: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    methods: dict = field(default_factory=dict)
+    failed: List[Tuple[Path, str]] = field(default_factory=list)
+
+    def throughput_mb_s(self) -> float:
+        return (self.bytes / (1024 * 1024)) / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        methods = ", ".join(f"{name}: {count}" for name, count in sorted(self.methods.items()))
+        return (
+            f"{self.files} file(s), {self.bytes / (1024 * 1024):.1f} MB in {self.seconds:.2f}s "
+            f"({self.throughput_mb_s():.1f} MB/s) [{methods}]"
+        )
+
+
+# Devices on which a reflink attempt already failed, so we don't pay for the ioctl on every file
+_reflink_unsupported_devices: set = set()
+
+
+def _try_reflink(src_fd: int, dst_fd: int) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    device = os.fstat(dst_fd).st_dev
+    if device in _reflink_unsupported_devices:
+        return False
+    try:
+        import fcntl
+
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return True
+    except (ImportError, OSError):
+        _reflink_unsupported_devices.add(device)
+        return False
+
+
+def _copy_kernel(src_fd: int, dst_fd: int, size: int) -> bool:
+    # copy_file_range/sendfile keep the data in the kernel; not available on Windows
+    for copy_func in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+        if copy_func is None or sys.platform.startswith("win"):
+            continue
+        try:
+            offset = 0
+            while offset < size:
+                if copy_func is os.sendfile:
+                    copied = os.sendfile(dst_fd, src_fd, offset, min(size - offset, 1 << 30))
+                else:
+                    copied = copy_func(src_fd, dst_fd, min(size - offset, 1 << 30), offset, offset)
+                if copied == 0:
+                    break
+                offset += copied
+            if offset == size:
+                return True
+        except OSError:
+            pass
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+        os.ftruncate(dst_fd, 0)
+    return False
+
+
+# One copy buffer per worker thread, reused for every file it copies instead of allocating 8 MB per file
+_thread_buffers = threading.local()
+
+
+def _copy_buffered(src_file, dst_file) -> None:
+    view = getattr(_thread_buffers, "view", None)
+    if view is None:
+        view = _thread_buffers.view = memoryview(bytearray(COPY_BUFFER_SIZE))
+    while True:
+        read = src_file.readinto(view)
+        if not read:
+            break
+        dst_file.write(view[:read])
+
+
+def _same_volume(src: Path, dst: Path) -> bool:
+    try:
+        return os.stat(src).st_dev == os.stat(dst.parent).st_dev
+    except OSError:
+        return False
+
+
+def copy_file(src: Path, dst: Path, allow_hardlink: bool = False) -> Tuple[str, int]:
+    """
+    Copies src to dst (overwriting it) and preserves metadata. The destination folder must exist.
+    Returns the method that was used and the number of bytes copied.
+    Hardlinks share the data with the source, so only allow them when neither side is edited in place later.
+    """
+    if os.path.islink(dst):
+        os.unlink(dst)
+    elif os.path.exists(dst):
+        if os.path.samefile(src, dst):
+            # dst is already a hardlink to src (an earlier allow_hardlink copy): writing to it would truncate src
+            if allow_hardlink:
+                return METHOD_HARDLINK, os.stat(src).st_size
+        # Replace rather than overwrite, so other links to the old dst file are never written through
+        os.unlink(dst)
+
+    with open(src, "rb") as src_file:
+        size = os.fstat(src_file.fileno()).st_size
+        with open(dst, "wb") as dst_file:
+            if _try_reflink(src_file.fileno(), dst_file.fileno()):
+                method = METHOD_REFLINK
+            elif allow_hardlink and _same_volume(Path(src), Path(dst)):
+                method = METHOD_HARDLINK
+            elif _copy_kernel(src_file.fileno(), dst_file.fileno(), size):
+                method = METHOD_KERNEL
+            else:
+                _copy_buffered(src_file, dst_file)
+                method = METHOD_BUFFERED
+
+    if method == METHOD_HARDLINK:
+        os.unlink(dst)
+        try:
+            os.link(src, dst)
+            return method, size
+        except OSError:
+            shutil.copyfile(src, dst)
+            method = METHOD_BUFFERED
+
+    shutil.copystat(src, dst)
+    return method, size
+
+
+def copy_files(
+    pairs: Iterable[Tuple[Path, Path]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    allow_hardlink: bool = False,
+) -> CopyStats:
+    """
+    Copies (src, dst) pairs with a thread pool. Failures don't stop the other copies;
+    they are collected in CopyStats.failed.
+    """
+    pairs = list(pairs)
+    stats = CopyStats()
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    # Create all destination folders up front so the workers don't race on them
+    for parent in sorted({Path(dst).parent for _, dst in pairs}):
+        parent.mkdir(parents=True, exist_ok=True)
+
+    def copy_one(pair: Tuple[Path, Path]) -> None:
+        src, dst = pair
+        try:
+            method, size = copy_file(src, dst, allow_hardlink=allow_hardlink)
+        except OSError as e:
+            with lock:
+                stats.failed.append((Path(src), str(e)))
+            return
+        with lock:
+            stats.files += 1
+            stats.bytes += size
+            stats.methods[method] = stats.methods.get(method, 0) + 1
+
+    if pairs:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pairs)))) as pool:
+            list(pool.map(copy_one, pairs))
+
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def collect_tree_pairs(src_dir: Path, dst_dir: Path) -> List[Tuple[Path, Path]]:
+    """Lists (src, dst) pairs for every file below src_dir, mirrored below dst_dir."""
+    pairs: List[Tuple[Path, Path]] = []
+    stack = [(Path(src_dir), Path(dst_dir))]
+    while stack:
+        src, dst = stack.pop()
+        dst.mkdir(parents=True, exist_ok=True)
+        with os.scandir(src) as entries:
+            for entry in entries:
+                # Symlinked folders aren't followed, a link loop would never end. They are listed like files,
+                # so copying them fails (and is reported) instead of silently missing content
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((Path(entry.path), dst / entry.name))
+                else:
+                    pairs.append((Path(entry.path), dst / entry.name))
+    return pairs
+
+
+def copy_tree(
+    src_dir: Path,
+    dst_dir: Path,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    allow_hardlink: bool = False,
+) -> CopyStats:
+    """Copies the contents of src_dir into dst_dir (merging with what is already there)."""
+    return copy_files(collect_tree_pairs(src_dir, dst_dir), max_workers=max_workers, allow_hardlink=allow_hardlink)
@@ -0,0 +1,319 @@
+# Setup and sync of the dev and CGI checkouts (git + LFS), tuned for big binary repos.
+#
+#  - Hooks: core.hooksPath = .githooks/<dev|cgi>, "git lfs install --local" in the repo and its submodule.
+#  - Transfers: lfs.concurrenttransfers, and optionally lfs.storage pointing every clone on the machine at one
+#    shared LFS object folder, so objects already downloaded for another clone aren't downloaded again.
+#  - Checkout: files are checked out with LFS smudging disabled, then "git lfs pull" downloads the objects in
+#    batches with parallel transfers. That is much faster than the smudge filter, which fetches one file at a time.
+#  - Sparse checkout (cone mode) of the folders in [FilesToCopy] of build_and_push_to_cgi.config, read from the
+#    repo itself. lfs.fetchinclude is set to the same folders, so LFS only downloads what is checked out.
+#    A clone is also partial (--filter=blob:none): blobs outside the sparse folders are never downloaded.
+#  - Status: core.untrackedCache, core.fsmonitor (built-in daemon, Windows/macOS, git 2.37+), checkout.workers.
+#  - The Plugins/ContentPlugins submodule is updated and LFS-pulled while the main repo pulls its own LFS objects.
+from __future__ import annotations
+
+import configparser
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .automation_common import BUILD_CONFIG_REL_PATH
+from .process_runner import start_process
+
+GIT_SETUP_SECTION = "GitSetup"
+MODES = ("dev", "cgi")
+HOOKS_DIR = ".githooks"
+SUBMODULE_PATH = "Plugins/ContentPlugins"
+# The built-in fsmonitor daemon exists since git 2.37, on Windows and macOS only
+FSMONITOR_MIN_GIT = (2, 37)
+
+_NO_SMUDGE_ENV = {"GIT_LFS_SKIP_SMUDGE": "1"}
+
+
+@dataclass
+class GitSetupSettings:
+    # Stored in [GitSetup] of project.config
+    lfs_concurrent_transfers: int = 16
+    # Shared LFS object folder for all clones on this machine (lfs.storage); empty = each clone keeps its own
+    lfs_storage: str = ""
+    fsmonitor: bool = True
+    # 0 = one per CPU core
+    checkout_workers: int = 0
+    # Parallel fetches and submodule jobs
+    jobs: int = 4
+    # Modes that check out only the [FilesToCopy] folders
+    sparse_modes: List[str] = field(default_factory=lambda: ["cgi"])
+
+
+@dataclass
+class TimedStep:
+    name: str
+    seconds: float
+    ok: bool = True
+
+
+class StepTimer:
+    """Times named steps (possibly from several threads) and prints a summary like the build step summary."""
+
+    def __init__(self):
+        self.steps: List[TimedStep] = []
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            with self._lock:
+                self.steps.append(TimedStep(name, time.perf_counter() - start, ok))
+
+    def format(self) -> str:
+        wall_clock = time.perf_counter() - self._start
+        lines = ["", "=== Git setup timings ==="]
+        for step in self.steps:
+            lines.append(f"  {step.name:<36} {'ok' if step.ok else 'failed':<7} {step.seconds:8.1f}s")
+        lines.append(f"  Wall-clock: {wall_clock:.1f}s")
+        return "\n".join(lines)
+
+
+def load_git_setup_settings(project_config: Optional[configparser.ConfigParser]) -> GitSetupSettings:
+    settings = GitSetupSettings()
+    if project_config is None or not project_config.has_section(GIT_SETUP_SECTION):
+        return settings
+    section = project_config[GIT_SETUP_SECTION]
+    settings.lfs_concurrent_transfers = section.getint("LfsConcurrentTransfers", settings.lfs_concurrent_transfers)
+    settings.lfs_storage = section.get("LfsStorage", settings.lfs_storage).strip()
+    settings.fsmonitor = section.getboolean("Fsmonitor", settings.fsmonitor)
+    settings.checkout_workers = section.getint("CheckoutWorkers", settings.checkout_workers)
+    settings.jobs = section.getint("Jobs", settings.jobs)
+    settings.sparse_modes = [m.strip() for m in section.get("SparseModes", ",".join(settings.sparse_modes)).split(",") if m.strip()]
+    return settings
+
+
+# ---------------------------
+# git
+# ---------------------------
+
+def _environment(extra: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    return {**os.environ, **extra} if extra else None
+
+
+def git(args: List[str], cwd: Path, env: Optional[Dict[str, str]] = None, check: bool = True) -> subprocess.CompletedProcess:
+    """Runs a quick git command and captures its output; raises RuntimeError with git's message on failure."""
+    result = subprocess.run(["git"] + args, cwd=str(cwd), capture_output=True, text=True, encoding="utf-8",
+                            errors="replace", stdin=subprocess.DEVNULL, env=_environment(env))
+    if check and result.returncode != 0:
+        message = (result.stderr.strip() or result.stdout.strip()).splitlines()
+        raise RuntimeError(f"git {' '.join(args)} failed in {cwd}: {message[-1] if message else f'exit code {result.returncode}'}")
+    return result
+
+
+def git_streamed(args: List[str], cwd: Path, label: str, output: Callable[[str], None] = print,
+                 env: Optional[Dict[str, str]] = None) -> None:
+    """Runs a long git command (clone, fetch, lfs pull) with its output prefixed by label."""
+    process = start_process(["git"] + args, cwd=cwd, env=_environment(env))
+    for line in process.stdout:
+        # Progress meters redraw with \r; only the last state of each line is worth printing
+        line = line.rstrip().rsplit("\r", 1)[-1]
+        if line:
+            output(f"[{label}] {line}")
+    returncode = process.wait()
+    if returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed in {cwd} with exit code {returncode}")
+
+
+def git_version() -> Tuple[int, ...]:
+    result = subprocess.run(["git", "--version"], capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    match = re.search(r"(\d+)\.(\d+)(?:\.(\d+))?", result.stdout)
+    return tuple(int(part) for part in match.groups() if part is not None) if match else (0,)
+
+
+def lfs_available() -> bool:
+    try:
+        return subprocess.run(["git", "lfs", "version"], capture_output=True, stdin=subprocess.DEVNULL).returncode == 0
+    except OSError:
+        return False
+
+
+def read_head_file(repo: Path, rel_path: str) -> Optional[str]:
+    """A file from the working tree, or from HEAD if it isn't checked out (fresh or sparse clone)."""
+    path = repo / rel_path
+    if path.is_file():
+        return path.read_text(encoding="utf-8", errors="replace")
+    result = git(["show", f"HEAD:{rel_path}"], repo, check=False)
+    return result.stdout if result.returncode == 0 else None
+
+
+def uses_lfs(repo: Path) -> bool:
+    attributes = read_head_file(repo, ".gitattributes")
+    return attributes is not None and "filter=lfs" in attributes
+
+
+def has_submodule(repo: Path, path: str = SUBMODULE_PATH) -> bool:
+    gitmodules = read_head_file(repo, ".gitmodules")
+    return gitmodules is not None and re.search(rf"^\s*path\s*=\s*{re.escape(path)}\s*$", gitmodules, re.MULTILINE) is not None
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+
+def read_sparse_folders(repo: Path) -> List[str]:
+    """
+    The folders of [FilesToCopy] in the repo's own build_and_push_to_cgi.config. Cone mode always includes the
+    files at the root, so root files (the .uproject) need no entry; other files bring in their folder.
+    """
+    text = read_head_file(repo, BUILD_CONFIG_REL_PATH.as_posix())
+    if text is None:
+        raise RuntimeError(f"{BUILD_CONFIG_REL_PATH.as_posix()} not found in {repo}; can't tell which folders to check out")
+    config = configparser.ConfigParser()
+    config.optionxform = str
+    config.read_string(text)
+    folders: List[str] = []
+    for line in config.get("FilesToCopy", "paths", fallback="").splitlines():
+        rel = line.strip().replace("\\", "/").strip("/")
+        if not rel:
+            continue
+        # "Config/DefaultGame.ini" -> "Config"; extension-less names are folders
+        if "." in rel.rsplit("/", 1)[-1] and not rel.rsplit("/", 1)[-1].startswith("."):
+            rel = rel.rsplit("/", 1)[0] if "/" in rel else ""
+        if rel and rel not in folders:
+            folders.append(rel)
+    return folders
+
+
+def with_submodule_folder(folders: List[str], submodule_path: str) -> List[str]:
+    """
+    Adds the submodule to the sparse folders unless cone mode already includes it: a submodule is an entry of its
+    parent folder, and cone mode includes the direct entries of every parent of an included folder.
+    """
+    parent = submodule_path.rsplit("/", 1)[0] if "/" in submodule_path else ""
+    covered = not parent or any(folder == submodule_path or folder == parent or folder.startswith(parent + "/")
+                                or parent.startswith(folder + "/") for folder in folders)
+    return folders if covered else folders + [submodule_path]
+
+
+def performance_config(settings: GitSetupSettings, with_lfs: bool) -> List[Tuple[str, str]]:
+    config = [
+        ("core.untrackedCache", "true"),
+        ("checkout.workers", str(settings.checkout_workers or os.cpu_count() or 1)),
+        ("fetch.parallel", str(settings.jobs)),
+        ("submodule.fetchJobs", str(settings.jobs)),
+    ]
+    if settings.fsmonitor and sys.platform in ("win32", "darwin") and git_version() >= FSMONITOR_MIN_GIT:
+        config.append(("core.fsmonitor", "true"))
+    if with_lfs:
+        config.append(("lfs.concurrenttransfers", str(settings.lfs_concurrent_transfers)))
+        if settings.lfs_storage:
+            config.append(("lfs.storage", str(Path(settings.lfs_storage).resolve())))
+    return config
+
+
+def configure_repo(repo: Path, settings: GitSetupSettings, with_lfs: bool, hooks_mode: Optional[str] = None,
+                   output: Callable[[str], None] = print) -> None:
+    if with_lfs:
+        git(["lfs", "install", "--local"], repo)
+    if hooks_mode is not None:
+        hooks_path = f"{HOOKS_DIR}/{hooks_mode}"
+        git(["config", "core.hooksPath", hooks_path], repo)
+        output(f"[{repo.name}] core.hooksPath = {hooks_path}")
+    for key, value in performance_config(settings, with_lfs):
+        git(["config", key, value], repo)
+        output(f"[{repo.name}] {key} = {value}")
+
+
+def apply_sparse_checkout(repo: Path, folders: List[str], with_lfs: bool, output: Callable[[str], None] = print) -> None:
+    git(["sparse-checkout", "init", "--cone"], repo)
+    # --skip-checks: a submodule in the list is a gitlink, not a folder, once it is checked out
+    git(["sparse-checkout", "set", "--skip-checks"] + folders, repo, env=_NO_SMUDGE_ENV)
+    if with_lfs:
+        git(["config", "lfs.fetchinclude", ",".join(folders)], repo)
+    output(f"[{repo.name}] Sparse checkout: {', '.join(folders)}")
+
+
+def disable_sparse_checkout(repo: Path, output: Callable[[str], None] = print) -> None:
+    if git(["config", "--bool", "core.sparseCheckout"], repo, check=False).stdout.strip() == "true":
+        git(["sparse-checkout", "disable"], repo, env=_NO_SMUDGE_ENV)
+        git(["config", "--unset", "lfs.fetchinclude"], repo, check=False)
+        output(f"[{repo.name}] Sparse checkout disabled")
+
+
+# ---------------------------
+# Clone / sync
+# ---------------------------
+
+def clone(url: str, dest: Path, branch: Optional[str], jobs: int, output: Callable[[str], None] = print) -> None:
+    """A partial clone without checkout; the caller configures sparse checkout and LFS before checking out."""
+    if dest.exists() and any(dest.iterdir()):
+        raise RuntimeError(f"{dest} exists and is not empty")
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    args = ["clone", "--no-checkout", "--filter=blob:none", f"--jobs={jobs}"]
+    if branch:
+        args += ["--branch", branch]
+    git_streamed(args + [url, str(dest)], dest.parent, dest.name, output, env=_NO_SMUDGE_ENV)
+
+
+def checkout(repo: Path, output: Callable[[str], None] = print) -> None:
+    """Populates the working tree of a --no-checkout clone, without LFS downloads."""
+    branch = git(["symbolic-ref", "--short", "HEAD"], repo).stdout.strip()
+    git_streamed(["checkout", branch], repo, repo.name, output, env=_NO_SMUDGE_ENV)
+
+
+def fast_forward(repo: Path, output: Callable[[str], None] = print) -> None:
+    git_streamed(["fetch", "--prune"], repo, repo.name, output)
+    if git(["rev-parse", "--abbrev-ref", "@{u}"], repo, check=False).returncode != 0:
+        output(f"[{repo.name}] No upstream branch, skipping the merge")
+        return
+    git_streamed(["merge", "--ff-only", "@{u}"], repo, repo.name, output, env=_NO_SMUDGE_ENV)
+
+
+def lfs_pull(repo: Path, output: Callable[[str], None] = print) -> None:
+    git_streamed(["lfs", "pull"], repo, repo.name, output)
+
+
+def update_submodule(repo: Path, settings: GitSetupSettings, with_lfs: bool, output: Callable[[str], None] = print,
+                     timer: Optional[StepTimer] = None) -> None:
+    """Checks out the submodule (without LFS downloads), configures it like its parent and pulls its LFS objects."""
+    timer = timer or StepTimer()
+    submodule = repo / SUBMODULE_PATH
+    with timer.step(f"{SUBMODULE_PATH}: update"):
+        git_streamed(["submodule", "update", "--init", f"--jobs={settings.jobs}", "--", SUBMODULE_PATH],
+                     repo, submodule.name, output, env=_NO_SMUDGE_ENV)
+    submodule_lfs = with_lfs and uses_lfs(submodule)
+    configure_repo(submodule, settings, submodule_lfs, output=output)
+    if submodule_lfs:
+        with timer.step(f"{SUBMODULE_PATH}: lfs pull"):
+            lfs_pull(submodule, output)
+
+
+def pull_in_parallel(repo: Path, settings: GitSetupSettings, with_lfs: bool, timer: StepTimer,
+                     output: Callable[[str], None] = print) -> None:
+    """The main repo's LFS pull and the submodule's update + LFS pull, at the same time."""
+    tasks = []
+    if with_lfs:
+        def main_lfs_pull():
+            with timer.step(f"{repo.name}: lfs pull"):
+                lfs_pull(repo, output)
+        tasks.append(main_lfs_pull)
+    if has_submodule(repo):
+        tasks.append(lambda: update_submodule(repo, settings, with_lfs, output, timer))
+    if not tasks:
+        return
+    with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+        futures = [pool.submit(task) for task in tasks]
+        errors = [future.exception() for future in futures]
+    errors = [error for error in errors if error is not None]
+    if errors:
+        raise errors[0]
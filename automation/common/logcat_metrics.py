@@ -0,0 +1,298 @@
+# Incremental parsing of Quest logcat output into a performance time series, per-session summaries and hitch markers.
+#
+# The VR runtime logs one line per second from the app process, e.g.
+#   10-17 12:34:56.789  4321  4400 I VrApi   : FPS=72/72,Prd=45ms,Tear=0,Early=0,Stale=0,Stale2/5/10/max=0/0/0/0,
+#       VSnc=1,Lat=-1,Fov=0D,CPU4/GPU=4/4,1651/490MHz,OC=FF,TA=0/0/0,SP=N/N/N,Mem=1804MHz,Free=2144MB,PLS=0,
+#       Temp=33.0C/0.0C,TW=2.93ms,App=4.79ms,GD=0.00ms,CPU&GPU=10.20ms,LCnt=1(DR72,LM2),GPU%=0.71,CPU%=0.43(W0.51),...
+# Every such line becomes one MetricSample. Lines are fed one at a time (from a live "adb logcat -v threadtime"
+# or a recorded capture); nothing is kept per line except the sample and a small ring buffer of recent UE lines,
+# which is attached to each hitch marker as context. A new session starts when the app's pid changes or the
+# metrics stop for SESSION_GAP_SECONDS (the app was closed or the headset went to sleep).
+from __future__ import annotations
+
+import math
+import re
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional
+
+METRICS_TAGS = ("VrApi",)
+UE_TAG = "UE"
+SESSION_GAP_SECONDS = 10.0
+# A second is a hitch when it rendered fewer than this share of the target frame rate, or showed stale frames
+HITCH_FPS_RATIO = 0.9
+HITCH_CONTEXT_LINES = 20
+PERCENTILES = (50, 90, 99)
+# UE's own hitch reports (e.g. "LogStreaming: Warning: Hitch detected" or stat unit hitch lines)
+_UE_HITCH_RE = re.compile(r"\bhitch", re.IGNORECASE)
+
+# "10-17 12:34:56.789  4321  4400 I VrApi   : message"
+LOGCAT_LINE_RE = re.compile(
+    r"^(?P<date>\d\d-\d\d) (?P<time>\d\d:\d\d:\d\d\.\d{3})\s+(?P<pid>\d+)\s+(?P<tid>\d+)\s+"
+    r"(?P<level>[VDIWEFA])\s+(?P<tag>.*?)\s*: (?P<message>.*)$"
+)
+_FPS_RE = re.compile(r"\bFPS=(\d+)/(\d+)")
+_STALE_RE = re.compile(r"\bStale=(\d+)")
+_LEVELS_RE = re.compile(r"\bCPU\d*/GPU=(\d+)/(\d+)")
+_MS_FIELDS = {"app_gpu_ms": "App", "timewarp_ms": "TW", "frame_ms": "CPU&GPU"}
+_PERCENT_FIELDS = {"gpu_util": "GPU%", "cpu_util": "CPU%"}
+_TEMP_RE = re.compile(r"\bTemp=([\d.]+)C")
+_FREE_RE = re.compile(r"\bFree=(\d+)MB")
+
+
+@dataclass
+class LogcatLine:
+    # Seconds since the epoch; logcat has no year, the current one is assumed
+    time: float
+    pid: int
+    tid: int
+    level: str
+    tag: str
+    message: str
+    raw: str
+
+
+@dataclass
+class MetricSample:
+    time: float
+    pid: int
+    fps: float
+    target_fps: float
+    stale: int = 0
+    cpu_level: Optional[int] = None
+    gpu_level: Optional[int] = None
+    app_gpu_ms: Optional[float] = None
+    timewarp_ms: Optional[float] = None
+    frame_ms: Optional[float] = None
+    gpu_util: Optional[float] = None
+    cpu_util: Optional[float] = None
+    temp_c: Optional[float] = None
+    free_mb: Optional[int] = None
+
+
+@dataclass
+class HitchMarker:
+    time: float
+    reason: str
+    # The UE lines logged just before the hitch
+    context: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SessionSummary:
+    index: int
+    pid: int
+    start: float
+    end: float
+    samples: int
+    # metric -> {"min": .., "p50": .., "p90": .., "p99": .., "max": ..}
+    metrics: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    stale_frames: int = 0
+    hitches: List[HitchMarker] = field(default_factory=list)
+
+    def format(self) -> str:
+        start = datetime.fromtimestamp(self.start).strftime("%m-%d %H:%M:%S")
+        lines = [f"Session {self.index} (pid {self.pid}), {start}, {self.end - self.start:.0f}s, {self.samples} sample(s), "
+                 f"{self.stale_frames} stale frame(s), {len(self.hitches)} hitch(es)"]
+        lines.append(f"  {'metric':<12}" + "".join(f"{name:>9}" for name in ("min", "p50", "p90", "p99", "max")))
+        for metric, values in self.metrics.items():
+            lines.append(f"  {metric:<12}" + "".join(f"{values[name]:>9.2f}" for name in ("min", "p50", "p90", "p99", "max")))
+        for hitch in self.hitches[:10]:
+            lines.append(f"  hitch at {datetime.fromtimestamp(hitch.time).strftime('%H:%M:%S.%f')[:-3]}: {hitch.reason}")
+        if len(self.hitches) > 10:
+            lines.append(f"  ... and {len(self.hitches) - 10} more")
+        return "\n".join(lines)
+
+
+def parse_logcat_line(line: str, year: Optional[int] = None) -> Optional[LogcatLine]:
+    match = LOGCAT_LINE_RE.match(line.rstrip("\r\n"))
+    if match is None:
+        return None
+    try:
+        moment = datetime.strptime(f"{year or datetime.now().year}-{match['date']} {match['time']}", "%Y-%m-%d %H:%M:%S.%f")
+    except ValueError:
+        return None
+    return LogcatLine(
+        time=moment.timestamp(),
+        pid=int(match["pid"]),
+        tid=int(match["tid"]),
+        level=match["level"],
+        tag=match["tag"],
+        message=match["message"],
+        raw=line.rstrip("\r\n"),
+    )
+
+
+def _number_field(message: str, key: str, suffix: str = "") -> Optional[float]:
+    match = re.search(r"(?:^|,)" + re.escape(key) + r"=([\d.]+)" + re.escape(suffix), message)
+    return float(match.group(1)) if match else None
+
+
+def parse_metrics(line: LogcatLine) -> Optional[MetricSample]:
+    """A sample from a VrApi metrics line, None for any other line."""
+    if line.tag not in METRICS_TAGS:
+        return None
+    fps = _FPS_RE.search(line.message)
+    if fps is None:
+        return None
+    sample = MetricSample(time=line.time, pid=line.pid, fps=float(fps.group(1)), target_fps=float(fps.group(2)))
+    stale = _STALE_RE.search(line.message)
+    if stale:
+        sample.stale = int(stale.group(1))
+    levels = _LEVELS_RE.search(line.message)
+    if levels:
+        sample.cpu_level, sample.gpu_level = int(levels.group(1)), int(levels.group(2))
+    for name, key in _MS_FIELDS.items():
+        setattr(sample, name, _number_field(line.message, key, "ms"))
+    for name, key in _PERCENT_FIELDS.items():
+        setattr(sample, name, _number_field(line.message, key))
+    temp = _TEMP_RE.search(line.message)
+    if temp:
+        sample.temp_c = float(temp.group(1))
+    free = _FREE_RE.search(line.message)
+    if free:
+        sample.free_mb = int(free.group(1))
+    return sample
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(index: int, samples: List[MetricSample], hitches: List[HitchMarker]) -> SessionSummary:
+    summary = SessionSummary(
+        index=index,
+        pid=samples[0].pid,
+        start=samples[0].time,
+        end=samples[-1].time,
+        samples=len(samples),
+        stale_frames=sum(sample.stale for sample in samples),
+        hitches=hitches,
+    )
+    for metric in ("fps", "frame_ms", "app_gpu_ms", "timewarp_ms", "cpu_level", "gpu_level", "gpu_util", "cpu_util", "temp_c"):
+        values = sorted(getattr(sample, metric) for sample in samples if getattr(sample, metric) is not None)
+        if not values:
+            continue
+        summary.metrics[metric] = {"min": values[0], "max": values[-1]}
+        summary.metrics[metric].update({f"p{p}": percentile(values, p) for p in PERCENTILES})
+    return summary
+
+
+class LogcatAnalyzer:
+    """
+    analyzer = LogcatAnalyzer()
+    for line in logcat_output:
+        sample = analyzer.feed(line)   # the MetricSample the line produced, if any
+    sessions = analyzer.finish()       # summaries of every session, including the one still open
+    """
+
+    def __init__(self, hitch_fps_ratio: float = HITCH_FPS_RATIO, context_lines: int = HITCH_CONTEXT_LINES,
+                 year: Optional[int] = None, on_hitch: Optional[Callable[[HitchMarker], None]] = None):
+        self.hitch_fps_ratio = hitch_fps_ratio
+        self.year = year
+        self.on_hitch = on_hitch
+        self.recent_ue_lines: Deque[str] = deque(maxlen=context_lines)
+        self.sessions: List[SessionSummary] = []
+        self._samples: List[MetricSample] = []
+        self._hitches: List[HitchMarker] = []
+
+    def _close_session(self) -> None:
+        if self._samples:
+            self.sessions.append(summarize(len(self.sessions) + 1, self._samples, self._hitches))
+        self._samples = []
+        self._hitches = []
+
+    def _add_hitch(self, time: float, reason: str) -> None:
+        hitch = HitchMarker(time=time, reason=reason, context=list(self.recent_ue_lines))
+        self._hitches.append(hitch)
+        if self.on_hitch is not None:
+            self.on_hitch(hitch)
+
+    def feed(self, raw_line: str) -> Optional[MetricSample]:
+        line = parse_logcat_line(raw_line, self.year)
+        if line is None:
+            return None
+
+        if line.tag == UE_TAG:
+            if _UE_HITCH_RE.search(line.message) and self._samples:
+                self._add_hitch(line.time, f"UE: {line.message.strip()}")
+            self.recent_ue_lines.append(line.raw)
+            return None
+
+        sample = parse_metrics(line)
+        if sample is None:
+            return None
+        if self._samples and (sample.pid != self._samples[-1].pid or sample.time - self._samples[-1].time > SESSION_GAP_SECONDS):
+            self._close_session()
+        self._samples.append(sample)
+
+        reasons = []
+        if sample.target_fps > 0 and sample.fps < sample.target_fps * self.hitch_fps_ratio:
+            reasons.append(f"{sample.fps:.0f}/{sample.target_fps:.0f} FPS")
+        if sample.stale:
+            reasons.append(f"{sample.stale} stale frame(s)")
+        if reasons:
+            self._add_hitch(sample.time, ", ".join(reasons))
+        return sample
+
+    def current_samples(self) -> List[MetricSample]:
+        return list(self._samples)
+
+    def finish(self) -> List[SessionSummary]:
+        self._close_session()
+        return self.sessions
+
+
+def session_to_dict(summary: SessionSummary) -> dict:
+    data = asdict(summary)
+    # NaN isn't valid JSON
+    for values in data["metrics"].values():
+        for key, value in values.items():
+            if isinstance(value, float) and math.isnan(value):
+                values[key] = None
+    return data
+
+
+class RotatingLogFile:
+    """Appends lines to path; when it would grow beyond max_bytes it becomes path.1 (path.1 -> path.2, ...)."""
+
+    def __init__(self, path: Path, max_bytes: int, backups: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8", newline="\n")
+        self._size = self.path.stat().st_size
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._file = open(self.path, "w", encoding="utf-8", newline="\n")
+        self._size = 0
+
+    def write_line(self, line: str) -> None:
+        data = line.rstrip("\r\n") + "\n"
+        size = len(data.encode("utf-8"))
+        if self._size and self._size + size > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._size += size
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,65 @@
+# Helpers for running long build processes whose output is consumed line by line.
+from __future__ import annotations
+
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+def start_process(command: Union[List[str], str], cwd: Optional[Path] = None, shell: bool = False,
+                  env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """
+    Starts a process with stdout+stderr merged into one text pipe.
+    The process gets its own process group, so kill_process_tree() can take down everything it spawned.
+    env replaces the environment (None = inherit this process's).
+    """
+    kwargs = {}
+    if sys.platform.startswith("win"):
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP  # type: ignore[attr-defined]
+    else:
+        kwargs["start_new_session"] = True
+
+    return subprocess.Popen(
+        command,
+        cwd=str(cwd) if cwd else None,
+        shell=shell,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.DEVNULL,
+        env=env,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1,
+        **kwargs,
+    )
+
+
+def kill_process_tree(process: subprocess.Popen) -> None:
+    """Kills the process and all of its children (UAT/UBT spawn plenty of those)."""
+    if process.poll() is not None:
+        return
+
+    if sys.platform.startswith("win"):
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    else:
+        try:
+            process_group = os.getpgid(process.pid)
+            if process_group != os.getpgid(0):
+                os.killpg(process_group, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
@@ -0,0 +1,312 @@
+# Keeps track of launched processes (editor instances, servers, clients) and samples their resource usage.
+#
+# Every interval the supervisor samples CPU, RSS and handle count (open file descriptors on Linux)
+# of each running process and appends them to a CSV, one file per supervisor session.
+# psutil is used when installed; otherwise the numbers come from the Win32 API (ctypes) or /proc.
+from __future__ import annotations
+
+import csv
+import itertools
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .process_runner import kill_process_tree
+
+try:
+    import psutil  # type: ignore
+except ImportError:
+    psutil = None
+
+DEFAULT_SAMPLE_INTERVAL = 2.0
+
+STATUS_RUNNING = "running"
+STATUS_EXITED = "exited"
+STATUS_CRASHED = "crashed"
+STATUS_KILLED = "killed"
+
+CSV_COLUMNS = ["timestamp", "elapsed_s", "id", "name", "pid", "status", "cpu_percent", "rss_mb", "handles"]
+
+
+@dataclass
+class ProcessSample:
+    # Total CPU time (user + kernel) in seconds, used to derive cpu_percent between two samples
+    cpu_seconds: float
+    rss_bytes: int
+    handles: int
+
+
+@dataclass
+class SupervisedProcess:
+    id: int
+    name: str
+    command: List[str]
+    process: subprocess.Popen
+    # Starts the same command again, for restart()
+    respawn: Optional[Callable[[], subprocess.Popen]] = None
+    started: float = field(default_factory=time.time)
+    status: str = STATUS_RUNNING
+    exit_code: Optional[int] = None
+    restarts: int = 0
+    cpu_percent: float = 0.0
+    rss_bytes: int = 0
+    peak_rss_bytes: int = 0
+    handles: int = 0
+    killed_by_user: bool = False
+    # Set (under the supervisor lock) by whichever thread handles the exit first, so callbacks only fire once
+    _exit_handled: bool = False
+    _last_cpu: Optional[Tuple[float, float]] = None
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def uptime(self) -> float:
+        return time.time() - self.started
+
+
+# ---------------------------
+# Sampling backends
+# ---------------------------
+
+def _sample_psutil(pid: int) -> Optional[ProcessSample]:
+    try:
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            times = proc.cpu_times()
+            rss = proc.memory_info().rss
+            handles = proc.num_handles() if sys.platform.startswith("win") else proc.num_fds()
+        return ProcessSample(times.user + times.system, rss, handles)
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+def _sample_windows(pid: int) -> Optional[ProcessSample]:
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return None
+    try:
+        creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        if not kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exit_time), ctypes.byref(kernel), ctypes.byref(user)):
+            return None
+
+        def filetime_seconds(ft) -> float:
+            # 100 ns units
+            return ((ft.dwHighDateTime << 32) | ft.dwLowDateTime) / 1e7
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb)
+
+        handle_count = wintypes.DWORD()
+        kernel32.GetProcessHandleCount(handle, ctypes.byref(handle_count))
+
+        return ProcessSample(filetime_seconds(kernel) + filetime_seconds(user), counters.WorkingSetSize, handle_count.value)
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _sample_proc(pid: int) -> Optional[ProcessSample]:
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            # The command name may contain spaces; the fields after it are fixed
+            fields = f.read().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / ticks
+        rss_bytes = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+        handles = len(os.listdir(f"/proc/{pid}/fd"))
+        return ProcessSample(cpu_seconds, rss_bytes, handles)
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def sample_process(pid: int) -> Optional[ProcessSample]:
+    """Current CPU time, RSS and handle count of a process, or None if it's gone or inaccessible."""
+    if psutil is not None:
+        return _sample_psutil(pid)
+    if sys.platform.startswith("win"):
+        return _sample_windows(pid)
+    return _sample_proc(pid)
+
+
+# ---------------------------
+# Supervisor
+# ---------------------------
+
+class ProcessSupervisor:
+    def __init__(self, csv_path: Optional[Path] = None, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.csv_path = csv_path
+        self.interval = interval
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._processes: Dict[int, SupervisedProcess] = {}
+        # Called once with the SupervisedProcess after its process exited, from the sampling thread or the thread
+        # calling kill()/restart(); UIs have to marshal to their own thread
+        self._exit_callbacks: List[Callable[[SupervisedProcess], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, name: str, command: List[str], process: subprocess.Popen,
+            respawn: Optional[Callable[[], subprocess.Popen]] = None) -> SupervisedProcess:
+        entry = SupervisedProcess(id=next(self._ids), name=name, command=command, process=process, respawn=respawn)
+        with self._lock:
+            self._processes[entry.id] = entry
+        self.start()
+        return entry
+
+    def add_exit_callback(self, callback: Callable[[SupervisedProcess], None]) -> None:
+        self._exit_callbacks.append(callback)
+
+    def processes(self) -> List[SupervisedProcess]:
+        with self._lock:
+            return list(self._processes.values())
+
+    def get(self, process_id: int) -> SupervisedProcess:
+        with self._lock:
+            if process_id not in self._processes:
+                raise RuntimeError(f"Unknown process id: {process_id}")
+            return self._processes[process_id]
+
+    def running_count(self) -> int:
+        return sum(1 for entry in self.processes() if entry.status == STATUS_RUNNING)
+
+    def kill(self, process_id: int) -> None:
+        entry = self.get(process_id)
+        with self._lock:
+            entry.killed_by_user = True
+            process = entry.process
+        kill_process_tree(process)
+        self._check_exit(entry)
+
+    def restart(self, process_id: int) -> SupervisedProcess:
+        entry = self.get(process_id)
+        if entry.respawn is None:
+            raise RuntimeError(f"{entry.name} can't be restarted")
+        if entry.status == STATUS_RUNNING:
+            self.kill(process_id)
+
+        process = entry.respawn()
+        with self._lock:
+            entry.process = process
+            entry.started = time.time()
+            entry.status = STATUS_RUNNING
+            entry.exit_code = None
+            entry.killed_by_user = False
+            entry._exit_handled = False
+            entry.restarts += 1
+            entry._last_cpu = None
+        return entry
+
+    def forget_exited(self) -> None:
+        with self._lock:
+            self._processes = {pid: e for pid, e in self._processes.items() if e.status == STATUS_RUNNING}
+
+    # ---------------------------
+    # Sampling
+    # ---------------------------
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+
+    def _check_exit(self, entry: SupervisedProcess) -> bool:
+        with self._lock:
+            if entry._exit_handled or entry.process.poll() is None:
+                return False
+            entry._exit_handled = True
+            entry.exit_code = entry.process.returncode
+            if entry.killed_by_user:
+                entry.status = STATUS_KILLED
+            else:
+                entry.status = STATUS_EXITED if entry.exit_code == 0 else STATUS_CRASHED
+            entry.cpu_percent = 0.0
+        # Outside the lock: callbacks may take a while (collecting profile captures) or call back into the supervisor
+        for callback in self._exit_callbacks:
+            try:
+                callback(entry)
+            except Exception as e:
+                print(f"[Supervisor] Exit callback failed for {entry.name}: {e}")
+        return True
+
+    def sample_once(self) -> None:
+        rows = []
+        now = time.time()
+        for entry in self.processes():
+            exited = self._check_exit(entry)
+            if entry.status == STATUS_RUNNING:
+                sample = sample_process(entry.pid)
+                if sample is not None:
+                    wall = time.perf_counter()
+                    if entry._last_cpu is not None:
+                        last_cpu, last_wall = entry._last_cpu
+                        entry.cpu_percent = 100.0 * (sample.cpu_seconds - last_cpu) / max(wall - last_wall, 1e-6)
+                    entry._last_cpu = (sample.cpu_seconds, wall)
+                    entry.rss_bytes = sample.rss_bytes
+                    entry.peak_rss_bytes = max(entry.peak_rss_bytes, sample.rss_bytes)
+                    entry.handles = sample.handles
+            elif not exited:
+                continue
+            rows.append([
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)),
+                f"{now - self.started:.1f}",
+                entry.id,
+                entry.name,
+                entry.pid,
+                entry.status if entry.exit_code is None else f"{entry.status} ({entry.exit_code})",
+                f"{entry.cpu_percent:.1f}",
+                f"{entry.rss_bytes / (1024 * 1024):.1f}",
+                entry.handles,
+            ])
+        self._write_rows(rows)
+
+    def _write_rows(self, rows: List[list]) -> None:
+        if self.csv_path is None or not rows:
+            return
+        try:
+            is_new = not self.csv_path.exists()
+            self.csv_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                if is_new:
+                    writer.writerow(CSV_COLUMNS)
+                writer.writerows(rows)
+        except OSError as e:
+            print(f"[Supervisor] Failed to write samples to {self.csv_path}: {e}")
+
+    def _sample_loop(self) -> None:
+        while not self._stop.is_set():
+            self.sample_once()
+            self._stop.wait(self.interval)
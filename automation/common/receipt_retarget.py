@@ -0,0 +1,225 @@
+# Rewrites the absolute paths inside UBT build receipts so binaries built on another machine can be used here.
+#
+# Receipts (.target, .modules, .version) under Binaries/ and Plugins/**/Binaries/ are JSON files that may
+# contain absolute Windows paths of the machine that built them. The project root on that machine is the folder of
+# the receipts' ProjectFile (.uproject); paths below it are moved to the local project root. Other absolute paths
+# are matched against one compiled pattern of anchors: the part from "Engine\<Folder>\" onward is moved to the
+# local engine root, the part from a project folder ("Plugins\", "Source\", ...) onward to the local project root.
+# Only the matched string literals are replaced in the file's text, so the rest of the formatting stays as UBT
+# wrote it; files are rewritten atomically, only if something changed, and keep their original timestamps.
+from __future__ import annotations
+
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from .build_cache import _find_plugin_dirs
+
+RECEIPT_EXTENSIONS = (".target", ".modules", ".version")
+
+_ENGINE_FOLDERS = ("Binaries", "Build", "Config", "Content", "Extras", "Intermediate", "Plugins", "Shaders", "Source")
+_PROJECT_FOLDERS = ("Binaries", "Config", "Content", "Intermediate", "Plugins", "Saved", "Source")
+
+# Earliest anchor wins: "<...>\Engine\Plugins\X" is an engine path even though "\Plugins\" also matches further on.
+# Only used for paths outside the known project roots, because a folder above the project that is named like an
+# anchor (the "source" of C:\Users\me\source\repos\MyGame) matches first
+ANCHOR_RE = re.compile(
+    r"[\\/](?:(?P<engine>Engine[\\/](?:" + "|".join(_ENGINE_FOLDERS) + r"))"
+    r"|(?P<project>" + "|".join(_PROJECT_FOLDERS) + r")"
+    r"|(?P<uproject>[^\\/]+\.uproject$))(?=[\\/]|$)",
+    re.IGNORECASE,
+)
+ABSOLUTE_PATH_RE = re.compile(r"^(?:[A-Za-z]:[\\/]|\\\\)")
+# A JSON string literal, with escapes
+_JSON_STRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+
+@dataclass
+class RetargetResult:
+    path: Path
+    changed: int = 0
+    written: bool = False
+    # Absolute paths without a known anchor, left as-is
+    unmatched: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def find_project_roots(text: str) -> List[str]:
+    """The folders of the absolute .uproject paths (a .target's ProjectFile) in receipt text: the foreign project roots."""
+    roots: List[str] = []
+    for match in _JSON_STRING_RE.finditer(text):
+        if not match.group(1).lower().endswith(".uproject"):
+            continue
+        try:
+            value = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            continue
+        root = value[:max(value.rfind("\\"), value.rfind("/"))]
+        if ABSOLUTE_PATH_RE.match(value) and root and root not in roots:
+            roots.append(root)
+    return roots
+
+
+def _relative_to_roots(value: str, roots: Sequence[str]) -> Optional[str]:
+    # Windows paths: separators and case don't matter. The longest root wins
+    normalized = value.replace("/", "\\").lower()
+    for root in sorted(roots, key=len, reverse=True):
+        prefix = root.replace("/", "\\").rstrip("\\").lower()
+        if normalized == prefix or normalized.startswith(prefix + "\\"):
+            return value[len(prefix) + 1:]
+    return None
+
+
+def retarget_path(value: str, project_root: str, engine_root: Optional[str] = None,
+                  foreign_project_roots: Sequence[str] = ()) -> Optional[str]:
+    """
+    The local equivalent of an absolute Windows path, or None if it isn't absolute or has no known anchor.
+    Paths below one of foreign_project_roots (the project root on the machine that built the receipt) move to
+    project_root; others by their anchor. Engine paths are only moved when engine_root is given.
+    The slash style of the original is kept.
+    """
+    if not ABSOLUTE_PATH_RE.match(value):
+        return None
+    tail = _relative_to_roots(value, foreign_project_roots)
+    if tail is not None:
+        base = project_root
+    else:
+        match = ANCHOR_RE.search(value)
+        if match is None:
+            return None
+        tail = value[match.start() + 1:]
+        if match.group("engine"):
+            if engine_root is None:
+                return value
+            base = engine_root
+        else:
+            base = project_root
+
+    separator = "/" if "/" in value and "\\" not in value else "\\"
+    base = base.replace("\\", separator).replace("/", separator).rstrip(separator)
+    if not tail:
+        return base
+    return base + separator + tail.replace("\\", separator).replace("/", separator)
+
+
+def retarget_text(text: str, project_root: str, engine_root: Optional[str] = None,
+                  foreign_project_roots: Optional[Sequence[str]] = None) -> Tuple[str, int, List[str]]:
+    """
+    Retargets every absolute path string literal in JSON text. Returns (new text, number changed, unmatched paths).
+    Without foreign_project_roots they are taken from the text's own .uproject paths.
+    """
+    if foreign_project_roots is None:
+        foreign_project_roots = find_project_roots(text)
+    changed = 0
+    unmatched: List[str] = []
+
+    def replace(match: re.Match) -> str:
+        nonlocal changed
+        literal = match.group(1)
+        # Cheap pre-check before decoding: absolute paths start with a drive letter or a (escaped) UNC prefix
+        if len(literal) < 3 or not (literal[1] == ":" or literal.startswith("\\\\\\\\")):
+            return match.group(0)
+        try:
+            value = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return match.group(0)
+        new_value = retarget_path(value, project_root, engine_root, foreign_project_roots)
+        if new_value is None:
+            if ABSOLUTE_PATH_RE.match(value):
+                unmatched.append(value)
+            return match.group(0)
+        if new_value == value:
+            return match.group(0)
+        changed += 1
+        return json.dumps(new_value, ensure_ascii=False)
+
+    return _JSON_STRING_RE.sub(replace, text), changed, unmatched
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    stat = path.stat()
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    # Keep the receipt's timestamps, UBT compares them when deciding what is out of date
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp_path, path)
+
+
+def _read_receipt(path: Path) -> str:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return f.read()
+
+
+def retarget_file(path: Path, project_root: str, engine_root: Optional[str] = None, dry_run: bool = False,
+                  foreign_project_roots: Optional[Sequence[str]] = None) -> RetargetResult:
+    result = RetargetResult(path=Path(path))
+    try:
+        text = _read_receipt(path)
+        new_text, result.changed, result.unmatched = retarget_text(text, project_root, engine_root, foreign_project_roots)
+        if result.changed and not dry_run:
+            _write_atomic(Path(path), new_text)
+            result.written = True
+    except (OSError, UnicodeDecodeError) as e:
+        result.error = str(e)
+    return result
+
+
+def find_receipts(project_root: Path) -> List[Path]:
+    """All receipts below Binaries/ and every plugin's Binaries/."""
+    project_root = Path(project_root)
+    receipts: List[Path] = []
+    for rel in ["Binaries"] + _find_plugin_dirs(project_root, "Binaries"):
+        for dir_path, _, file_names in os.walk(project_root / rel):
+            receipts.extend(Path(dir_path, name) for name in file_names if name.lower().endswith(RECEIPT_EXTENSIONS))
+    return sorted(receipts)
+
+
+def retarget_receipts(
+    project_root: Path,
+    engine_root: Optional[Path] = None,
+    receipts: Optional[List[Path]] = None,
+    dry_run: bool = False,
+    max_workers: Optional[int] = None,
+) -> List[RetargetResult]:
+    """Retargets all receipts of the project (or the given ones) in parallel. Results are in path order."""
+    if receipts is None:
+        receipts = find_receipts(project_root)
+    engine = str(engine_root) if engine_root is not None else None
+    if not receipts:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        # .modules files have no ProjectFile of their own: the project roots come from all .target receipts
+        roots: List[str] = []
+        targets = [receipt for receipt in receipts if str(receipt).lower().endswith(".target")]
+        for text in pool.map(_read_target_text, targets):
+            roots.extend(root for root in find_project_roots(text) if root not in roots)
+        return list(pool.map(lambda receipt: retarget_file(receipt, str(project_root), engine, dry_run, roots), receipts))
+
+
+def _read_target_text(path: Path) -> str:
+    # Unreadable receipts are reported by retarget_file
+    try:
+        return _read_receipt(path)
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def format_results(results: List[RetargetResult], project_root: Path) -> str:
+    lines = []
+    for result in results:
+        rel = os.path.relpath(result.path, project_root)
+        if result.error:
+            lines.append(f"[ERROR] {rel}: {result.error}")
+        elif result.changed:
+            lines.append(f"[OK] {rel}: {result.changed} path(s) {'updated' if result.written else 'would be updated'}")
+        for value in result.unmatched:
+            lines.append(f"[NOTE] {rel}: no known anchor, left as-is: {value}")
+    changed_files = sum(1 for result in results if result.changed)
+    lines.append(f"{len(results)} receipt(s) scanned, {changed_files} changed, "
+                 f"{sum(1 for result in results if result.error)} error(s)")
+    return "\n".join(lines)
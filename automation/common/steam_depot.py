@@ -0,0 +1,366 @@
+# Steam depot uploads: chunk manifests of the packaged depot contents, app/depot build VDFs generated from
+# project.config, and steamcmd runs.
+#
+# A depot's content is described by the blake2b digests of its files' 1 MB chunks (Steam splits depot files into
+# chunks of about that size and only uploads chunks it doesn't have yet). The manifest of the last successful
+# upload of each depot is kept, so the next run knows which bytes changed - or that nothing did and the upload
+# can be skipped. Chunk digests are reused for files whose size and mtime didn't change since the last scan.
+#
+# State lives in <Project>/Saved/Automation/Steam/:
+#   depot_<id>_scan.json       chunk digests of the last scan (the hash cache)
+#   <build>/depot_<id>_uploaded.json   manifest of the build's last upload of the depot, with its BuildID and branch
+#   <build>/app_build.vdf, depot_build_<id>.vdf, output/   generated VDFs and steamcmd's BuildOutput of one build
+from __future__ import annotations
+
+import configparser
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .delta_sync import format_bytes
+from .fast_copy import DEFAULT_MAX_WORKERS
+from .process_runner import kill_process_tree, start_process
+
+STEAM_SECTION = "Steam"
+DEPOT_SECTION_PREFIX = "SteamDepot "
+BUILD_SECTION_PREFIX = "SteamBuild "
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+MAX_LISTED_CHANGES = 10
+
+_SUCCESS_RE = re.compile(r"Successfully finished AppID (\d+) build \(BuildID (\d+)\)")
+# steamcmd reports most failures ("ERROR! Failed to commit build", "FAILED (Invalid Password)") with exit code 0
+_ERROR_RE = re.compile(r"\bERROR\b|\bFAILED\b|Login Failure")
+
+
+@dataclass
+class SteamDepot:
+    depot_id: str
+    content_root: Path
+    # fnmatch patterns, matched against the depot-relative path (forward slashes) and the file name
+    exclusions: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SteamBuild:
+    name: str
+    depot_ids: List[str]
+    # Branch set live after the upload; empty = none (Steam doesn't allow setting "default" live from steamcmd)
+    set_live: str = ""
+
+
+@dataclass
+class SteamSettings:
+    steamcmd: str
+    username: str
+    app_id: str
+    description: str
+    max_parallel_uploads: int
+    depots: Dict[str, SteamDepot] = field(default_factory=dict)
+    builds: List[SteamBuild] = field(default_factory=list)
+
+
+@dataclass
+class FileChunks:
+    size: int
+    mtime_ns: int
+    chunks: List[str] = field(default_factory=list)
+
+
+@dataclass
+class DepotDiff:
+    depot_id: str
+    files: int = 0
+    total_bytes: int = 0
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # Bytes in chunks the last upload didn't have: roughly what steamcmd will upload
+    changed_bytes: int = 0
+    # No manifest of an earlier upload
+    first_upload: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return self.first_upload or bool(self.added or self.modified or self.removed)
+
+    def format(self) -> str:
+        if self.first_upload:
+            return f"Depot {self.depot_id}: first upload, {self.files} file(s), {format_bytes(self.total_bytes)}"
+        if not self.changed:
+            return f"Depot {self.depot_id}: unchanged ({self.files} file(s), {format_bytes(self.total_bytes)})"
+        lines = [f"Depot {self.depot_id}: {len(self.added)} added, {len(self.modified)} modified, {len(self.removed)} removed; "
+                 f"{format_bytes(self.changed_bytes)} of {format_bytes(self.total_bytes)} in changed chunks"]
+        changes = [(rel, "added") for rel in self.added] + [(rel, "modified") for rel in self.modified] + \
+                  [(rel, "removed") for rel in self.removed]
+        for rel, kind in changes[:MAX_LISTED_CHANGES]:
+            lines.append(f"  {kind:<8} {rel}")
+        if len(changes) > MAX_LISTED_CHANGES:
+            lines.append(f"  ... and {len(changes) - MAX_LISTED_CHANGES} more")
+        return "\n".join(lines)
+
+
+@dataclass
+class UploadResult:
+    build: str
+    returncode: Optional[int] = None
+    build_id: str = ""
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        return self.returncode == 0 and not self.errors
+
+
+# ---------------------------
+# Settings
+# ---------------------------
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in value.replace("\n", ",").split(",") if item.strip()]
+
+
+def load_steam_settings(project_config: configparser.ConfigParser, project_root: Path) -> SteamSettings:
+    if not project_config.has_section(STEAM_SECTION):
+        raise RuntimeError(f"No [{STEAM_SECTION}] section in project.config (see config/project.config.example)")
+    section = project_config[STEAM_SECTION]
+    settings = SteamSettings(
+        steamcmd=section.get("SteamCmd", "").strip(),
+        username=section.get("Username", "").strip(),
+        app_id=section.get("AppId", "").strip(),
+        description=section.get("Description", "").strip(),
+        max_parallel_uploads=section.getint("MaxParallelUploads", 1),
+    )
+    if not settings.app_id.isdigit():
+        raise RuntimeError(f"[{STEAM_SECTION}] AppId must be a number, got '{settings.app_id}'")
+
+    for name in project_config.sections():
+        if name.startswith(DEPOT_SECTION_PREFIX):
+            depot_id = name[len(DEPOT_SECTION_PREFIX):].strip()
+            if not depot_id.isdigit():
+                raise RuntimeError(f"[{name}]: the depot ID must be a number")
+            content_value = project_config.get(name, "ContentRoot", fallback="").strip()
+            if not content_value:
+                raise RuntimeError(f"[{name}] has no ContentRoot")
+            content_root = Path(content_value)
+            settings.depots[depot_id] = SteamDepot(
+                depot_id=depot_id,
+                content_root=content_root if content_root.is_absolute() else Path(project_root) / content_root,
+                exclusions=_split_list(project_config.get(name, "FileExclusions", fallback="")),
+            )
+    if not settings.depots:
+        raise RuntimeError(f"No depots configured: add a [{DEPOT_SECTION_PREFIX}<depot id>] section to project.config")
+
+    for name in project_config.sections():
+        if name.startswith(BUILD_SECTION_PREFIX):
+            build_name = name[len(BUILD_SECTION_PREFIX):].strip()
+            depot_ids = _split_list(project_config.get(name, "Depots", fallback="")) or list(settings.depots)
+            unknown = [depot_id for depot_id in depot_ids if depot_id not in settings.depots]
+            if unknown:
+                raise RuntimeError(f"[{name}] uses unknown depot(s): {', '.join(unknown)}")
+            settings.builds.append(SteamBuild(build_name, depot_ids, project_config.get(name, "SetLive", fallback="").strip()))
+    if not settings.builds:
+        # No build sections: one build with every depot
+        settings.builds.append(SteamBuild("default", list(settings.depots), section.get("SetLive", "").strip()))
+    return settings
+
+
+# ---------------------------
+# Manifests
+# ---------------------------
+
+def hash_chunks(path: Path) -> List[str]:
+    chunks: List[str] = []
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                break
+            chunks.append(hashlib.blake2b(data, digest_size=20).hexdigest())
+    return chunks
+
+
+def load_manifest(path: Path) -> Tuple[Dict[str, FileChunks], dict]:
+    """(files, extra fields) of a stored manifest; empty if missing, unreadable or of another version."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}, {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}, {}
+    files = {rel: FileChunks(*entry) for rel, entry in data.get("files", {}).items()}
+    return files, {key: value for key, value in data.items() if key not in ("version", "files")}
+
+
+def save_manifest(path: Path, files: Dict[str, FileChunks], **extra) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    data = {"version": MANIFEST_VERSION, **extra,
+            "files": {rel: [f.size, f.mtime_ns, f.chunks] for rel, f in sorted(files.items())}}
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _is_excluded(rel: str, patterns: List[str]) -> bool:
+    name = rel.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(rel, pattern) or fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def scan_depot(depot: SteamDepot, cache: Dict[str, FileChunks],
+               max_workers: int = DEFAULT_MAX_WORKERS) -> Tuple[Dict[str, FileChunks], int]:
+    """
+    Chunk digests of every file below the depot's content root, minus the exclusions. Files whose size and mtime
+    match the cache keep their digests; the others are hashed in parallel. Returns (files, hashed bytes).
+    """
+    root = depot.content_root
+    if not root.is_dir():
+        raise RuntimeError(f"Content root of depot {depot.depot_id} not found: {root}")
+    files: Dict[str, FileChunks] = {}
+    to_hash: List[str] = []
+    stack = [(str(root), "")]
+    while stack:
+        folder, rel_folder = stack.pop()
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                rel = f"{rel_folder}{entry.name}"
+                if entry.is_dir():
+                    stack.append((entry.path, rel + "/"))
+                    continue
+                if _is_excluded(rel, depot.exclusions):
+                    continue
+                st = entry.stat()
+                cached = cache.get(rel)
+                if cached is not None and cached.size == st.st_size and cached.mtime_ns == st.st_mtime_ns:
+                    files[rel] = cached
+                else:
+                    files[rel] = FileChunks(st.st_size, st.st_mtime_ns)
+                    to_hash.append(rel)
+
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_hash)))) as pool:
+            for rel, chunks in zip(to_hash, pool.map(lambda rel: hash_chunks(root / rel), to_hash)):
+                files[rel].chunks = chunks
+    return files, sum(files[rel].size for rel in to_hash)
+
+
+def diff_depot(depot_id: str, uploaded: Optional[Dict[str, FileChunks]], current: Dict[str, FileChunks]) -> DepotDiff:
+    diff = DepotDiff(depot_id=depot_id, files=len(current), total_bytes=sum(f.size for f in current.values()))
+    if uploaded is None:
+        diff.first_upload = True
+        diff.changed_bytes = diff.total_bytes
+        diff.added = sorted(current)
+        return diff
+
+    known_chunks = {chunk for f in uploaded.values() for chunk in f.chunks}
+    for rel, state in sorted(current.items()):
+        previous = uploaded.get(rel)
+        if previous is None:
+            diff.added.append(rel)
+        elif previous.size != state.size or previous.chunks != state.chunks:
+            diff.modified.append(rel)
+        else:
+            continue
+        for index, chunk in enumerate(state.chunks):
+            if chunk not in known_chunks:
+                diff.changed_bytes += min(CHUNK_SIZE, state.size - index * CHUNK_SIZE)
+    diff.removed = sorted(rel for rel in uploaded if rel not in current)
+    return diff
+
+
+# ---------------------------
+# VDFs
+# ---------------------------
+
+def _vdf_value(value: str) -> str:
+    if '"' in value:
+        raise RuntimeError(f"Steam VDF values can't contain double quotes: {value}")
+    return f'"{value}"'
+
+
+def write_build_vdfs(settings: SteamSettings, build: SteamBuild, build_dir: Path, description: str,
+                     preview: bool = False) -> Path:
+    """Writes app_build.vdf and one depot_build_<id>.vdf per depot of the build. Returns the app build VDF."""
+    build_dir.mkdir(parents=True, exist_ok=True)
+    (build_dir / "output").mkdir(exist_ok=True)
+    for depot_id in build.depot_ids:
+        depot = settings.depots[depot_id]
+        lines = ['"DepotBuild"', "{",
+                 f'\t"DepotID" {_vdf_value(depot_id)}',
+                 f'\t"ContentRoot" {_vdf_value(str(depot.content_root))}',
+                 '\t"FileMapping"', "\t{",
+                 '\t\t"LocalPath" "*"', '\t\t"DepotPath" "."', '\t\t"Recursive" "1"',
+                 "\t}"]
+        lines += [f'\t"FileExclusion" {_vdf_value(pattern)}' for pattern in depot.exclusions]
+        lines.append("}")
+        (build_dir / f"depot_build_{depot_id}.vdf").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    lines = ['"AppBuild"', "{",
+             f'\t"AppID" {_vdf_value(settings.app_id)}',
+             f'\t"Desc" {_vdf_value(description)}',
+             f'\t"BuildOutput" {_vdf_value(str(build_dir / "output"))}',
+             f'\t"Preview" "{1 if preview else 0}"']
+    if build.set_live and not preview:
+        lines.append(f'\t"SetLive" {_vdf_value(build.set_live)}')
+    lines += ['\t"Depots"', "\t{"]
+    lines += [f'\t\t{_vdf_value(depot_id)} {_vdf_value(str(build_dir / f"depot_build_{depot_id}.vdf"))}' for depot_id in build.depot_ids]
+    lines += ["\t}", "}"]
+    app_vdf = build_dir / "app_build.vdf"
+    app_vdf.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return app_vdf
+
+
+# ---------------------------
+# steamcmd
+# ---------------------------
+
+def steamcmd_command(settings: SteamSettings, app_vdf: Path) -> List[str]:
+    if not settings.steamcmd:
+        raise RuntimeError(f"No SteamCmd in the [{STEAM_SECTION}] section of project.config")
+    if not settings.username:
+        raise RuntimeError(f"No Username in the [{STEAM_SECTION}] section of project.config")
+    # A .py stand-in (tests, dry runs on machines without steamcmd) runs with this interpreter
+    command = [sys.executable, settings.steamcmd] if settings.steamcmd.lower().endswith(".py") else [settings.steamcmd]
+    # No password: steamcmd uses the credentials cached by an earlier interactive login
+    return command + ["+login", settings.username, "+run_app_build", str(app_vdf), "+quit"]
+
+
+def run_steamcmd(build: str, command: List[str], output: Callable[[str], None] = print,
+                 cancel_event: Optional[threading.Event] = None) -> UploadResult:
+    """Runs one upload, prefixing its output with the build name. Error lines fail it even with exit code 0."""
+    result = UploadResult(build=build)
+    start = time.perf_counter()
+    try:
+        process = start_process(command)
+    except OSError as e:
+        result.errors.append(f"Failed to start steamcmd: {e}")
+        return result
+    try:
+        for line in process.stdout:
+            line = line.rstrip()
+            output(f"[{build}] {line}")
+            success = _SUCCESS_RE.search(line)
+            if success:
+                result.build_id = success.group(2)
+            elif _ERROR_RE.search(line):
+                result.errors.append(line.strip())
+            if cancel_event is not None and cancel_event.is_set():
+                kill_process_tree(process)
+                result.errors.append("Cancelled")
+                break
+        result.returncode = process.wait()
+    finally:
+        kill_process_tree(process)
+    result.seconds = time.perf_counter() - start
+    return result
@@ -0,0 +1,261 @@
+# Runs build steps (UBT/UAT command lines) concurrently where their dependencies allow it.
+#
+# Dependency rules:
+#  - A step with an explicit depends_on waits for exactly those steps or groups.
+#  - Any other step waits for every step of the group before it (in order of first appearance).
+#    A step without a group forms a group of its own, so steps without any attributes run strictly in order.
+#
+# Besides max_jobs, a resource budget (e.g. {"cpu": 16, "memory_gb": 64}) can limit which ready steps start together:
+# a step only starts while the resources of all running steps plus its own fit in the budget.
+# A step that doesn't fit on its own still runs, just not alongside others.
+from __future__ import annotations
+
+import queue
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from .process_runner import kill_process_tree, start_process
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_CACHED = "cached"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+
+@dataclass
+class Step:
+    name: str
+    # A string command runs through the shell (e.g. a RunUAT.bat command line with quoted arguments)
+    command: Union[List[str], str]
+    cwd: Optional[Path] = None
+    group: Optional[str] = None
+    depends_on: Optional[List[str]] = None
+    # Optional hooks, e.g. for the build cache: skip_check(step) returning True marks the step as done without running it
+    skip_check: Optional[Callable[["Step"], bool]] = None
+    on_success: Optional[Callable[["Step"], None]] = None
+    # Estimated resource use while running, checked against the scheduler's budget
+    resources: Dict[str, float] = field(default_factory=dict)
+    status: str = STATUS_PENDING
+    duration: float = 0.0
+    returncode: Optional[int] = None
+    # Resolved dependencies (step names), filled in by resolve_dependencies()
+    requires: List[str] = field(default_factory=list)
+
+
+def format_command(step: Step) -> str:
+    return step.command if isinstance(step.command, str) else " ".join(step.command)
+
+
+def resolve_dependencies(steps: List[Step]) -> None:
+    """Resolves depends_on/group into Step.requires and checks for unknown names and cycles."""
+    by_name = {step.name: step for step in steps}
+    if len(by_name) != len(steps):
+        raise RuntimeError("Build step names must be unique")
+
+    groups: Dict[str, List[str]] = {}
+    group_order: List[str] = []
+    for step in steps:
+        group_name = step.group or step.name
+        if group_name not in groups:
+            groups[group_name] = []
+            group_order.append(group_name)
+        groups[group_name].append(step.name)
+
+    for step in steps:
+        if step.depends_on is not None:
+            requires: List[str] = []
+            for dependency in step.depends_on:
+                if dependency in groups and dependency not in by_name:
+                    requires.extend(groups[dependency])
+                elif dependency in by_name:
+                    requires.append(dependency)
+                else:
+                    raise RuntimeError(f"Step '{step.name}' depends on unknown step or group '{dependency}'")
+            step.requires = [name for name in requires if name != step.name]
+        else:
+            group_index = group_order.index(step.group or step.name)
+            step.requires = list(groups[group_order[group_index - 1]]) if group_index > 0 else []
+
+    # Cycle check (depth-first)
+    visiting: set = set()
+    done: set = set()
+
+    def visit(name: str, chain: List[str]) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise RuntimeError(f"Dependency cycle in build steps: {' -> '.join(chain + [name])}")
+        visiting.add(name)
+        for required in by_name[name].requires:
+            visit(required, chain + [name])
+        visiting.discard(name)
+        done.add(name)
+
+    for step in steps:
+        visit(step.name, [])
+
+
+def describe_plan(steps: List[Step]) -> List[List[Step]]:
+    """Returns the steps in waves: every step only depends on steps of earlier waves."""
+    resolve_dependencies(steps)
+    remaining = list(steps)
+    placed: set = set()
+    waves: List[List[Step]] = []
+    while remaining:
+        wave = [step for step in remaining if all(name in placed for name in step.requires)]
+        waves.append(wave)
+        placed.update(step.name for step in wave)
+        remaining = [step for step in remaining if step.name not in placed]
+    return waves
+
+
+class StepScheduler:
+    def __init__(self, steps: List[Step], max_jobs: int = 1, output: Callable[[str], None] = print,
+                 budget: Optional[Dict[str, float]] = None):
+        self.steps = steps
+        self.max_jobs = max(1, max_jobs)
+        self.output = output
+        self.budget = budget or {}
+        self._output_lock = threading.Lock()
+        self._processes: Dict[str, subprocess.Popen] = {}
+        self._processes_lock = threading.Lock()
+        self._finished: "queue.Queue[Step]" = queue.Queue()
+        self._cancelled = threading.Event()
+
+    def _print(self, text: str) -> None:
+        with self._output_lock:
+            self.output(text)
+
+    def _run_step(self, step: Step) -> None:
+        # Always reports the step back, whatever happens in it: run() waits for every started step
+        start = time.perf_counter()
+        try:
+            self._execute_step(step)
+        except Exception as e:
+            self._print(f"[{step.name}] Failed: {e}")
+            step.returncode = step.returncode or -1
+            step.status = STATUS_FAILED
+        finally:
+            if step.status == STATUS_RUNNING:
+                step.status = STATUS_FAILED
+            step.duration = time.perf_counter() - start
+            self._finished.put(step)
+
+    def _execute_step(self, step: Step) -> None:
+        try:
+            if step.skip_check is not None and step.skip_check(step):
+                step.returncode = 0
+                step.status = STATUS_CACHED
+                return
+        except Exception as e:
+            self._print(f"[{step.name}] Skip check failed, running step: {e}")
+
+        try:
+            process = start_process(step.command, cwd=step.cwd, shell=isinstance(step.command, str))
+            with self._processes_lock:
+                self._processes[step.name] = process
+            if self._cancelled.is_set():
+                kill_process_tree(process)
+            for line in process.stdout:
+                self._print(f"[{step.name}] {line.rstrip()}")
+            step.returncode = process.wait()
+        except OSError as e:
+            self._print(f"[{step.name}] Failed to start: {e}")
+            step.returncode = -1
+        finally:
+            with self._processes_lock:
+                self._processes.pop(step.name, None)
+
+        if self._cancelled.is_set() and step.returncode != 0:
+            step.status = STATUS_CANCELLED
+        elif step.returncode != 0:
+            step.status = STATUS_FAILED
+        else:
+            # A failing hook (e.g. storing build outputs) fails the step, see _run_step
+            if step.on_success is not None:
+                step.on_success(step)
+            step.status = STATUS_SUCCEEDED
+
+    def cancel(self) -> None:
+        """Stops the run from another thread: running steps are killed, pending steps won't start."""
+        self._cancel_running()
+
+    def _fits_budget(self, step: Step, running_steps: List[Step]) -> bool:
+        if not running_steps:
+            return True
+        for resource, limit in self.budget.items():
+            in_use = sum(running.resources.get(resource, 0.0) for running in running_steps)
+            if in_use + step.resources.get(resource, 0.0) > limit:
+                return False
+        return True
+
+    def _cancel_running(self) -> None:
+        self._cancelled.set()
+        with self._processes_lock:
+            processes = list(self._processes.values())
+        for process in processes:
+            kill_process_tree(process)
+
+    def run(self) -> float:
+        """Runs all steps; stops everything on the first failure. Returns the wall-clock time."""
+        resolve_dependencies(self.steps)
+        start = time.perf_counter()
+        pending = list(self.steps)
+        running = 0
+        failed: Optional[Step] = None
+
+        while pending or running:
+            if self._cancelled.is_set() and pending:
+                for step in pending:
+                    step.status = STATUS_CANCELLED
+                pending.clear()
+            if failed is None and not self._cancelled.is_set():
+                succeeded = {step.name for step in self.steps if step.status in (STATUS_SUCCEEDED, STATUS_CACHED)}
+                for step in list(pending):
+                    if running >= self.max_jobs:
+                        break
+                    running_steps = [s for s in self.steps if s.status == STATUS_RUNNING]
+                    if all(name in succeeded for name in step.requires) and self._fits_budget(step, running_steps):
+                        pending.remove(step)
+                        step.status = STATUS_RUNNING
+                        self._print(f"[{step.name}] Starting: {format_command(step)}")
+                        threading.Thread(target=self._run_step, args=(step,), daemon=True).start()
+                        running += 1
+
+            if not running:
+                break
+
+            finished = self._finished.get()
+            running -= 1
+            self._print(f"[{finished.name}] {finished.status} after {finished.duration:.1f}s")
+            if finished.status == STATUS_FAILED and failed is None:
+                failed = finished
+                for step in pending:
+                    step.status = STATUS_CANCELLED
+                pending.clear()
+                self._cancel_running()
+
+        wall_clock = time.perf_counter() - start
+        self._print(format_summary(self.steps, wall_clock))
+
+        if failed is not None:
+            raise RuntimeError(f"Build step '{failed.name}' failed with exit code {failed.returncode}")
+        if self._cancelled.is_set():
+            raise RuntimeError("Build steps were cancelled")
+        return wall_clock
+
+
+def format_summary(steps: List[Step], wall_clock: float) -> str:
+    serial_time = sum(step.duration for step in steps)
+    lines = ["", "=== Build step summary ==="]
+    for step in steps:
+        lines.append(f"  {step.name:<24} {step.status:<10} {step.duration:8.1f}s")
+    lines.append(f"  Serial time: {serial_time:.1f}s, wall-clock: {wall_clock:.1f}s"
+                 + (f" ({serial_time / wall_clock:.2f}x)" if wall_clock > 0 else ""))
+    return "\n".join(lines)
@@ -0,0 +1,313 @@
+# Streaming parser for UAT/UBT output (BuildCookRun and friends).
+#
+# Lines are fed one at a time, either live from the running process or from a log file, and only
+# per-phase counters are kept, so multi-GB logs are parsed in constant memory.
+# Phases are detected from UAT's banners ("********** COOK COMMAND STARTED **********", ...)
+# plus a few well-known lines for Turnkey and Pak/IoStore, which have no banner of their own.
+# Everything outside a known phase (UAT's own startup, the gaps between commands) is reported as one "Other" phase.
+from __future__ import annotations
+
+import heapq
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .process_runner import start_process
+
+PHASE_TURNKEY = "Turnkey"
+PHASE_BUILD = "Build"
+PHASE_COOK = "Cook"
+PHASE_STAGE = "Stage"
+PHASE_PAK = "Pak/IoStore"
+PHASE_PACKAGE = "Package"
+PHASE_ARCHIVE = "Archive"
+PHASE_OTHER = "Other"
+
+_BANNER_RE = re.compile(r"\*{5,}\s+(BUILD|COOK|STAGE|PACKAGE|ARCHIVE|DEPLOY|RUN)\s+COMMAND\s+(STARTED|COMPLETED)")
+_BANNER_PHASES = {
+    "BUILD": PHASE_BUILD,
+    "COOK": PHASE_COOK,
+    "STAGE": PHASE_STAGE,
+    "PACKAGE": PHASE_PACKAGE,
+    "ARCHIVE": PHASE_ARCHIVE,
+}
+_TURNKEY_RE = re.compile(r"\bTurnkey\b|VerifySdk", re.IGNORECASE)
+# Pak/IoStore run inside the Stage command
+_PAK_RE = re.compile(r"UnrealPak|LogIoStore|Creating pak|IoStore", re.IGNORECASE)
+
+# "LogFoo: Warning: ...", "file.cpp(12): warning C4996: ...", "Warning: ..."
+_WARNING_RE = re.compile(r"(?:^|\s|\])(?:\w+: )?Warning:|\bwarning [A-Z]+\d+\s*:", re.IGNORECASE)
+_ERROR_RE = re.compile(r"(?:^|\s|\])(?:\w+: )?Error:|\berror [A-Z]+\d+\s*:", re.IGNORECASE)
+# UAT reports the duration of each tool it runs: "Took 123.45s to run UnrealEditor-Cmd.exe, ExitCode=0"
+_TOOK_RE = re.compile(r"\bTook (\d+(?:\.\d+)?)s\b")
+# Per-package timings in cook logs, e.g. "... /Game/Maps/Big took 12.3s ..." (only present with verbose cook stats)
+_PACKAGE_TIME_RE = re.compile(r"(?P<package>/[\w/.\-]+)\b.*?\btook\s+(?P<seconds>\d+(?:\.\d+)?)\s*(?:s|sec|seconds)\b", re.IGNORECASE)
+# UE log timestamps: "[2024.05.01-10.11.12:345]"
+_TIMESTAMP_RE = re.compile(r"^\[(\d{4})\.(\d{2})\.(\d{2})-(\d{2})\.(\d{2})\.(\d{2})(?::(\d{3}))?\]")
+_EXIT_CODE_RE = re.compile(r"AutomationTool exiting with ExitCode=(-?\d+)")
+
+MAX_ERROR_LINES = 20
+DEFAULT_SLOWEST_PACKAGES = 10
+
+
+@dataclass
+class PhaseStats:
+    name: str
+    start: float
+    end: Optional[float] = None
+    lines: int = 0
+    warnings: int = 0
+    errors: int = 0
+    # Sum of UAT's "Took Ns" lines within the phase
+    tool_seconds: float = 0.0
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+
+@dataclass
+class LogSummary:
+    phases: List[PhaseStats] = field(default_factory=list)
+    total_lines: int = 0
+    warnings: int = 0
+    errors: int = 0
+    exit_code: Optional[int] = None
+    succeeded: Optional[bool] = None
+    first_errors: List[str] = field(default_factory=list)
+    slowest_packages: List[Tuple[float, str]] = field(default_factory=list)
+    # False when parsing a log without timestamps: durations are then unknown
+    timed: bool = True
+
+    def to_dict(self) -> Dict:
+        return {
+            "succeeded": self.succeeded,
+            "exit_code": self.exit_code,
+            "total_lines": self.total_lines,
+            "warnings": self.warnings,
+            "errors": self.errors,
+            "phases": [
+                {
+                    "name": phase.name,
+                    "duration_s": round(phase.duration, 3) if self.timed and phase.duration is not None else None,
+                    "tool_s": round(phase.tool_seconds, 3),
+                    "lines": phase.lines,
+                    "warnings": phase.warnings,
+                    "errors": phase.errors,
+                }
+                for phase in self.phases
+            ],
+            "first_errors": self.first_errors,
+            "slowest_packages": [{"package": package, "seconds": seconds} for seconds, package in self.slowest_packages],
+        }
+
+    def format(self) -> str:
+        lines = ["", "=== UAT phase summary ==="]
+        for phase in self.phases:
+            duration = f"{phase.duration:9.1f}s" if self.timed and phase.duration is not None else f"{'-':>10}"
+            tool = f" (tools {phase.tool_seconds:.1f}s)" if phase.tool_seconds else ""
+            lines.append(f"  {phase.name:<12} {duration}  {phase.warnings:6d} warning(s) {phase.errors:5d} error(s){tool}")
+        result = "unknown" if self.succeeded is None else ("succeeded" if self.succeeded else "failed")
+        exit_code = f", exit code {self.exit_code}" if self.exit_code is not None else ""
+        lines.append(f"  Result: {result}{exit_code}; {self.total_lines} lines, {self.warnings} warning(s), {self.errors} error(s)")
+        if self.slowest_packages:
+            lines.append("  Slowest cooked packages:")
+            for seconds, package in self.slowest_packages:
+                lines.append(f"    {seconds:8.1f}s  {package}")
+        if self.first_errors:
+            lines.append("  First errors:")
+            for error in self.first_errors:
+                lines.append(f"    {error}")
+        return "\n".join(lines)
+
+
+def _parse_timestamp(line: str) -> Optional[float]:
+    match = _TIMESTAMP_RE.match(line)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, millis = match.groups()
+    moment = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), int(millis or 0) * 1000)
+    return moment.timestamp()
+
+
+class UatLogParser:
+    def __init__(
+        self,
+        on_phase: Optional[Callable[[str], None]] = None,
+        clock: Optional[Callable[[], float]] = time.time,
+        slowest_packages: int = DEFAULT_SLOWEST_PACKAGES,
+    ):
+        """
+        clock: time source for phase boundaries while parsing live output.
+        Pass None to take the times from the log lines' own timestamps instead (offline parsing).
+        """
+        self.on_phase = on_phase
+        self.clock = clock
+        self.max_slowest_packages = slowest_packages
+        self.summary = LogSummary(timed=clock is not None)
+        self._current: Optional[PhaseStats] = None
+        # Turnkey/VerifySdk only runs before the first command banner
+        self._seen_banner = False
+        self._last_time: Optional[float] = None
+        # Min-heap of (seconds, package): the N slowest seen so far
+        self._slowest: List[Tuple[float, str]] = []
+
+    @property
+    def current_phase(self) -> Optional[str]:
+        return self._current.name if self._current else None
+
+    def _now(self, line: str) -> Optional[float]:
+        if self.clock is not None:
+            return self.clock()
+        timestamp = _parse_timestamp(line)
+        if timestamp is not None:
+            self._last_time = timestamp
+        return self._last_time
+
+    def _enter(self, name: str, now: Optional[float]) -> None:
+        if self._current is not None and self._current.name == name:
+            return
+        self._close(now)
+        self._current = PhaseStats(name=name, start=now if now is not None else 0.0)
+        self.summary.phases.append(self._current)
+        if now is not None:
+            # Offline logs count as timed once any line had a timestamp
+            self.summary.timed = True
+        if self.on_phase is not None:
+            self.on_phase(name)
+
+    def _close(self, now: Optional[float]) -> None:
+        if self._current is not None and self._current.end is None:
+            self._current.end = now if now is not None else self._current.start
+
+    def _detect_phase(self, line: str) -> Optional[str]:
+        banner = _BANNER_RE.search(line)
+        if banner:
+            self._seen_banner = True
+            name, state = banner.groups()
+            phase = _BANNER_PHASES.get(name, PHASE_OTHER)
+            if state == "STARTED":
+                return phase
+            # Whatever follows a completed command until the next banner
+            return PHASE_OTHER
+        # UAT's own startup lines ("Running AutomationTool...") come first and open the leading Other phase
+        if not self._seen_banner and self.current_phase in (None, PHASE_OTHER) and _TURNKEY_RE.search(line):
+            return PHASE_TURNKEY
+        current = self.current_phase
+        if current == PHASE_STAGE and _PAK_RE.search(line):
+            return PHASE_PAK
+        return None
+
+    def feed(self, line: str) -> None:
+        now = self._now(line)
+        phase = self._detect_phase(line)
+        if phase is not None:
+            self._enter(phase, now)
+        elif self._current is None:
+            self._enter(PHASE_OTHER, now)
+
+        current = self._current
+        current.lines += 1
+        self.summary.total_lines += 1
+
+        if _ERROR_RE.search(line):
+            current.errors += 1
+            self.summary.errors += 1
+            if len(self.summary.first_errors) < MAX_ERROR_LINES:
+                self.summary.first_errors.append(line.strip()[:300])
+        elif _WARNING_RE.search(line):
+            current.warnings += 1
+            self.summary.warnings += 1
+
+        took = _TOOK_RE.search(line)
+        if took:
+            current.tool_seconds += float(took.group(1))
+
+        if current.name == PHASE_COOK and self.max_slowest_packages > 0:
+            package_time = _PACKAGE_TIME_RE.search(line)
+            if package_time:
+                item = (float(package_time.group("seconds")), package_time.group("package"))
+                if len(self._slowest) < self.max_slowest_packages:
+                    heapq.heappush(self._slowest, item)
+                elif item > self._slowest[0]:
+                    heapq.heapreplace(self._slowest, item)
+
+        exit_code = _EXIT_CODE_RE.search(line)
+        if exit_code:
+            self.summary.exit_code = int(exit_code.group(1))
+        elif "BUILD SUCCESSFUL" in line and self.summary.succeeded is None:
+            self.summary.succeeded = True
+        elif "BUILD FAILED" in line:
+            self.summary.succeeded = False
+
+    def finish(self, exit_code: Optional[int] = None) -> LogSummary:
+        self._close(self.clock() if self.clock is not None else self._last_time)
+        if exit_code is not None:
+            self.summary.exit_code = exit_code
+        if self.summary.exit_code is not None:
+            self.summary.succeeded = self.summary.exit_code == 0
+        self.summary.slowest_packages = sorted(self._slowest, reverse=True)
+        self.summary.phases = _merge_other_phases(self.summary.phases)
+        return self.summary
+
+
+def _merge_other_phases(phases: List[PhaseStats]) -> List[PhaseStats]:
+    """The known phases in order, followed by one "Other" phase that adds up all the Other segments."""
+    others = [phase for phase in phases if phase.name == PHASE_OTHER]
+    if len(others) < 2:
+        return phases
+    durations = [phase.duration for phase in others]
+    merged = PhaseStats(
+        name=PHASE_OTHER,
+        start=others[0].start,
+        lines=sum(phase.lines for phase in others),
+        warnings=sum(phase.warnings for phase in others),
+        errors=sum(phase.errors for phase in others),
+        tool_seconds=sum(phase.tool_seconds for phase in others),
+    )
+    if all(duration is not None for duration in durations):
+        merged.end = merged.start + sum(durations)
+    return [phase for phase in phases if phase.name != PHASE_OTHER] + [merged]
+
+
+def parse_log_file(path: Path, slowest_packages: int = DEFAULT_SLOWEST_PACKAGES) -> LogSummary:
+    """Parses a saved log line by line; durations come from the lines' timestamps if there are any."""
+    parser = UatLogParser(clock=None, slowest_packages=slowest_packages)
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            parser.feed(line.rstrip("\n"))
+    return parser.finish()
+
+
+def write_summary(summary: LogSummary, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary.to_dict(), f, indent=2)
+
+
+def run_uat_command(
+    command: Union[List[str], str],
+    cwd: Optional[Path] = None,
+    shell: bool = False,
+    output: Callable[[str], None] = print,
+    summary_path: Optional[Path] = None,
+) -> Tuple[int, LogSummary]:
+    """Runs a UAT/UBT command, echoing and parsing its output. Returns (exit code, summary)."""
+    parser = UatLogParser()
+    process = start_process(command, cwd=cwd, shell=shell)
+    for line in process.stdout:
+        line = line.rstrip()
+        output(line)
+        parser.feed(line)
+    returncode = process.wait()
+
+    summary = parser.finish(returncode)
+    output(summary.format())
+    if summary_path is not None:
+        write_summary(summary, summary_path)
+        output(f"Phase summary written to {summary_path}")
+    return returncode, summary
@@ -0,0 +1,310 @@
+# Selective workspace clean: named presets instead of `git clean -fdx`, which also throws away DerivedDataCache,
+# Saved/ and pulled plugin binaries that take hours to get back.
+#
+#   targets = resolve_targets(project_root, PRESETS["build"])
+#   sizes = measure(targets)              # reclaimable bytes per target, shown before anything is deleted
+#   report = delete_paths(targets)        # or move_to_trash(project_root, targets) + start_trash_emptier(...)
+#
+# Sizes and deletion work on the entries just below each target, spread over a thread pool: the time goes into
+# per-file filesystem calls, which release the GIL. move_to_trash() renames the targets into <Project>/.CleanTrash
+# (same volume, so instant) and a detached process deletes the trash afterwards.
+from __future__ import annotations
+
+import codecs
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .build_cache import _find_plugin_dirs
+
+TRASH_DIR_NAME = ".CleanTrash"
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+_FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+
+
+@dataclass
+class CleanPreset:
+    description: str
+    # Project-relative folders, also cleaned inside every plugin (Plugins/**/<Plugin>/<folder>)
+    folders: Tuple[str, ...] = ()
+    # Everything `git clean -fdx` would remove, except the project-relative paths in keep
+    untracked: bool = False
+    keep: Tuple[str, ...] = ()
+
+
+PRESETS: Dict[str, CleanPreset] = {
+    "binaries": CleanPreset("Binaries/ of the project and its plugins", folders=("Binaries",)),
+    "intermediate": CleanPreset("Intermediate/ of the project and its plugins", folders=("Intermediate",)),
+    "build": CleanPreset("Binaries/ and Intermediate/ of the project and its plugins", folders=("Binaries", "Intermediate")),
+    "all-except-ddc": CleanPreset(
+        "Everything untracked by git, except DerivedDataCache/ and the automation state in Saved/Automation/",
+        untracked=True,
+        keep=("DerivedDataCache", "Saved/Automation"),
+    ),
+    "all": CleanPreset("Everything untracked by git, like `git clean -fdx`", untracked=True),
+}
+
+
+@dataclass
+class TargetSize:
+    path: Path
+    bytes: int = 0
+    files: int = 0
+
+
+@dataclass
+class CleanReport:
+    removed: List[Path] = field(default_factory=list)
+    failed: List[Tuple[Path, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def _is_link(entry: os.DirEntry) -> bool:
+    if entry.is_symlink():
+        return True
+    # Junctions aren't symlinks to Python before 3.12; they are reparse points and must not be entered
+    attributes = getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+    return bool(attributes & _FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def _is_junction(path: str) -> bool:
+    try:
+        attributes = getattr(os.lstat(path), "st_file_attributes", 0)
+    except OSError:
+        return False
+    return bool(attributes & _FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def _unquote_git_path(value: str) -> str:
+    # git quotes paths with special characters C-style: "q\"uote"
+    if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
+        return codecs.escape_decode(value[1:-1].encode("utf-8"))[0].decode("utf-8")
+    return value
+
+
+def list_untracked(project_root: Path, keep: Tuple[str, ...] = ()) -> List[str]:
+    """Project-relative paths `git clean -fdx` would remove (nested repos are skipped, like git does)."""
+    command = ["git", "-c", "core.quotepath=off", "clean", "-ndx"]
+    for rel in keep + (TRASH_DIR_NAME,):
+        command += ["-e", "/" + rel.strip("/")]
+    try:
+        result = subprocess.run(command, cwd=project_root, capture_output=True, text=True, encoding="utf-8")
+    except FileNotFoundError:
+        raise RuntimeError("git not found on PATH; it is needed to find untracked files")
+    if result.returncode != 0:
+        raise RuntimeError(f"git clean -ndx failed in {project_root}: {result.stderr.strip()}")
+    prefix = "Would remove "
+    return [_unquote_git_path(line[len(prefix):]).rstrip("/") for line in result.stdout.splitlines() if line.startswith(prefix)]
+
+
+def resolve_targets(project_root: Path, preset: CleanPreset) -> List[Path]:
+    """The existing top-level paths the preset removes, in path order."""
+    project_root = Path(project_root)
+    rels: List[str] = []
+    for folder in preset.folders:
+        rels += [folder] + _find_plugin_dirs(project_root, folder)
+    if preset.untracked:
+        rels += list_untracked(project_root, preset.keep)
+    targets = {project_root / rel for rel in rels if os.path.lexists(project_root / rel)}
+    # A target inside another target is removed with it
+    return sorted(path for path in targets if not any(parent in targets for parent in path.parents))
+
+
+def _split(path: Path) -> Tuple[List[os.DirEntry], List[os.DirEntry]]:
+    """(entries to hand to workers, plain files) directly below path."""
+    folders, files = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and not _is_link(entry):
+                folders.append(entry)
+            else:
+                files.append(entry)
+    return folders, files
+
+
+def _measure_tree(path: str) -> Tuple[int, int]:
+    total_bytes = total_files = 0
+    stack = [path]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False) and not _is_link(entry):
+                            stack.append(entry.path)
+                        else:
+                            total_bytes += entry.stat(follow_symlinks=False).st_size
+                            total_files += 1
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+    return total_bytes, total_files
+
+
+def measure(targets: List[Path], max_workers: int = DEFAULT_MAX_WORKERS) -> List[TargetSize]:
+    """Bytes and file count below every target. The sub folders of all targets are walked in parallel."""
+    sizes = [TargetSize(path=Path(target)) for target in targets]
+    jobs: List[Tuple[TargetSize, str]] = []
+    for size in sizes:
+        try:
+            if not size.path.is_dir() or size.path.is_symlink():
+                size.bytes, size.files = os.lstat(size.path).st_size, 1
+                continue
+            folders, files = _split(size.path)
+        except OSError:
+            continue
+        for entry in files:
+            try:
+                size.bytes += entry.stat(follow_symlinks=False).st_size
+                size.files += 1
+            except OSError:
+                pass
+        jobs += [(size, entry.path) for entry in folders]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for (size, _), (num_bytes, num_files) in zip(jobs, pool.map(lambda job: _measure_tree(job[1]), jobs)):
+            size.bytes += num_bytes
+            size.files += num_files
+    return sizes
+
+
+def _on_rm_error(func, path, exc_info) -> None:
+    # Read-only files (e.g. from Perforce or pulled plugin binaries) can't be deleted on Windows until writable
+    if isinstance(exc_info[1], FileNotFoundError):
+        return
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+
+def _remove(path: str) -> Optional[str]:
+    """Removes a file, link or folder. Returns an error message, or None on success."""
+    try:
+        if os.path.isdir(path) and not os.path.islink(path) and not _is_junction(path):
+            shutil.rmtree(path, onerror=_on_rm_error)
+        else:
+            try:
+                os.unlink(path)
+            except (IsADirectoryError, PermissionError):
+                # Directory symlinks and junctions on Windows are removed like empty folders;
+                # read-only files need to be made writable first
+                if os.path.isdir(path):
+                    os.rmdir(path)
+                else:
+                    os.chmod(path, stat.S_IWRITE)
+                    os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return str(e)
+    return None
+
+
+def delete_paths(targets: List[Path], max_workers: int = DEFAULT_MAX_WORKERS) -> CleanReport:
+    """Deletes the targets, with the entries just below every target folder removed in parallel."""
+    start = time.perf_counter()
+    report = CleanReport()
+    items: List[str] = []
+    folders: List[Path] = []
+    for target in targets:
+        target = Path(target)
+        if target.is_dir() and not target.is_symlink() and not _is_junction(str(target)):
+            try:
+                sub_folders, files = _split(target)
+            except OSError as e:
+                report.failed.append((target, str(e)))
+                continue
+            items += [entry.path for entry in sub_folders + files]
+            folders.append(target)
+        else:
+            items.append(str(target))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for item, error in zip(items, pool.map(_remove, items)):
+            if error:
+                report.failed.append((Path(item), error))
+
+    failed_targets = {target for target in targets for path, _ in report.failed if path == target or target in path.parents}
+    for target in targets:
+        target = Path(target)
+        if target in failed_targets:
+            continue
+        if target in folders:
+            error = _remove(str(target))
+            if error:
+                report.failed.append((target, error))
+                continue
+        report.removed.append(target)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def get_trash_dir(project_root: Path) -> Path:
+    return Path(project_root) / TRASH_DIR_NAME
+
+
+def move_to_trash(project_root: Path, targets: List[Path]) -> Tuple[CleanReport, List[Path]]:
+    """
+    Renames the targets into a new folder below <Project>/.CleanTrash. Returns the report and the targets that
+    couldn't be moved (e.g. a file inside is open); the caller deletes those in place.
+    """
+    start = time.perf_counter()
+    report = CleanReport()
+    batch_dir = get_trash_dir(project_root) / time.strftime("%Y%m%d-%H%M%S")
+    suffix = 1
+    while batch_dir.exists():
+        batch_dir = batch_dir.with_name(f"{batch_dir.name.split('_')[0]}_{suffix}")
+        suffix += 1
+    batch_dir.mkdir(parents=True)
+
+    not_moved: List[Path] = []
+    for index, target in enumerate(targets):
+        try:
+            os.replace(target, batch_dir / f"{index:04d}_{Path(target).name}")
+            report.removed.append(Path(target))
+        except OSError:
+            not_moved.append(Path(target))
+    report.seconds = time.perf_counter() - start
+    return report, not_moved
+
+
+def empty_trash(project_root: Path, max_workers: int = DEFAULT_MAX_WORKERS) -> CleanReport:
+    trash_dir = get_trash_dir(project_root)
+    if not trash_dir.is_dir():
+        return CleanReport()
+    batches = sorted(p for p in trash_dir.iterdir())
+    report = delete_paths(batches, max_workers=max_workers)
+    if not report.failed:
+        try:
+            trash_dir.rmdir()
+        except OSError:
+            # A new batch was moved in meanwhile; the process that moved it empties the trash again
+            pass
+    return report
+
+
+def start_trash_emptier(script_path: Path, project_root: Path) -> None:
+    """Deletes the trash in a detached process that keeps running after this one (and its console) is gone."""
+    kwargs = {}
+    if sys.platform.startswith("win"):
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(
+        [sys.executable, str(script_path), "--empty-trash", "--project-root", str(project_root)],
+        cwd=str(project_root),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        **kwargs,
+    )
@@ -0,0 +1,264 @@
+# Crash-safe "edit project files for the duration of a build" helper.
+#
+#   with WorkspaceJournal(project_root, "package_content_only_android") as journal:
+#       journal.protect(target_path)
+#       ...edit target_path, run the build...
+#   # target_path is back to its original content here
+#
+# protect() snapshots a file (reflink/kernel copy via fast_copy, never read into memory) into
+# <Project>/Saved/Automation/Journal/<name>/ and records it in journal.json before the caller touches it.
+# The files are restored when the block exits, on Ctrl+C/SIGTERM, and when the console window is closed.
+# If the process dies anyway (killed, power loss), the journal stays behind and the next WorkspaceJournal
+# (or recover_interrupted_journals()) rolls the files back before anything else is edited.
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import shutil
+import signal
+import socket
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .automation_common import get_automation_state_dir
+from .fast_copy import copy_file
+
+JOURNAL_DIR_NAME = "Journal"
+JOURNAL_FILE_NAME = "journal.json"
+JOURNAL_VERSION = 1
+
+
+@dataclass
+class JournalEntry:
+    path: str
+    # File name of the snapshot inside the journal folder, None if the file didn't exist (restore deletes it)
+    snapshot: Optional[str]
+
+
+def _is_process_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if sys.platform.startswith("win"):
+        import ctypes
+
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))) and exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _restore_entries(journal_dir: Path, entries: List[JournalEntry]) -> List[str]:
+    """Puts every file back in reverse order. Returns error messages (empty if all files were restored)."""
+    errors = []
+    for entry in reversed(entries):
+        path = Path(entry.path)
+        try:
+            if entry.snapshot is None:
+                if path.exists():
+                    path.unlink()
+            else:
+                # Copy next to the file and swap it in, so an interrupted restore never leaves a half-written file
+                tmp_path = path.with_name(path.name + ".journal.tmp")
+                copy_file(journal_dir / entry.snapshot, tmp_path)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            errors.append(f"{path}: {e}")
+    return errors
+
+
+def _load_journal(journal_dir: Path) -> Optional[dict]:
+    try:
+        with open(journal_dir / JOURNAL_FILE_NAME, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if data.get("version") == JOURNAL_VERSION else None
+
+
+def get_journal_root(project_root: Path) -> Path:
+    return get_automation_state_dir(project_root) / JOURNAL_DIR_NAME
+
+
+def recover_interrupted_journals(project_root: Path) -> int:
+    """Rolls back journals left behind by processes that are gone. Returns the number of journals rolled back."""
+    journal_root = get_journal_root(project_root)
+    if not journal_root.is_dir():
+        return 0
+
+    recovered = 0
+    for journal_dir in sorted(p for p in journal_root.iterdir() if p.is_dir()):
+        data = _load_journal(journal_dir)
+        if data is None:
+            # Died before the first entry was recorded: nothing was edited yet
+            shutil.rmtree(journal_dir, ignore_errors=True)
+            continue
+        if data.get("host") == socket.gethostname() and _is_process_alive(data.get("pid", 0)):
+            continue
+
+        entries = [JournalEntry(**entry) for entry in data.get("entries", [])]
+        print(f"[Journal] Rolling back {len(entries)} file(s) edited by an interrupted '{journal_dir.name}' run "
+              f"(pid {data.get('pid')}, started {time.strftime('%Y-%m-%d %H:%M', time.localtime(data.get('started', 0)))})")
+        errors = _restore_entries(journal_dir, entries)
+        if errors:
+            raise RuntimeError("Failed to roll back interrupted journal:\n" + "\n".join(errors))
+        shutil.rmtree(journal_dir, ignore_errors=True)
+        recovered += 1
+    return recovered
+
+
+# ---------------------------
+# Restoring on signals / console close
+# ---------------------------
+
+_active_journals: List["WorkspaceJournal"] = []
+_previous_handlers: Dict[int, object] = {}
+_handlers_installed = False
+_console_handler = None
+
+
+def _restore_active_journals() -> None:
+    for journal in list(reversed(_active_journals)):
+        journal.restore()
+
+
+def _on_signal(signum, frame) -> None:
+    _restore_active_journals()
+    previous = _previous_handlers.get(signum)
+    if callable(previous):
+        previous(signum, frame)
+    elif signum == signal.SIGINT:
+        raise KeyboardInterrupt
+    else:
+        sys.exit(128 + signum)
+
+
+def _install_handlers() -> None:
+    global _handlers_installed, _console_handler
+    if _handlers_installed:
+        return
+    _handlers_installed = True
+    atexit.register(_restore_active_journals)
+
+    # Python signal handlers can only be set from the main thread; the atexit/with-block paths still apply elsewhere
+    if threading.current_thread() is threading.main_thread():
+        for name in ("SIGINT", "SIGTERM", "SIGBREAK", "SIGHUP"):
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                _previous_handlers[signum] = signal.signal(signum, _on_signal)
+
+    if sys.platform.startswith("win"):
+        import ctypes
+        from ctypes import wintypes
+
+        CTRL_CLOSE_EVENT, CTRL_LOGOFF_EVENT, CTRL_SHUTDOWN_EVENT = 2, 5, 6
+        HandlerRoutine = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.DWORD)
+
+        # Closing the console window kills the process a few seconds after this returns, without running atexit
+        def console_handler(event: int) -> bool:
+            if event in (CTRL_CLOSE_EVENT, CTRL_LOGOFF_EVENT, CTRL_SHUTDOWN_EVENT):
+                _restore_active_journals()
+            return False
+
+        _console_handler = HandlerRoutine(console_handler)
+        ctypes.windll.kernel32.SetConsoleCtrlHandler(_console_handler, True)
+
+
+class WorkspaceJournal:
+    def __init__(self, project_root: Path, name: str):
+        self.project_root = Path(project_root)
+        self.name = name
+        self.journal_dir = get_journal_root(self.project_root) / name
+        self.entries: List[JournalEntry] = []
+        # Reentrant: a signal handler may restore while the main thread is inside protect()
+        self._lock = threading.RLock()
+        self._started = time.time()
+        self._active = False
+
+    def __enter__(self) -> "WorkspaceJournal":
+        recover_interrupted_journals(self.project_root)
+        if self.journal_dir.exists():
+            raise RuntimeError(f"Another '{self.name}' run is still in progress (journal at {self.journal_dir})")
+        self.journal_dir.mkdir(parents=True)
+        _install_handlers()
+        with self._lock:
+            self._active = True
+            _active_journals.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        errors = self.restore()
+        if errors and exc_type is None:
+            raise RuntimeError("Failed to restore edited files:\n" + "\n".join(errors))
+
+    def _save(self) -> None:
+        _write_json_atomic(self.journal_dir / JOURNAL_FILE_NAME, {
+            "version": JOURNAL_VERSION,
+            "name": self.name,
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "started": self._started,
+            "entries": [asdict(entry) for entry in self.entries],
+        })
+
+    def protect(self, path: Path) -> None:
+        """Snapshots the file (or records that it doesn't exist) so it is put back when the journal ends."""
+        path = Path(path).resolve()
+        with self._lock:
+            if not self._active:
+                raise RuntimeError("WorkspaceJournal.protect() called outside of its with-block")
+            if any(entry.path == str(path) for entry in self.entries):
+                return
+            snapshot = None
+            if path.exists():
+                snapshot = f"{len(self.entries):04d}_{path.name}"
+                copy_file(path, self.journal_dir / snapshot)
+            # The snapshot exists before it is recorded; the file is only edited after the record is on disk
+            self.entries.append(JournalEntry(path=str(path), snapshot=snapshot))
+            self._save()
+            print(f"[Journal] Protected {path}")
+
+    def restore(self) -> List[str]:
+        """Restores all protected files and removes the journal. Safe to call more than once."""
+        with self._lock:
+            if not self._active:
+                return []
+            self._active = False
+            if self in _active_journals:
+                _active_journals.remove(self)
+            errors = _restore_entries(self.journal_dir, self.entries)
+            if errors:
+                # Keep the journal so the next run retries the rollback
+                print("[Journal] Failed to restore:\n  " + "\n  ".join(errors))
+                return errors
+            for entry in self.entries:
+                print(f"[Journal] Restored {entry.path}")
+            shutil.rmtree(self.journal_dir, ignore_errors=True)
+            return []
@@ -0,0 +1,134 @@
+# Manages the DerivedDataCache (DDC) configured in the [DDC] section of project.config.
+# Usage:
+#   python manage_ddc.py stats [--shared]                              size, file count and last-use histogram
+#   python manage_ddc.py prune [--shared] [--max-size-gb N] [--dry-run] delete least recently used files down to the budget
+#   python manage_ddc.py warm [--maps A,B] [--platforms P1,P2]          fill the caches with a headless editor run
+#   python manage_ddc.py args                                         print the overrides launches and packaging use
+#
+# RunEditor.py and package.py pick up the shared/local paths themselves; see common/ddc.py.
+
+import argparse
+import sys
+import time
+
+from common.automation_common import get_automation_state_dir, get_project_context
+from common.ddc import (
+    DEFAULT_MAX_WORKERS,
+    apply_ddc_environment,
+    build_warm_command,
+    compute_stats,
+    ddc_command_line_args,
+    ddc_environment,
+    load_ddc_settings,
+    prune_cache,
+    scan_cache,
+)
+from common.delta_sync import format_bytes
+from common.uat_log_parser import run_uat_command
+
+def get_settings():
+    context = get_project_context()
+    return load_ddc_settings(context.project_config, context.project_root)
+
+def get_cache(settings, shared: bool):
+    """(root, budget in GB) of the local or the shared cache."""
+    if not shared:
+        return settings.local_path, settings.local_max_size_gb
+    if settings.shared_path is None:
+        raise RuntimeError("No SharedPath in the [DDC] section of project.config")
+    return settings.shared_path, settings.shared_max_size_gb
+
+def command_stats(args) -> int:
+    settings = get_settings()
+    root, max_size_gb = get_cache(settings, args.shared)
+    if not root.is_dir():
+        raise RuntimeError(f"DDC folder not found: {root}")
+    start = time.perf_counter()
+    files = scan_cache(root, max_workers=args.jobs)
+    print(compute_stats(root, files).format(max_size_gb))
+    print(f"Scanned in {time.perf_counter() - start:.2f}s")
+    return 0
+
+def command_prune(args) -> int:
+    settings = get_settings()
+    root, max_size_gb = get_cache(settings, args.shared)
+    if args.max_size_gb is not None:
+        max_size_gb = args.max_size_gb
+    if max_size_gb <= 0:
+        raise RuntimeError(f"No size budget for {root}: set {'Shared' if args.shared else 'Local'}MaxSizeGB in [DDC] or pass --max-size-gb")
+    if not root.is_dir():
+        raise RuntimeError(f"DDC folder not found: {root}")
+
+    print(f"Pruning {root} to {max_size_gb:g} GB{' (dry run)' if args.dry_run else ''}")
+    report = prune_cache(root, max_size_gb, dry_run=args.dry_run, max_workers=args.jobs)
+    for path, error in report.failed[:10]:
+        print(f"[ERROR] {path}: {error}")
+    print(report.summary().replace("pruned", "would be pruned") if args.dry_run else report.summary())
+    return 1 if report.failed else 0
+
+def command_warm(args) -> int:
+    context = get_project_context()
+    settings = load_ddc_settings(context.project_config, context.project_root)
+    editor_cmd = context.ue_root / "Engine" / "Binaries" / "Win64" / "UnrealEditor-Cmd.exe"
+    if not editor_cmd.exists():
+        raise RuntimeError(f"UnrealEditor-Cmd.exe not found at {editor_cmd}")
+
+    maps = [m.strip() for m in args.maps.split(",") if m.strip()] if args.maps is not None else None
+    platforms = [p.strip() for p in args.platforms.split(",") if p.strip()] if args.platforms is not None else None
+    command = build_warm_command(editor_cmd, context.uproject, settings, maps, platforms)
+
+    apply_ddc_environment(settings)
+    before = scan_cache(settings.local_path, max_workers=args.jobs) if settings.local_path.is_dir() else []
+    print("Warming the DDC:")
+    print(" ".join(command))
+    summary_path = get_automation_state_dir(context.project_root) / "UatLogs" / f"ddc_warm_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    returncode, _ = run_uat_command(command, summary_path=summary_path)
+
+    after = scan_cache(settings.local_path, max_workers=args.jobs) if settings.local_path.is_dir() else []
+    added_bytes = sum(f.size for f in after) - sum(f.size for f in before)
+    print(f"Local DDC: {len(after) - len(before):+d} file(s), {format_bytes(max(added_bytes, 0))} added")
+    if returncode != 0:
+        raise RuntimeError(f"DDC warm failed with exit code {returncode}")
+    return 0
+
+def command_args(args) -> int:
+    settings = get_settings()
+    print("Command line: " + (" ".join(ddc_command_line_args(settings)) or "(none)"))
+    for name, value in ddc_environment(settings).items():
+        print(f"Environment:  {name}={value}")
+    print(f"Local DDC:    {settings.local_path}{'' if settings.local_path_override else ' (engine default)'}")
+    return 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Manage the local and shared DerivedDataCache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    stats_parser = subparsers.add_parser("stats", help="Size, file count and last-use histogram")
+    stats_parser.add_argument("--shared", action="store_true", help="The shared DDC instead of the local one")
+    stats_parser.add_argument("--jobs", type=int, default=DEFAULT_MAX_WORKERS, help="Parallel scan workers")
+    stats_parser.set_defaults(func=command_stats)
+
+    prune_parser = subparsers.add_parser("prune", help="Delete least recently used files down to the size budget")
+    prune_parser.add_argument("--shared", action="store_true", help="The shared DDC instead of the local one")
+    prune_parser.add_argument("--max-size-gb", type=float, default=None, help="Budget (default: [DDC] Local/SharedMaxSizeGB)")
+    prune_parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted")
+    prune_parser.add_argument("--jobs", type=int, default=DEFAULT_MAX_WORKERS, help="Parallel scan/delete workers")
+    prune_parser.set_defaults(func=command_prune)
+
+    warm_parser = subparsers.add_parser("warm", help="Fill the caches by running the DerivedDataCache commandlet")
+    warm_parser.add_argument("--maps", type=str, default=None, help="Comma-separated maps (default: [DDC] WarmMaps, empty = everything)")
+    warm_parser.add_argument("--platforms", type=str, default=None, help="Comma-separated target platforms (default: [DDC] WarmPlatforms)")
+    warm_parser.add_argument("--jobs", type=int, default=DEFAULT_MAX_WORKERS, help="Parallel scan workers")
+    warm_parser.set_defaults(func=command_warm)
+
+    args_parser = subparsers.add_parser("args", help="Print the DDC overrides used by launches and packaging")
+    args_parser.set_defaults(func=command_args)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        sys.exit(args.func(args))
+    except RuntimeError as e:
+        print(f"[DDC] {e}")
+        sys.exit(1)
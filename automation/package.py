@@ -1,11 +1,38 @@
 import os
 import subprocess
+import threading
+import time
 import tkinter as tk
+from collections import deque
 from tkinter import filedialog, messagebox
-from common.automation_common import get_project_root, find_uproject, load_ue_root, bring_console_to_front
-import shutil
+from common.artifact_store import ArtifactStore
+from common.automation_common import get_automation_state_dir, get_project_context
+from common.automation_common import get_total_memory_gb
+from common.build_history import RunRecorder, format_duration
+from common.ddc import apply_ddc_environment, load_ddc_settings
+from common.delta_sync import Manifest, hash_file
+from common.step_scheduler import Step, StepScheduler
+from common.fast_copy import copy_tree
+from common.process_runner import kill_process_tree, start_process
+from common.uat_log_parser import UatLogParser, write_summary
+from utils.materialize_symlinks import materialize_symlinks
+import hashlib
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, List, Optional
+
+# Lines kept in the output view; older lines are dropped
+MAX_OUTPUT_LINES = 5000
+# Port Turnkey's -EditorIO listens on; concurrent matrix jobs each get their own, counting up from here
+DEFAULT_EDITOR_IO_PORT = 55930
+# How long closing the window waits for a cancelled job's worker (e.g. one still installing Pixel Streaming)
+WORKER_EXIT_TIMEOUT = 60.0
+# UAT allows one instance per engine installation, and UBT one build at a time: matrix jobs that overlap wait for the
+# instance before them instead of failing with "A conflicting instance of AutomationTool is already running"
+MATRIX_MUTEX_ARGS = " -WaitForUATMutex -ubtargs=-WaitMutex"
+
+PLATFORMS = ("Win64", "Android", "iOS")
+BUILD_CONFIGS = ("Debug", "Development", "Shipping")
 
 # Global data that's set once and will not change throughout program execution
 @dataclass
@@ -20,24 +47,31 @@ def build_command(
     build_config: str,
     full_rebuild: bool,
     output_dir: str,
-    platform: str
+    platform: str,
+    verify_sdk: bool = True,
+    cook: bool = True,
+    editor_io_port: int = DEFAULT_EDITOR_IO_PORT
 ) -> str:
     unreal_cmd = os.path.join(global_data.engine_root, "Engine", "Binaries", "Win64", "UnrealEditor-Cmd.exe")
     uproject_file = os.path.join(global_data.project_root, global_data.project_name + ".uproject")
 
-    args = [
+    turnkey_args = [
         f"-ScriptsForProject=\"{uproject_file}\"",
         "Turnkey",
         "-command=VerifySdk",
         f"-platform={platform}",
         "-UpdateIfNeeded",
         "-EditorIO",
-        "-EditorIOPort=55930",
+        f"-EditorIOPort={editor_io_port}",
         f"-project=\"{uproject_file}\"",
+    ]
+
+    args = (turnkey_args if verify_sdk else []) + [
         "BuildCookRun",
         "-nop4",
         "-utf8output",
-        "-cook",
+        # Without cooking, the content cooked earlier for this platform (Saved/Cooked/<Platform>) is staged
+        "-cook" if cook else "-skipcook",
         f"-project=\"{uproject_file}\"",
         f"-target={os.path.splitext(global_data.project_name)[0]}",
         f"-unrealexe=\"{unreal_cmd}\"",
@@ -56,55 +90,257 @@ def build_command(
     ]
 
     if full_rebuild:
-        args.extend(["-clean", "-forcecook"])
+        args.append("-clean")
+        if cook:
+            args.append("-forcecook")
 
     return " ".join(args)
 
-def move_packaging_includes(global_data: GlobalData, output_dir: str):
+##
+#  Copies Script/PackagingIncludes into the packaged build. Returns False if anything could not be copied.
+##
+def move_packaging_includes(global_data: GlobalData, output_dir: str, output: Callable[[str], None] = print) -> bool:
     source_dir = Path(os.path.join(global_data.project_root, "Script", "PackagingIncludes"))
     output_dir = Path(output_dir)
     
     if not os.path.exists(source_dir):
-        print(f"[Packaging] No PackagingIncludes found at {source_dir}, skipping.")
-        return
+        output(f"[Packaging] No PackagingIncludes found at {source_dir}, skipping.")
+        return True
 
-    for item in source_dir.iterdir():
-        dest_item = output_dir / item.name
-        try:
-            if item.is_dir():
-                for sub_item in item.rglob("*"):
-                    rel_path = sub_item.relative_to(item)
-                    target_path = dest_item / rel_path
-                    if sub_item.is_dir():
-                        target_path.mkdir(parents=True, exist_ok=True)
-                    else:
-                        target_path.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(sub_item, target_path)
-            else:
-                dest_item.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(item, dest_item)
-        except Exception as e:
-            print(f"Failed to copy {item} to {dest_item}: {e}")
+    try:
+        stats = copy_tree(source_dir, output_dir)
+    except OSError as e:
+        output(f"[Packaging] Failed to copy PackagingIncludes to {output_dir}: {e}")
+        return False
+    for failed_item, error in stats.failed:
+        output(f"Failed to copy {failed_item} to {output_dir}: {error}")
+    output(f"[Packaging] Copied PackagingIncludes: {stats.summary()}")
+    return not stats.failed
 
 
-def run_packaging(cmd_args: str, global_data: GlobalData, output_dir: str) -> bool :
-    try:
-        bring_console_to_front()
+class PackagingCancelled(Exception):
+    pass
 
-        full_command = '"' + global_data.runuat_path + '" ' + cmd_args + ' -nocompile -nocompileuat'
+##
+#  Runs BuildCookRun, streaming its output line by line. Setting cancel_event kills the whole UAT process tree.
+##
+def run_packaging(
+    cmd_args: str,
+    global_data: GlobalData,
+    output_dir: str,
+    output: Callable[[str], None] = print,
+    on_phase: Callable[[str], None] = lambda phase: None,
+    cancel_event: Optional[threading.Event] = None,
+    run: Optional[RunRecorder] = None,
+    register_kill: Callable[[Callable[[], None]], None] = lambda kill: None,
+) -> bool :
+    full_command = '"' + global_data.runuat_path + '" ' + cmd_args + ' -nocompile -nocompileuat'
 
-        print("command\n")
-        print(full_command)
+    output("command\n")
+    output(full_command)
 
-        subprocess.run(full_command, shell=True, check=True)
+    process = start_process(full_command, shell=True)
+    # Lets the caller kill UAT synchronously, e.g. before the process exits and takes the watcher thread with it
+    register_kill(lambda: kill_process_tree(process))
+    if cancel_event is not None:
+        # Kills UAT (and the UBT/editor processes it spawned) as soon as cancel is requested
+        def watch_cancel():
+            while process.poll() is None:
+                if cancel_event.wait(0.5):
+                    kill_process_tree(process)
+                    return
+        threading.Thread(target=watch_cancel, daemon=True).start()
 
-        move_packaging_includes(global_data, output_dir)
-        
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Packaging failed.\n\n{e}")
-    return False
+    parser = UatLogParser(on_phase=on_phase)
+    for line in process.stdout:
+        line = line.rstrip()
+        parser.feed(line)
+        output(line)
+    returncode = process.wait()
+
+    summary = parser.finish(returncode)
+    output(summary.format())
+    summary_path = get_automation_state_dir(Path(global_data.project_root)) / "UatLogs" / f"package_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_summary(summary, summary_path)
+    output(f"Phase summary written to {summary_path}")
+    if run is not None:
+        run.add_phase_steps(summary)
+        run.exit_code = returncode
+
+    if cancel_event is not None and cancel_event.is_set():
+        raise PackagingCancelled()
+    if returncode != 0:
+        output(f"Packaging failed.\n\nCommand returned non-zero exit status {returncode}.")
+        return False
+
+    return move_packaging_includes(global_data, output_dir, output)
     
+# ---------------------------
+# Matrix packaging
+# ---------------------------
+
+@dataclass
+class MatrixJob:
+    platform: str
+    build_config: str
+    output_dir: str
+    # Only the first job of a platform cooks (and verifies the SDK); later ones reuse its cooked content
+    cook: bool
+
+    @property
+    def name(self) -> str:
+        return f"{self.platform}_{self.build_config}"
+
+@dataclass
+class MatrixBudget:
+    max_jobs: int
+    cpu: float
+    memory_gb: float
+    job_cpu: float
+    job_memory_gb: float
+
+def load_matrix_budget(project_config) -> MatrixBudget:
+    def get_float(key: str, default: float) -> float:
+        value = project_config.get("Packaging", key, fallback="").strip()
+        return float(value) if value else default
+
+    return MatrixBudget(
+        max_jobs=int(get_float("MatrixMaxParallelJobs", 2)),
+        cpu=get_float("MatrixCpuBudget", float(os.cpu_count() or 1)),
+        memory_gb=get_float("MatrixMemoryBudgetGB", get_total_memory_gb()),
+        job_cpu=get_float("MatrixJobCpu", 8),
+        job_memory_gb=get_float("MatrixJobMemoryGB", 24),
+    )
+
+def plan_matrix(platforms: List[str], build_configs: List[str], output_dir: str) -> List[MatrixJob]:
+    jobs = []
+    for platform in platforms:
+        for index, build_config in enumerate(build_configs):
+            jobs.append(MatrixJob(
+                platform=platform,
+                build_config=build_config,
+                output_dir=os.path.join(output_dir, f"{platform}_{build_config}"),
+                cook=index == 0,
+            ))
+    return jobs
+
+def _move_packaging_includes_step(global_data: GlobalData, job: MatrixJob, output: Callable[[str], None]) -> None:
+    # Raising fails the job (the scheduler reports it like a failed BuildCookRun)
+    if not move_packaging_includes(global_data, job.output_dir, output):
+        raise RuntimeError(f"Copying PackagingIncludes to {job.output_dir} failed")
+
+def create_matrix_steps(global_data: GlobalData, jobs: List[MatrixJob], full_rebuild: bool, budget: MatrixBudget,
+                        output: Callable[[str], None] = print) -> List[Step]:
+    steps = []
+    previous_by_platform = {}
+    for index, job in enumerate(jobs):
+        args = build_command(
+            global_data=global_data,
+            build_config=job.build_config,
+            full_rebuild=full_rebuild,
+            output_dir=job.output_dir,
+            platform=job.platform,
+            verify_sdk=job.cook,
+            cook=job.cook,
+            editor_io_port=DEFAULT_EDITOR_IO_PORT + index,
+        )
+        # Jobs of the same platform share cooked content and Saved/StagedBuilds/<Platform>, so they run in order;
+        # different platforms only wait for the budget
+        previous = previous_by_platform.get(job.platform)
+        steps.append(Step(
+            name=job.name,
+            command='"' + global_data.runuat_path + '" ' + args + ' -nocompile -nocompileuat' + MATRIX_MUTEX_ARGS,
+            depends_on=[previous] if previous else [],
+            resources={"cpu": budget.job_cpu, "memory_gb": budget.job_memory_gb},
+            on_success=lambda step, job=job: _move_packaging_includes_step(global_data, job, output),
+        ))
+        previous_by_platform[job.platform] = job.name
+    return steps
+
+def run_matrix(
+    global_data: GlobalData,
+    jobs: List[MatrixJob],
+    full_rebuild: bool,
+    budget: MatrixBudget,
+    output: Callable[[str], None] = print,
+    cancel_event: Optional[threading.Event] = None,
+    run: Optional[RunRecorder] = None,
+    register_kill: Callable[[Callable[[], None]], None] = lambda kill: None,
+) -> None:
+    steps = create_matrix_steps(global_data, jobs, full_rebuild, budget, output)
+    scheduler = StepScheduler(
+        steps,
+        max_jobs=budget.max_jobs,
+        output=output,
+        budget={"cpu": budget.cpu, "memory_gb": budget.memory_gb},
+    )
+    register_kill(scheduler.cancel)
+    output(f"Packaging matrix: {len(jobs)} job(s), up to {budget.max_jobs} at a time "
+           f"(budget {budget.cpu:.0f} cores / {budget.memory_gb:.0f} GB, {budget.job_cpu:.0f} cores / {budget.job_memory_gb:.0f} GB per job)")
+    for job in jobs:
+        output(f"  {job.name} -> {job.output_dir}{'' if job.cook else ' (reuses cooked content)'}")
+
+    finished = threading.Event()
+    if cancel_event is not None:
+        # Ends with the run, so no thread is left waiting on a cancel that never comes
+        def watch_cancel():
+            while not finished.is_set():
+                if cancel_event.wait(0.5):
+                    scheduler.cancel()
+                    return
+        threading.Thread(target=watch_cancel, daemon=True).start()
+
+    try:
+        scheduler.run()
+    except RuntimeError:
+        if cancel_event is not None and cancel_event.is_set():
+            raise PackagingCancelled()
+        raise
+    finally:
+        finished.set()
+        if run is not None:
+            for step in steps:
+                run.add_step(step.name, step.duration)
+
+# ---------------------------
+# Pixel Streaming web-server cache
+# ---------------------------
+
+# Build outputs inside WebServers; everything else (after get_ps_servers.bat: lockfiles, NODE_VERSION, sources) is a cache input
+PIXELSTREAMING_OUTPUT_DIRS = {"node_modules", "dist", "www", "node"}
+# Bump to invalidate all cached web-server builds when the way they are built changes
+PIXELSTREAMING_CACHE_VERSION = "1"
+
+##
+#  The store for fully built WebServers trees, or None if disabled in [Packaging] of project.config
+##
+def create_pixelstreaming_cache(global_data: GlobalData) -> Optional[ArtifactStore]:
+    project_config = get_project_context().project_config
+    if not project_config.getboolean("Packaging", "PixelStreamingCache", fallback=True):
+        return None
+    directory = project_config.get("Packaging", "PixelStreamingCacheDirectory", fallback="").strip()
+    max_size_gb = project_config.getfloat("Packaging", "PixelStreamingCacheMaxSizeGB", fallback=10.0)
+    store_dir = Path(directory) if directory else get_automation_state_dir(Path(global_data.project_root)) / "PixelStreamingCache"
+    return ArtifactStore(store_dir, int(max_size_gb * 1024 ** 3))
+
+def pixelstreaming_cache_key(webservers_dir: str, ps_setup_script: str) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(PIXELSTREAMING_CACHE_VERSION.encode("utf-8"))
+    digest.update(hash_file(Path(ps_setup_script)).encode("utf-8"))
+    for dir_path, dir_names, file_names in os.walk(webservers_dir):
+        dir_names[:] = sorted(d for d in dir_names if d not in PIXELSTREAMING_OUTPUT_DIRS)
+        for file_name in sorted(file_names):
+            path = os.path.join(dir_path, file_name)
+            rel = os.path.relpath(path, webservers_dir).replace("\\", "/")
+            digest.update(f"{rel}\0{hash_file(Path(path))}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def _scan_webservers(global_data: GlobalData, webservers_dir: str) -> Manifest:
+    # Only used for this one restore/store, never saved: the output folder is new for every packaging run
+    manifest = Manifest(Path(webservers_dir), get_automation_state_dir(Path(global_data.project_root)) / "pixelstreaming_manifest.json")
+    manifest.scan(os.listdir(webservers_dir))
+    return manifest
+
 def preinstall_pixelstreaming(global_data: GlobalData, output_dir: str, ):
     print("Pre-installing pixel streaming web-servers")
     project_root = os.path.join(output_dir, "Windows", global_data.project_name)
@@ -112,20 +348,35 @@ def preinstall_pixelstreaming(global_data: GlobalData, output_dir: str, ):
     get_ps_servers = os.path.join(webservers_dir, "get_ps_servers.bat")
     ps_setup_script = os.path.join(os.path.dirname(__file__), "utils", "prebuild_ue_ps_servers.bat")
     ps_ue_scripts_location = os.path.join(output_dir, "Windows", global_data.project_name, "Samples", "PixelStreaming", "WebServers", "SignallingWebServer", "platform_scripts", "cmd")
-    symbolic_links_script = os.path.join(os.path.dirname(__file__), "utils", "MaterializeSymbolicLinks.ps1")
     
     if not os.path.exists(get_ps_servers):
         print("No pixel streaming content detected, skipping.")
         return
-  
+
+    # The fetch only downloads the release sources; the key hashes the fetched tree (lockfiles, NODE_VERSION, sources),
+    # so a different release is a miss instead of restoring a build of the old one
     print("Fetching Pixel Streaming web-servers...")
     try:
         # .bat needs shell=True on Windows
         subprocess.run(get_ps_servers, shell=True, check=True)
     except subprocess.CalledProcessError as e:
         raise RuntimeError(f"get_ps_servers.bat failed with exit code {e.returncode}") from e
-    
-    
+
+    # Same inputs as an earlier build: restore the built tree instead of running npm again
+    store = create_pixelstreaming_cache(global_data)
+    cache_key = None
+    if store is not None:
+        cache_key = pixelstreaming_cache_key(webservers_dir, ps_setup_script)
+        entry = store.lookup(cache_key)
+        if entry is not None:
+            start = time.perf_counter()
+            copied, deleted = store.restore(entry, _scan_webservers(global_data, webservers_dir))
+            print(f"Restored cached Pixel Streaming web-servers ({cache_key[:12]}): {copied} file(s) copied, "
+                  f"{deleted} deleted in {time.perf_counter() - start:.1f}s")
+            print(f"[PixelStreamingCache] {store.format_stats()}")
+            return
+        print(f"Pixel Streaming web-server cache miss ({cache_key[:12]}), building")
+
     try:
         print("Installing workspace dependencies (npm ci --workspaces)...")
         subprocess.run(["npm.cmd", "ci", "--workspaces"], cwd=webservers_dir, check=True)
@@ -141,44 +392,35 @@ def preinstall_pixelstreaming(global_data: GlobalData, output_dir: str, ):
     
     
     print("Materializing symlinks/junctions for portability...")
-    # Prefer Windows PowerShell; if missing, try PowerShell 7 (pwsh)
-    try:
-        subprocess.run(
-            ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass",
-             "-File", symbolic_links_script, "-StartPath", webservers_dir],
-            check=True
-        )
-    except FileNotFoundError:
-        # Retry with pwsh
+    report = materialize_symlinks(Path(webservers_dir), verbose=False)
+    if report.failed:
+        raise RuntimeError(f"Materializing symlinks failed for {len(report.failed)} file(s)")
+
+    if store is not None:
         try:
-            subprocess.run(
-                ["pwsh", "-NoProfile", "-ExecutionPolicy", "Bypass",
-                 "-File", symbolic_links_script, "-StartPath", webservers_dir],
-                check=True
-            )
-        except FileNotFoundError as e2:
-            raise RuntimeError("Neither 'powershell' nor 'pwsh' found on PATH") from e2
-        except subprocess.CalledProcessError as e2:
-            raise RuntimeError(f"MaterializeSymbolicLinks.ps1 failed (pwsh) with exit code {e2.returncode}") from e2
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"MaterializeSymbolicLinks.ps1 failed with exit code {e.returncode}") from e
-        
-        
+            store.store(cache_key, _scan_webservers(global_data, webservers_dir),
+                        metadata={"webservers_dir": webservers_dir})
+            print(f"[PixelStreamingCache] {store.format_stats()}")
+        except (OSError, RuntimeError) as e:
+            print(f"Warning: failed to store the Pixel Streaming web-servers in the cache: {e}")
 
 def create_ui():
-    engine_root = str(load_ue_root())
-    project_root = get_project_root()
+    context = get_project_context()
+    engine_root = str(context.ue_root)
+    project_root = context.project_root
     
     global_data = GlobalData(
         project_root = project_root,
         engine_root = engine_root,
         runuat_path = str(os.path.join(engine_root, "Engine", "Build", "BatchFiles", "RunUAT.bat")),
-        project_name = os.path.splitext(find_uproject(project_root).name)[0]
+        project_name = context.project_name
     )
+    # UAT and the cook it starts inherit the shared/local DDC paths from [DDC] in project.config
+    apply_ddc_environment(load_ddc_settings(context.project_config, project_root))
 
     root = tk.Tk()
     root.title("Unreal Build Packager")
-    root.geometry("1024x540")
+    root.geometry("1024x900")
 
     cached_command_string = tk.StringVar()
 
@@ -235,28 +477,212 @@ def create_ui():
     # Platform
     tk.Label(root, text="Target Platform:").grid(row=4, column=0, **padding_options)
     platform_var = tk.StringVar(value="Win64")
-    tk.OptionMenu(root, platform_var, "Win64", "Android", "iOS", command=lambda _: update_command_preview())\
+    tk.OptionMenu(root, platform_var, *PLATFORMS, command=lambda _: update_command_preview())\
         .grid(row=CurrentRow, column=1, **padding_options)
     CurrentRow += 1
 
+    # Matrix: every checked platform x config in one run, into <Output>/<Platform>_<Config>
+    tk.Label(root, text="Matrix:").grid(row=CurrentRow, column=0, **padding_options)
+    matrix_frame = tk.Frame(root)
+    matrix_frame.grid(row=CurrentRow, column=1, columnspan=2, **padding_options)
+    matrix_platform_vars = {platform: tk.BooleanVar(value=platform == "Win64") for platform in PLATFORMS}
+    matrix_config_vars = {config: tk.BooleanVar(value=config == "Development") for config in BUILD_CONFIGS}
+    for platform, var in matrix_platform_vars.items():
+        tk.Checkbutton(matrix_frame, text=platform, variable=var).pack(side="left")
+    tk.Label(matrix_frame, text="|").pack(side="left", padx=6)
+    for config, var in matrix_config_vars.items():
+        tk.Checkbutton(matrix_frame, text=config, variable=var).pack(side="left")
+    CurrentRow += 1
+
     # Command Preview
-    tk.Label(root, text="Command Preview:").grid(row=5, column=0, **padding_options)
+    tk.Label(root, text="Command Preview:").grid(row=CurrentRow, column=0, **padding_options)
     command_display = tk.Text(root, width=100, height=10, wrap="word")
     command_display.grid(row=CurrentRow, column=1, columnspan=2, **padding_options)
     CurrentRow += 1
 
+    # Output view: bounded scrollback fed from the worker thread
+    status_frame = tk.Frame(root)
+    status_frame.grid(row=CurrentRow, column=1, columnspan=2, **padding_options)
+    status_var = tk.StringVar(value="Idle")
+    tk.Label(status_frame, textvariable=status_var).pack(side="left")
+    CurrentRow += 1
+
+    output_frame = tk.Frame(root)
+    output_frame.grid(row=CurrentRow, column=0, columnspan=3, padx=10, pady=5, sticky="nsew")
+    root.rowconfigure(CurrentRow, weight=1)
+    root.columnconfigure(1, weight=1)
+    output_view = tk.Text(output_frame, height=20, wrap="none", state="disabled")
+    output_scrollbar = tk.Scrollbar(output_frame, command=output_view.yview)
+    output_view.configure(yscrollcommand=output_scrollbar.set)
+    output_scrollbar.pack(side="right", fill="y")
+    output_view.pack(side="left", fill="both", expand=True)
+    CurrentRow += 1
+
+    # Ring buffer between worker and UI: if the UI falls behind, the oldest lines are dropped
+    pending_lines = deque(maxlen=MAX_OUTPUT_LINES)
+    pending_lock = threading.Lock()
+    # Workers never call into tkinter: they set "result" when done and flush_output() finishes the job on the UI thread
+    job_state = {"running": False, "phase": "", "started": 0.0, "cancel": None, "usual_duration": None,
+                 "result": None, "kill": None, "worker": None}
+
+    def register_kill(kill: Callable[[], None]):
+        job_state["kill"] = kill
+
+    def append_output(line: str):
+        with pending_lock:
+            pending_lines.append(line)
+
+    def set_phase(phase: str):
+        job_state["phase"] = phase
+
+    def flush_output():
+        with pending_lock:
+            lines = list(pending_lines)
+            pending_lines.clear()
+        if lines:
+            at_bottom = output_view.yview()[1] >= 0.999
+            output_view.configure(state="normal")
+            output_view.insert(tk.END, "\n".join(lines) + "\n")
+            line_count = int(output_view.index("end-1c").split(".")[0])
+            if line_count > MAX_OUTPUT_LINES:
+                output_view.delete("1.0", f"{line_count - MAX_OUTPUT_LINES + 1}.0")
+            output_view.configure(state="disabled")
+            if at_bottom:
+                output_view.see(tk.END)
+
+        if job_state["running"] and job_state["result"] is not None:
+            finish_packaging(job_state["result"])
+        if job_state["running"]:
+            elapsed = int(time.time() - job_state["started"])
+            phase = job_state["phase"] or "Starting"
+            status = f"{phase} - {format_duration(elapsed)}"
+            if job_state["usual_duration"] is not None:
+                # Based on the recorded history of this config/platform
+                status += f", ETA {format_duration(max(job_state['usual_duration'] - elapsed, 0))} (usually {format_duration(job_state['usual_duration'])})"
+            status_var.set(status)
+        root.after(100, flush_output)
+
+    def packaging_worker(cmd_args: str, output_dir: str, preinstall: bool, build_config: str, platform: str, cancel_event: threading.Event):
+        result = "Packaging failed"
+        try:
+            with RunRecorder(Path(global_data.project_root), "package", command=cmd_args, config=build_config, platform=platform) as run:
+                job_state["usual_duration"] = run.estimate()[0]
+                if run_packaging(cmd_args, global_data, output_dir, output=append_output, on_phase=set_phase, cancel_event=cancel_event, run=run,
+                                 register_kill=register_kill):
+                    if preinstall and not cancel_event.is_set():
+                        set_phase("Pixel Streaming")
+                        with run.step("Pixel Streaming"):
+                            preinstall_pixelstreaming(global_data, output_dir)
+                    result = "Packaging completed!"
+        except PackagingCancelled:
+            result = "Packaging cancelled"
+        except Exception as e:
+            result = f"Packaging failed: {e}"
+        append_output(result)
+        job_state["result"] = result
+
+    def matrix_worker(jobs: List[MatrixJob], full_rebuild: bool, preinstall: bool, cancel_event: threading.Event):
+        result = "Matrix packaging failed"
+        try:
+            budget = load_matrix_budget(get_project_context().project_config)
+            command = ", ".join(job.name for job in jobs)
+            with RunRecorder(Path(global_data.project_root), "package_matrix", command=command) as run:
+                set_phase(f"Matrix ({len(jobs)} jobs)")
+                run_matrix(global_data, jobs, full_rebuild, budget, output=append_output, cancel_event=cancel_event, run=run,
+                           register_kill=register_kill)
+                if preinstall:
+                    for job in jobs:
+                        if job.platform == "Win64" and not cancel_event.is_set():
+                            set_phase(f"Pixel Streaming ({job.name})")
+                            with run.step(f"Pixel Streaming {job.name}"):
+                                preinstall_pixelstreaming(global_data, job.output_dir)
+                result = "Matrix packaging completed!"
+        except PackagingCancelled:
+            result = "Matrix packaging cancelled"
+        except Exception as e:
+            result = f"Matrix packaging failed: {e}"
+        append_output(result)
+        job_state["result"] = result
+
+    def finish_packaging(result: str):
+        job_state["running"] = False
+        elapsed = int(time.time() - job_state["started"])
+        status_var.set(f"{result} ({format_duration(elapsed)})")
+        package_button.configure(state="normal")
+        matrix_button.configure(state="normal")
+        cancel_button.configure(state="disabled")
+
+    def start_job() -> threading.Event:
+        cancel_event = threading.Event()
+        job_state.update(running=True, phase="", started=time.time(), cancel=cancel_event, usual_duration=None,
+                         result=None, kill=None)
+        package_button.configure(state="disabled")
+        matrix_button.configure(state="disabled")
+        cancel_button.configure(state="normal")
+        return cancel_event
+
+    def execute_matrix():
+        if job_state["running"]:
+            return
+        platforms = [platform for platform, var in matrix_platform_vars.items() if var.get()]
+        configs = [config for config, var in matrix_config_vars.items() if var.get()]
+        if not platforms or not configs:
+            messagebox.showerror("Package matrix", "Select at least one platform and one build config.")
+            return
+        jobs = plan_matrix(platforms, configs, output_dir_var.get())
+        cancel_event = start_job()
+        job_state["worker"] = threading.Thread(
+            target=matrix_worker,
+            args=(jobs, b_full_rebuild.get(), b_preinstall_pixelstreaming.get(), cancel_event),
+            daemon=True,
+        )
+        job_state["worker"].start()
+
     def execute_packaging():
-        run_packaging(cached_command_string.get(), global_data, output_dir_var.get())
-        if b_preinstall_pixelstreaming.get():
-            preinstall_pixelstreaming(global_data, output_dir_var.get())
-        print("Packaging completed!")
+        if job_state["running"]:
+            return
+        cancel_event = start_job()
+        job_state["worker"] = threading.Thread(
+            target=packaging_worker,
+            args=(cached_command_string.get(), output_dir_var.get(), b_preinstall_pixelstreaming.get(),
+                  build_config_var.get(), platform_var.get(), cancel_event),
+            daemon=True,
+        )
+        job_state["worker"].start()
 
-    # Run Button
-    tk.Button(root, text="Package", command=execute_packaging)\
-        .grid(row=CurrentRow, column=1, **padding_options)
+    def cancel_packaging():
+        if job_state["running"] and messagebox.askyesno("Cancel packaging", "Stop packaging and kill all UAT processes?"):
+            job_state["cancel"].set()
+            status_var.set("Cancelling...")
+
+    def on_close():
+        if job_state["running"]:
+            if not messagebox.askyesno("Packaging running", "Packaging is still running. Cancel it and exit?"):
+                return
+            # UAT runs in its own process group: kill it here rather than on a daemon thread that dies with us,
+            # and let the worker finish before the window it reports to is gone
+            status_var.set("Cancelling...")
+            root.update_idletasks()
+            job_state["cancel"].set()
+            if job_state["kill"] is not None:
+                job_state["kill"]()
+            job_state["worker"].join(timeout=WORKER_EXIT_TIMEOUT)
+        root.destroy()
+
+    # Run/Cancel Buttons
+    buttons_frame = tk.Frame(root)
+    buttons_frame.grid(row=CurrentRow, column=1, **padding_options)
+    package_button = tk.Button(buttons_frame, text="Package", command=execute_packaging)
+    package_button.pack(side="left")
+    matrix_button = tk.Button(buttons_frame, text="Package matrix", command=execute_matrix)
+    matrix_button.pack(side="left", padx=(6, 0))
+    cancel_button = tk.Button(buttons_frame, text="Cancel", command=cancel_packaging, state="disabled")
+    cancel_button.pack(side="left", padx=(6, 0))
     CurrentRow += 1
 
+    root.protocol("WM_DELETE_WINDOW", on_close)
     update_command_preview()
+    flush_output()
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,57 +1,31 @@
 
 # This script packages for Android, specifically for Quest3.
 # Arguments allowed are Development|Debug|Shipping
+# The cook is skipped when no content, config or binaries changed since the last successful package (--force-cook overrides)
 # Binaries for Android must exist at <ProjectDir>/Binaries/Android, they will not be built as part of this script
 
 
-import subprocess
-import shutil
 import sys
 import argparse
 import os
+import time
 from pathlib import Path
-import configparser
 
-from common.automation_common import (
-    get_project_root,
-    find_uproject,
-    load_ue_root
-)
+from common.adb_deploy import format_results, get_android_package_name, install_apk, list_devices, select_devices, RESULT_FAILED
+from common.automation_common import get_automation_state_dir, get_project_context
+from common.build_history import RunRecorder
+from common.content_fingerprint import ContentFingerprint
+from common.ddc import apply_ddc_environment, load_ddc_settings
+from common.workspace_journal import WorkspaceJournal, recover_interrupted_journals
+from common.uat_log_parser import run_uat_command
 
 from utils.modify_android_target import(
     modify_android_target
 )
 
-def make_android_target_backup(target_path: str, backup_path: str):
-    if os.path.exists(backup_path):
-        print("Backup still exists. Not creating backup")
-        return
-    
-    try:
-        with open(target_path, "rb") as rf, open(backup_path, "wb") as wf:
-            wf.write(rf.read())
-        print(f"[INFO] Backup created: {backup_path}")
-    except Exception as e:
-        raise RuntimeError("Failed creating backup.")
-
-def restore_backup(backup_path: str, target_path: str):
-    if not os.path.isfile(backup_path):
-        raise RuntimeError("Failed to restore backup!")
-    
-    if os.path.exists(target_path):
-        os.remove(target_path)
-
-    print("restoring backup:")
-    print(f"{backup_path} -> {target_path}")
-    os.rename(backup_path, target_path)
-    
-
-def run_content_only_build(ue_root: Path, uproject_path: Path, configuration: str):
+def build_content_only_command(ue_root: Path, uproject_path: Path, configuration: str) -> list:
     runuat_path = ue_root / "Engine" / "Build" / "BatchFiles" / "RunUAT.bat"
-    if not runuat_path.exists():
-        raise RuntimeError(f"RunUAT.bat not found at {runuat_path}")
-
-    command = [
+    return [
         str(runuat_path),
         "BuildCookRun",
         f"-project={uproject_path}",
@@ -70,11 +44,20 @@ def run_content_only_build(ue_root: Path, uproject_path: Path, configuration: st
         "-package"
     ]
 
+def run_content_only_build(ue_root: Path, uproject_path: Path, configuration: str, run: RunRecorder = None):
+    command = build_content_only_command(ue_root, uproject_path, configuration)
+    if not Path(command[0]).exists():
+        raise RuntimeError(f"RunUAT.bat not found at {command[0]}")
+
     print("Packaging content-only build:")
     print(" ".join(command))
-    result = subprocess.run(command)
-    if result.returncode != 0:
-        raise RuntimeError(f"BuildCookRun failed with exit code {result.returncode}")
+    summary_path = get_automation_state_dir(uproject_path.parent) / "UatLogs" / f"content_only_android_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    returncode, summary = run_uat_command(command, summary_path=summary_path)
+    if run is not None:
+        run.add_phase_steps(summary)
+        run.exit_code = returncode
+    if returncode != 0:
+        raise RuntimeError(f"BuildCookRun failed with exit code {returncode}")
 
 def find_apk(project_root: Path, uproject_path: Path) -> Path:
     apk_path = project_root / "Binaries" / "Android" / f"{uproject_path.stem}-arm64.apk"
@@ -82,45 +65,97 @@ def find_apk(project_root: Path, uproject_path: Path) -> Path:
         raise RuntimeError(f"APK not found after build: {apk_path}")
     return apk_path
 
-def install_apk_to_quest(apk_path: Path):
-    print(f"Installing APK to Quest: {apk_path}")
-    result = subprocess.run(["adb", "install", "-r", str(apk_path)])
-    if result.returncode != 0:
-        raise RuntimeError(f"ADB install failed with exit code {result.returncode}")
-
-def package_and_install(configuration: str) -> bool:
+##
+#  Installs the APK on all connected headsets (or only the given serials) in parallel.
+#  Headsets that already have this exact APK installed are skipped unless force is set.
+##
+def install_apk_to_quest(apk_path: Path, package_name: str, serials: list = None, force: bool = False, max_workers: int = None):
+    devices = select_devices(list_devices(), serials)
+    start = time.perf_counter()
+    results = install_apk(apk_path, devices, package_name=package_name, force=force, max_workers=max_workers)
+    print(format_results(results, time.perf_counter() - start))
+    failed = [result.device.serial for result in results if result.status == RESULT_FAILED]
+    if failed:
+        raise RuntimeError(f"ADB install failed on {len(failed)} device(s): {', '.join(failed)}")
+
+def package_and_install(configuration: str, serials: list = None, force_install: bool = False, install_jobs: int = None,
+                        force_cook: bool = False) -> bool:
     
-    project_root = get_project_root()
-    uproject_path = find_uproject(project_root)
-    ue_root = load_ue_root()
-    project_name = os.path.splitext(uproject_path.name)[0]
+    context = get_project_context()
+    project_root = context.project_root
+    uproject_path = context.uproject
+    ue_root = context.ue_root
+    project_name = context.project_name
 
     print(f"Project root: {project_root}")
     print(f"UProject: {uproject_path.name}")
     print(f"UE Root: {ue_root}")
     print(f"Build Configuration: {configuration}")
+    apply_ddc_environment(load_ddc_settings(context.project_config, project_root))
     
     android_target_path:str = os.path.join(project_root, "Binaries", "Android", f"{project_name}.target")
-    # Backup
-    backup_path = f"{android_target_path}.bak"
-    
+    # Roll back a killed run's edits first: the fingerprint check below must see the original .target, and a
+    # cook-skipping run would otherwise install from a workspace that is still edited
     try:
+        recover_interrupted_journals(project_root)
+        # Left behind by older versions of this script that were interrupted: the target next to it is the edited one
+        legacy_backup = f"{android_target_path}.bak"
+        if os.path.isfile(legacy_backup):
+            print(f"[Journal] Restoring leftover backup {legacy_backup}")
+            os.replace(legacy_backup, android_target_path)
+    except (OSError, RuntimeError) as e:
+        print(f"Package and install failed: {e}")
+        input("Press Enter to exit...")
+        return False
 
-        make_android_target_backup(android_target_path, backup_path)
-        # modify the Android <Project>.target. This edits absolute paths to represent the current project path - project plugins often use hardcoded system-specific paths
-        modify_android_target(android_target_path)
-        
-        run_content_only_build(ue_root, uproject_path, configuration)
-        apk_path = find_apk(project_root, uproject_path)
-        install_apk_to_quest(apk_path)
-
-        print("Package and install completed.")
+    # Skip the cook when nothing it depends on changed since the last successful package
+    apk_path = project_root / "Binaries" / "Android" / f"{uproject_path.stem}-arm64.apk"
+    fingerprint = ContentFingerprint(project_root, ue_root, get_automation_state_dir(project_root) / "ContentFingerprint", "content_only_android")
+    settings = {
+        "configuration": configuration,
+        "command": " ".join(build_content_only_command(ue_root, uproject_path, configuration)[1:]),
+    }
+    if force_cook:
+        needs_cook = True
+        print("Cooking: forced with --force-cook")
+    else:
+        try:
+            check = fingerprint.check(settings, apk_path)
+            needs_cook = check.needs_cook
+            print(check.format())
+        except OSError as e:
+            needs_cook = True
+            print(f"Cooking: content check failed ({e})")
+    pipeline = "package_content_only_android" if needs_cook else "install_content_only_android"
+
+    succeeded = False
+    try:
+        with RunRecorder(project_root, pipeline, command=" ".join(sys.argv), config=configuration, platform="Android") as run:
+            eta = run.format_eta()
+            if eta:
+                print(eta)
+
+            if needs_cook:
+                # The target is only edited for this build: the journal puts it back afterwards, even if the
+                # console is closed mid-cook (or on the next run, if the process was killed)
+                with WorkspaceJournal(project_root, "package_content_only_android") as journal:
+                    journal.protect(Path(android_target_path))
+                    # modify the Android <Project>.target. This edits absolute paths to represent the current project path - project plugins often use hardcoded system-specific paths
+                    modify_android_target(android_target_path, str(project_root))
+
+                    run_content_only_build(ue_root, uproject_path, configuration, run=run)
+                apk_path = find_apk(project_root, uproject_path)
+                fingerprint.save(settings, apk_path)
+            with run.step("Install"):
+                install_apk_to_quest(apk_path, get_android_package_name(project_root, project_name), serials, force_install, install_jobs)
+
+        print("Package and install completed." if needs_cook else "Install completed (cook skipped).")
+        succeeded = True
     except Exception as e:
         print(f"Package and install failed: {e}")
         
-    # Restore backup, even if we failed
-    restore_backup(backup_path, android_target_path)
     input("Press Enter to exit...")
+    return succeeded
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Package and install updated content to Quest")
@@ -131,8 +166,18 @@ def parse_args():
         choices=["Debug", "Development", "Shipping"],
         help="Build configuration (default: Development)"
     )
+    parser.add_argument(
+        "--devices",
+        type=str,
+        default=None,
+        help="Comma-separated adb serials to install to (default: all connected devices)"
+    )
+    parser.add_argument("--force-cook", action="store_true", help="Cook and package even if no content changed since the last package")
+    parser.add_argument("--force-install", action="store_true", help="Install even on devices that already have this APK")
+    parser.add_argument("--install-jobs", type=int, default=None, help="Max parallel installs (default: one per device)")
     return parser.parse_args()
 
 if __name__ == "__main__":
     args = parse_args()
-    sys.exit(0 if package_and_install(args.config) else 1)
+    serials = [serial.strip() for serial in args.devices.split(",") if serial.strip()] if args.devices else None
+    sys.exit(0 if package_and_install(args.config, serials, args.force_install, args.install_jobs, args.force_cook) else 1)
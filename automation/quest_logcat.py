@@ -0,0 +1,128 @@
+# Streams logcat from a Quest, keeps the UE and VrApi lines in size-rotated files and turns the VrApi metrics
+# (FPS, CPU/GPU levels, frame and app GPU time, stale frames) into a time series with per-session summaries.
+# Usage:
+#   python quest_logcat.py [--device SERIAL] [--clear] [--out DIR] [--max-file-mb N] [--backups N]
+#   python quest_logcat.py --replay CAPTURE.log [--out DIR]      analyze a recorded "adb logcat -v threadtime" capture
+#
+# Output folder (default <Project>/Saved/Automation/QuestLogs/<timestamp>):
+#   ue-quest.log[.1, .2, ...]   the captured lines, rotated by size
+#   metrics.csv                 one row per VrApi sample, written as they arrive
+#   summary.json                per-session percentiles and hitch markers (with the UE lines logged just before)
+# Stop with Ctrl+C; the summary is written and printed then (or when the device disconnects).
+
+import argparse
+import csv
+import json
+import subprocess
+import sys
+import time
+from dataclasses import asdict, fields
+from pathlib import Path
+
+from common.adb_deploy import find_adb
+from common.automation_common import get_automation_state_dir, get_project_context
+from common.logcat_metrics import (
+    METRICS_TAGS,
+    UE_TAG,
+    HitchMarker,
+    LogcatAnalyzer,
+    MetricSample,
+    RotatingLogFile,
+    session_to_dict,
+)
+from common.process_runner import kill_process_tree, start_process
+
+LOG_FILE_NAME = "ue-quest.log"
+
+def build_logcat_command(adb: str, serial: str = None) -> list:
+    command = [adb] + (["-s", serial] if serial else [])
+    # threadtime carries the pid (sessions) and millisecond timestamps; -s silences every other tag
+    return command + ["logcat", "-v", "threadtime", "-s", UE_TAG] + list(METRICS_TAGS)
+
+def clear_logcat(adb: str, serial: str = None) -> None:
+    subprocess.run([adb] + (["-s", serial] if serial else []) + ["logcat", "-c"], stdin=subprocess.DEVNULL, timeout=30)
+
+def print_hitch(hitch: HitchMarker) -> None:
+    print(f"[Hitch] {time.strftime('%H:%M:%S', time.localtime(hitch.time))} {hitch.reason}")
+
+##
+## Feeds every line to the log files and the analyzer; returns when the lines run out (adb exited or end of capture)
+##
+def capture(lines, out_dir: Path, max_file_mb: float, backups: int) -> LogcatAnalyzer:
+    analyzer = LogcatAnalyzer(on_hitch=print_hitch)
+    log_file = RotatingLogFile(out_dir / LOG_FILE_NAME, int(max_file_mb * 1024 * 1024), backups)
+    column_names = [f.name for f in fields(MetricSample)]
+    with open(out_dir / "metrics.csv", "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=column_names)
+        writer.writeheader()
+        last_flush = time.monotonic()
+        try:
+            for line in lines:
+                log_file.write_line(line)
+                sample = analyzer.feed(line)
+                if sample is not None:
+                    writer.writerow(asdict(sample))
+                if time.monotonic() - last_flush > 1.0:
+                    log_file.flush()
+                    csv_file.flush()
+                    last_flush = time.monotonic()
+        except KeyboardInterrupt:
+            print("Stopping capture...")
+        finally:
+            log_file.close()
+    return analyzer
+
+def write_summary(analyzer: LogcatAnalyzer, out_dir: Path) -> None:
+    sessions = analyzer.finish()
+    with open(out_dir / "summary.json", "w", encoding="utf-8") as f:
+        json.dump({"sessions": [session_to_dict(session) for session in sessions]}, f, indent=2)
+    if not sessions:
+        print("No VrApi metrics captured (is the app running on the headset?)")
+    for session in sessions:
+        print(session.format())
+    print(f"Logs and metrics written to {out_dir}")
+
+def run_live(serial: str, clear: bool, out_dir: Path, max_file_mb: float, backups: int) -> int:
+    adb = find_adb()
+    if clear:
+        clear_logcat(adb, serial)
+    command = build_logcat_command(adb, serial)
+    print("Capturing: " + " ".join(command))
+    process = start_process(command)
+    try:
+        analyzer = capture(process.stdout, out_dir, max_file_mb, backups)
+    finally:
+        kill_process_tree(process)
+    write_summary(analyzer, out_dir)
+    return 0
+
+def run_replay(capture_path: Path, out_dir: Path, max_file_mb: float, backups: int) -> int:
+    with open(capture_path, "r", encoding="utf-8", errors="replace") as f:
+        analyzer = capture(f, out_dir, max_file_mb, backups)
+    write_summary(analyzer, out_dir)
+    return 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Capture Quest logcat and summarize VrApi performance metrics")
+    parser.add_argument("--device", type=str, default=None, help="adb serial (default: the only connected device)")
+    parser.add_argument("--clear", action="store_true", help="Clear the device's logcat buffer first, so only new lines are captured")
+    parser.add_argument("--replay", type=str, default=None, help="Analyze a recorded 'adb logcat -v threadtime' capture instead")
+    parser.add_argument("--out", type=str, default=None, help="Output folder (default: Saved/Automation/QuestLogs/<timestamp>)")
+    parser.add_argument("--max-file-mb", type=float, default=50, help="Rotate ue-quest.log beyond this size")
+    parser.add_argument("--backups", type=int, default=5, help="Rotated log files to keep")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        if args.out:
+            out_dir = Path(args.out)
+        else:
+            out_dir = get_automation_state_dir(get_project_context().project_root) / "QuestLogs" / time.strftime("%Y%m%d-%H%M%S")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        if args.replay:
+            sys.exit(run_replay(Path(args.replay), out_dir, args.max_file_mb, args.backups))
+        sys.exit(run_live(args.device, args.clear, out_dir, args.max_file_mb, args.backups))
+    except RuntimeError as e:
+        print(f"Quest logcat failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,176 @@
+# Uploads packaged builds to Steam, configured in the [Steam], [SteamDepot <id>] and [SteamBuild <name>] sections of
+# project.config. Builds whose depots are identical to that build's last upload of them are skipped; for the others
+# the changed files and bytes are listed before steamcmd runs.
+# Usage:
+#   python steam_upload.py [--build NAME ...] [--dry-run] [--preview] [--force] [--jobs N] [--steamcmd PATH]
+#
+#   --dry-run   scan and diff the depots and write the VDFs, but don't run steamcmd
+#   --preview   run steamcmd with "Preview" builds (nothing is uploaded or set live, nothing is recorded)
+#   --force     upload even if nothing changed
+#   --steamcmd  use this steamcmd (or a .py stand-in) instead of [Steam] SteamCmd
+#
+# Builds run in parallel up to [Steam] MaxParallelUploads, each in its own steamcmd process. Manifests and VDFs are
+# kept in <Project>/Saved/Automation/Steam (see common/steam_depot.py).
+
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from common.automation_common import get_automation_state_dir, get_project_context
+from common.build_history import RunRecorder, get_git_revision
+from common.delta_sync import format_bytes
+from common.steam_depot import (
+    DepotDiff,
+    FileChunks,
+    SteamBuild,
+    diff_depot,
+    load_manifest,
+    load_steam_settings,
+    run_steamcmd,
+    save_manifest,
+    scan_depot,
+    steamcmd_command,
+    write_build_vdfs,
+)
+
+_print_lock = threading.Lock()
+_manifest_lock = threading.Lock()
+
+def locked_print(text: str) -> None:
+    with _print_lock:
+        print(text)
+
+def select_builds(settings, names: List[str]) -> List[SteamBuild]:
+    if not names:
+        return settings.builds
+    by_name = {build.name: build for build in settings.builds}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise RuntimeError(f"Unknown build(s): {', '.join(unknown)} (configured: {', '.join(by_name)})")
+    return [by_name[name] for name in names]
+
+def uploaded_manifest_path(state_dir, build_name: str, depot_id: str):
+    # Per build: builds sharing a depot upload it separately, a failed upload of one mustn't hide the change from the other
+    return state_dir / build_name / f"depot_{depot_id}_uploaded.json"
+
+##
+## Scans every depot the selected builds upload; a depot shared by several builds is scanned once
+##
+def scan_depots(settings, depot_ids: List[str], state_dir) -> Dict[str, Dict[str, FileChunks]]:
+    scans: Dict[str, Dict[str, FileChunks]] = {}
+    for depot_id in depot_ids:
+        start = time.perf_counter()
+        scan_path = state_dir / f"depot_{depot_id}_scan.json"
+        cache, _ = load_manifest(scan_path)
+        files, hashed_bytes = scan_depot(settings.depots[depot_id], cache)
+        save_manifest(scan_path, files)
+        scans[depot_id] = files
+        print(f"Depot {depot_id}: scanned in {time.perf_counter() - start:.1f}s ({format_bytes(hashed_bytes)} hashed)")
+    return scans
+
+##
+## Compares each build's depots with that build's last upload of them
+##
+def diff_builds(builds: List[SteamBuild], scans, state_dir) -> Dict[str, Dict[str, DepotDiff]]:
+    diffs: Dict[str, Dict[str, DepotDiff]] = {}
+    for build in builds:
+        diffs[build.name] = {}
+        for depot_id in build.depot_ids:
+            uploaded, uploaded_info = load_manifest(uploaded_manifest_path(state_dir, build.name, depot_id))
+            diff = diff_depot(depot_id, uploaded if uploaded_info else None, scans[depot_id])
+            diffs[build.name][depot_id] = diff
+            print(f"[{build.name}] {diff.format()}")
+            if uploaded_info.get("build_id"):
+                print(f"  last upload: BuildID {uploaded_info['build_id']}")
+    return diffs
+
+def upload_build(settings, build: SteamBuild, scans, state_dir, description: str, preview: bool, cancel_event) -> bool:
+    app_vdf = write_build_vdfs(settings, build, state_dir / build.name, description, preview=preview)
+    command = steamcmd_command(settings, app_vdf)
+    locked_print(f"[{build.name}] Uploading depot(s) {', '.join(build.depot_ids)}"
+                 + (f", set live on '{build.set_live}'" if build.set_live and not preview else "")
+                 + (" (preview)" if preview else ""))
+    result = run_steamcmd(build.name, command, output=locked_print, cancel_event=cancel_event)
+    if not result.succeeded:
+        reason = result.errors[0] if result.errors else f"exit code {result.returncode}"
+        locked_print(f"[{build.name}] Upload failed after {result.seconds:.0f}s: {reason}")
+        return False
+
+    locked_print(f"[{build.name}] Uploaded in {result.seconds:.0f}s" + (f", BuildID {result.build_id}" if result.build_id else ""))
+    if not preview:
+        with _manifest_lock:
+            for depot_id in build.depot_ids:
+                save_manifest(uploaded_manifest_path(state_dir, build.name, depot_id), scans[depot_id],
+                              build_id=result.build_id, build=build.name, branch=build.set_live, uploaded=time.time())
+    return True
+
+def main(args) -> int:
+    context = get_project_context()
+    settings = load_steam_settings(context.project_config, context.project_root)
+    if args.steamcmd:
+        settings.steamcmd = args.steamcmd
+    builds = select_builds(settings, args.build)
+    state_dir = get_automation_state_dir(context.project_root) / "Steam"
+    state_dir.mkdir(parents=True, exist_ok=True)
+
+    recorded = not args.dry_run and not args.preview
+    with RunRecorder(context.project_root, "steam_upload", command=" ".join(sys.argv), enabled=recorded) as run:
+        with run.step("scan"):
+            depot_ids = list(dict.fromkeys(depot_id for build in builds for depot_id in build.depot_ids))
+            scans = scan_depots(settings, depot_ids, state_dir)
+            diffs = diff_builds(builds, scans, state_dir)
+
+        to_upload = [build for build in builds if args.force or any(diff.changed for diff in diffs[build.name].values())]
+        for build in builds:
+            if build not in to_upload:
+                print(f"[{build.name}] Skipped: every depot is identical to its last upload (--force uploads anyway)")
+        if not to_upload:
+            return 0
+        changed_bytes = sum(diff.changed_bytes for build in to_upload for diff in diffs[build.name].values())
+        print(f"{len(to_upload)} build(s) to upload, {format_bytes(changed_bytes)} in changed chunks")
+
+        revision = get_git_revision(context.project_root)
+        description = " ".join(part for part in (settings.description, revision, time.strftime("%Y-%m-%d %H:%M")) if part)
+        if args.dry_run:
+            for build in to_upload:
+                app_vdf = write_build_vdfs(settings, build, state_dir / build.name, description)
+                print(f"[{build.name}] Dry run: {' '.join(steamcmd_command(settings, app_vdf))}")
+            return 0
+
+        cancel_event = threading.Event()
+        jobs = max(1, args.jobs if args.jobs is not None else settings.max_parallel_uploads)
+        with run.step("upload"):
+            with ThreadPoolExecutor(max_workers=min(jobs, len(to_upload))) as pool:
+                futures = [pool.submit(upload_build, settings, build, scans, state_dir, description, args.preview, cancel_event)
+                           for build in to_upload]
+                try:
+                    results = [future.result() for future in futures]
+                except KeyboardInterrupt:
+                    cancel_event.set()
+                    raise
+        failed = [build.name for build, ok in zip(to_upload, results) if not ok]
+        if failed:
+            raise RuntimeError(f"Upload failed for: {', '.join(failed)}")
+    print("Steam upload finished.")
+    return 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Upload changed depots to Steam with steamcmd")
+    parser.add_argument("--build", action="append", default=[], help="Build to upload ([SteamBuild <name>]); repeatable, default: all")
+    parser.add_argument("--dry-run", action="store_true", help="Only scan, diff and write the VDFs")
+    parser.add_argument("--preview", action="store_true", help="steamcmd preview builds: nothing is uploaded or set live")
+    parser.add_argument("--force", action="store_true", help="Upload even if the depots are unchanged")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel uploads (default: [Steam] MaxParallelUploads)")
+    parser.add_argument("--steamcmd", type=str, default=None, help="steamcmd executable (or a .py stand-in) to use instead of [Steam] SteamCmd")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        sys.exit(main(args))
+    except RuntimeError as e:
+        print(f"[Steam] {e}")
+        sys.exit(1)
@@ -0,0 +1,473 @@
+# Micro-benchmarks for the automation scripts.
+# Usage:
+#   python benchmarks.py copy [--small-files N] [--small-kb N] [--large-files N] [--large-mb N] [--dir PATH]
+#   python benchmarks.py startup [--runs N] [--compare-ref GIT_REF] [--spawn-budget-ms N]
+#   python benchmarks.py retarget [--plugins N] [--receipts-per-plugin N] [--dir PATH]
+#   python benchmarks.py materialize [--packages N] [--files-per-package N] [--links N] [--dir PATH]
+#   python benchmarks.py clean [--folders N] [--files-per-folder N] [--dir PATH]
+#   python benchmarks.py ddc [--files N] [--dir PATH]
+#   python benchmarks.py csvprofile [--frames N] [--stats N] [--dir PATH]
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Resolve the parent folder and add it to sys.path once
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+sys.path.insert(0, PARENT_DIR)
+
+from common.fast_copy import copy_tree
+from common.receipt_retarget import retarget_receipts
+from common.csv_profile import analyze_capture, np
+from common.ddc import prune_cache, scan_cache
+from common.workspace_clean import delete_paths, measure, move_to_trash
+from utils.materialize_symlinks import materialize_symlinks
+
+# (module name, folder relative to the repo root, launched with --help too?)
+ENTRY_POINTS = (
+    ("RunEditor", ".", False),
+    ("build_and_push_to_cgi", "automation", True),
+    ("build_android_binaries", "automation", True),
+    ("package", "automation", False),
+    ("package_content_only_android", "automation", True),
+    ("clean", "automation", True),
+    ("manage_ddc", "automation", True),
+    ("analyze_csv_profile", "automation", True),
+    ("steam_upload", "automation", True),
+    ("modify_android_target", "automation/utils", False),
+    ("setup_repo", "git", True),
+)
+
+_IMPORT_SNIPPET = (
+    "import sys, time; sys.path.insert(0, '.'); start = time.perf_counter(); "
+    "import {module}; print(time.perf_counter() - start)"
+)
+
+
+def _make_synthetic_tree(root: Path, small_files: int, small_kb: int, large_files: int, large_mb: int) -> int:
+    """Creates many small files spread over nested folders plus a few big ones. Returns total bytes."""
+    total = 0
+    small_payload = os.urandom(small_kb * 1024)
+    for i in range(small_files):
+        path = root / f"dir_{i % 64:02d}" / f"sub_{i % 7}" / f"file_{i}.bin"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(small_payload)
+        total += len(small_payload)
+
+    block = os.urandom(8 * 1024 * 1024)
+    for i in range(large_files):
+        path = root / "large" / f"large_{i}.bin"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            written = 0
+            while written < large_mb * 1024 * 1024:
+                f.write(block)
+                written += len(block)
+        total += written
+    return total
+
+
+def _timed(label: str, total_bytes: int, func) -> float:
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    print(f"{label:<28} {seconds:8.2f}s {total_bytes / (1024 * 1024) / seconds:10.1f} MB/s")
+    return seconds
+
+
+def benchmark_copy(args: argparse.Namespace) -> int:
+    base_dir = Path(tempfile.mkdtemp(prefix="copy_bench_", dir=args.dir))
+    try:
+        src = base_dir / "src"
+        print(f"Creating synthetic tree in {src} ...")
+        total = _make_synthetic_tree(src, args.small_files, args.small_kb, args.large_files, args.large_mb)
+        print(f"{args.small_files} x {args.small_kb} KB + {args.large_files} x {args.large_mb} MB "
+              f"= {total / (1024 * 1024):.1f} MB\n")
+
+        baseline = _timed("shutil.copytree", total, lambda: shutil.copytree(src, base_dir / "dst_shutil"))
+        parallel = _timed("fast_copy.copy_tree", total, lambda: copy_tree(src, base_dir / "dst_fast"))
+        _timed("fast_copy.copy_tree (links)", total,
+               lambda: copy_tree(src, base_dir / "dst_links", allow_hardlink=True))
+
+        print(f"\nSpeedup over shutil.copytree: {baseline / parallel:.2f}x")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return 0
+
+
+def _run_quiet(command, cwd: Path) -> subprocess.CompletedProcess:
+    # No stdin: scripts that wait for "Press Enter" must not block the benchmark
+    return subprocess.run(command, cwd=cwd, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=120)
+
+
+def _failure_reason(result: subprocess.CompletedProcess) -> str:
+    lines = (result.stderr or result.stdout).strip().splitlines()
+    return lines[-1][:30] if lines else f"exit code {result.returncode}"
+
+
+def _measure_import(repo_root: Path, module: str, folder: str, runs: int) -> str:
+    samples = []
+    for _ in range(runs):
+        result = _run_quiet([sys.executable, "-c", _IMPORT_SNIPPET.format(module=module)], repo_root / folder)
+        if result.returncode != 0:
+            return f"failed: {_failure_reason(result)}"
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return f"{statistics.median(samples) * 1000:8.1f} ms"
+
+
+def _measure_launch(repo_root: Path, module: str, folder: str, runs: int) -> str:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = _run_quiet([sys.executable, f"{module}.py", "--help"], repo_root / folder)
+        samples.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return f"failed: {_failure_reason(result)}"
+    return f"{statistics.median(samples) * 1000:8.1f} ms"
+
+
+def _measure_startup(repo_root: Path, runs: int) -> dict:
+    results = {}
+    for module, folder, has_cli in ENTRY_POINTS:
+        if not (repo_root / folder / f"{module}.py").exists():
+            results[module] = ("missing", "missing")
+            continue
+        import_time = _measure_import(repo_root, module, folder, runs)
+        launch_time = _measure_launch(repo_root, module, folder, runs) if has_cli else "-"
+        results[module] = (import_time, launch_time)
+    return results
+
+
+def _measure_headless_launch(repo_root: Path, runs: int) -> tuple:
+    """
+    Time from starting 'RunEditor.py --print-command' until the editor command line is ready to spawn,
+    against a stub engine/project. Returns (median seconds or None, error, tkinter imported?).
+    """
+    stub_root = Path(tempfile.mkdtemp(prefix="runeditor_bench_"))
+    try:
+        editor_exe = stub_root / "UE" / "Engine" / "Binaries" / "Win64" / "UnrealEditor.exe"
+        editor_exe.parent.mkdir(parents=True)
+        editor_exe.touch()
+        (stub_root / "Dev").mkdir()
+        (stub_root / "Dev" / "Bench.uproject").touch()
+        command = [sys.executable, "RunEditor.py", "--print-command",
+                   "--ue_root", str(stub_root / "UE"), "--dev_repo_root", str(stub_root / "Dev")]
+
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = _run_quiet(command, repo_root)
+            samples.append(time.perf_counter() - start)
+            if result.returncode != 0:
+                return None, _failure_reason(result), False
+
+        # -X importtime lists every imported module on stderr
+        import_trace = _run_quiet([sys.executable, "-X", "importtime"] + command[1:], repo_root)
+        return statistics.median(samples), None, "tkinter" in import_trace.stderr
+    finally:
+        shutil.rmtree(stub_root, ignore_errors=True)
+
+
+def benchmark_startup(args: argparse.Namespace) -> int:
+    repo_root = Path(PARENT_DIR).parent
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        _run_quiet([sys.executable, "-c", "pass"], repo_root)
+    print(f"Bare interpreter start: {(time.perf_counter() - start) / args.runs * 1000:.1f} ms "
+          f"(median of {args.runs} run(s) is used below)\n")
+
+    columns = [("working tree", _measure_startup(repo_root, args.runs))]
+    if args.compare_ref:
+        ref_root = Path(tempfile.mkdtemp(prefix="startup_bench_"))
+        try:
+            archive = subprocess.run(["git", "archive", "--format=tar", args.compare_ref], cwd=repo_root, capture_output=True)
+            if archive.returncode != 0:
+                raise RuntimeError(f"git archive {args.compare_ref} failed: {archive.stderr.decode(errors='replace').strip()}")
+            subprocess.run(["tar", "-x", "-C", str(ref_root)], input=archive.stdout, check=True)
+            columns.insert(0, (args.compare_ref, _measure_startup(ref_root, args.runs)))
+        finally:
+            shutil.rmtree(ref_root, ignore_errors=True)
+
+    for label, results in columns:
+        print(f"=== {label} ===")
+        print(f"  {'entry point':<30} {'import':<40} {'launch --help'}")
+        for module, (import_time, launch_time) in results.items():
+            print(f"  {module:<30} {import_time:<40} {launch_time}")
+        print()
+
+    seconds, error, imports_tkinter = _measure_headless_launch(repo_root, args.runs)
+    if seconds is None:
+        print(f"Headless RunEditor launch failed: {error}")
+        return 1
+    print(f"Headless RunEditor launch (to spawn): {seconds * 1000:.1f} ms, budget {args.spawn_budget_ms} ms")
+    if imports_tkinter:
+        print("FAIL: the headless launch imports tkinter")
+        return 1
+    if seconds * 1000 > args.spawn_budget_ms:
+        print("FAIL: over budget")
+        return 1
+    return 0
+
+
+def _make_synthetic_receipts(root: Path, plugins: int, receipts_per_plugin: int) -> int:
+    """A project with plugins whose receipts reference absolute paths of another machine. Returns the receipt count."""
+    count = 0
+    for i in range(plugins):
+        plugin_dir = root / "Plugins" / f"Plugin{i}"
+        (plugin_dir / "Binaries" / "Win64").mkdir(parents=True, exist_ok=True)
+        (plugin_dir / f"Plugin{i}.uplugin").write_text("{}")
+        for j in range(receipts_per_plugin):
+            receipt = {
+                "TargetName": f"Target{j}",
+                "AdditionalProperties": [
+                    {"Name": "AndroidPlugin", "Value": f"C:\\Other\\Project\\Plugins\\Plugin{i}\\Source\\APL_{k}.xml"}
+                    for k in range(50)
+                ] + [{"Name": "EnginePlugin", "Value": "C:\\UE_5.3\\Engine\\Plugins\\Foo\\Foo.uplugin"}],
+                "BuildProducts": [{"Path": f"$(ProjectDir)/Binaries/Win64/Module{k}.dll", "Type": "DynamicLibrary"} for k in range(200)],
+            }
+            (plugin_dir / "Binaries" / "Win64" / f"Target{j}.target").write_text(json.dumps(receipt, indent="\t"))
+            count += 1
+    return count
+
+
+def benchmark_retarget(args: argparse.Namespace) -> int:
+    base_dir = Path(tempfile.mkdtemp(prefix="retarget_bench_", dir=args.dir))
+    try:
+        results = {}
+        for label, workers in (("serial", 1), ("parallel", None)):
+            project = base_dir / label
+            count = _make_synthetic_receipts(project, args.plugins, args.receipts_per_plugin)
+            start = time.perf_counter()
+            changed = sum(1 for result in retarget_receipts(project, Path("D:/UE"), max_workers=workers) if result.written)
+            results[label] = time.perf_counter() - start
+            print(f"{label:<10} {count} receipt(s), {changed} rewritten: {results[label]:.3f}s")
+
+        start = time.perf_counter()
+        retarget_receipts(base_dir / "parallel", Path("D:/UE"))
+        print(f"{'no-op':<10} second pass over already retargeted receipts: {time.perf_counter() - start:.3f}s")
+        print(f"\nSpeedup of parallel over serial: {results['serial'] / results['parallel']:.2f}x")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return 0
+
+
+def _make_link_heavy_tree(root: Path, packages: int, files_per_package: int, links: int) -> None:
+    """An npm-workspace-like tree: real packages plus node_modules folders full of links into them."""
+    payload = os.urandom(4096)
+    for i in range(packages):
+        package_dir = root / "packages" / f"pkg{i}"
+        (package_dir / "dist").mkdir(parents=True, exist_ok=True)
+        for j in range(files_per_package):
+            (package_dir / "dist" / f"file{j}.js").write_bytes(payload)
+    for i in range(links):
+        consumer = root / "consumers" / f"app{i % 20}" / "node_modules"
+        (consumer / ".bin").mkdir(parents=True, exist_ok=True)
+        link = consumer / f"pkg{i}"
+        if not link.exists():
+            os.symlink(root / "packages" / f"pkg{i % packages}", link, target_is_directory=True)
+            os.symlink(root / "packages" / f"pkg{i % packages}" / "dist" / "file0.js", consumer / ".bin" / f"tool{i}")
+
+
+def benchmark_materialize(args: argparse.Namespace) -> int:
+    base_dir = Path(tempfile.mkdtemp(prefix="materialize_bench_", dir=args.dir))
+    try:
+        try:
+            _make_link_heavy_tree(base_dir, args.packages, args.files_per_package, args.links)
+        except OSError as e:
+            # Windows needs developer mode or admin rights for symlinks
+            print(f"Can't create symlinks here: {e}")
+            return 1
+        print(f"{args.links} directory link(s) + {args.links} file link(s) into {args.packages} package(s) "
+              f"of {args.files_per_package} file(s)\n")
+
+        start = time.perf_counter()
+        materialize_symlinks(base_dir, dry_run=True, verbose=False)
+        print(f"{'what-if scan':<16} {time.perf_counter() - start:8.2f}s\n")
+
+        start = time.perf_counter()
+        report = materialize_symlinks(base_dir, verbose=False)
+        print(f"{'materialize':<16} {time.perf_counter() - start:8.2f}s")
+        remaining = sum(1 for dir_path, dir_names, file_names in os.walk(base_dir)
+                        for name in dir_names + file_names if os.path.islink(os.path.join(dir_path, name)))
+        if remaining or report.failed:
+            print(f"FAIL: {remaining} link(s) left, {len(report.failed)} failed copies")
+            return 1
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return 0
+
+
+def _make_intermediate_like_tree(root: Path, folders: int, files_per_folder: int) -> int:
+    """Many small files in nested module folders, like Intermediate/. Returns the file count."""
+    payload = os.urandom(2048)
+    for i in range(folders):
+        folder = root / "Intermediate" / "Build" / "Win64" / f"Module{i}" / "Development"
+        folder.mkdir(parents=True, exist_ok=True)
+        for j in range(files_per_folder):
+            (folder / f"Unit{j}.obj").write_bytes(payload)
+    return folders * files_per_folder
+
+
+def benchmark_clean(args: argparse.Namespace) -> int:
+    base_dir = Path(tempfile.mkdtemp(prefix="clean_bench_", dir=args.dir))
+    try:
+        runs = (
+            ("rmtree", lambda project: shutil.rmtree(project / "Intermediate")),
+            ("parallel", lambda project: delete_paths([project / "Intermediate"])),
+            ("trash", lambda project: move_to_trash(project, [project / "Intermediate"])),
+        )
+        for label, func in runs:
+            project = base_dir / label
+            count = _make_intermediate_like_tree(project, args.folders, args.files_per_folder)
+            if label == "parallel":
+                start = time.perf_counter()
+                measure([project / "Intermediate"])
+                print(f"{'size scan':<10} {count} file(s): {time.perf_counter() - start:.3f}s")
+            start = time.perf_counter()
+            func(project)
+            print(f"{label:<10} {count} file(s): {time.perf_counter() - start:.3f}s")
+            if (project / "Intermediate").exists():
+                print(f"FAIL: {label} left Intermediate behind")
+                return 1
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return 0
+
+
+def _make_synthetic_ddc(root: Path, files: int) -> None:
+    """A filesystem DDC layout (<A-Z0-9>/<0-9>/<0-9>/<hash>.udd) with last-use times spread over 90 days."""
+    payload = os.urandom(1024)
+    now = time.time()
+    for i in range(files):
+        folder = root / "0123456789ABCDEF"[i % 16] / str(i // 16 % 10) / str(i // 160 % 10)
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"{i:08x}.udd"
+        path.write_bytes(payload)
+        last_used = now - (i * 7919 % files) / files * 90 * 86400
+        os.utime(path, (last_used, last_used))
+
+
+def benchmark_ddc(args: argparse.Namespace) -> int:
+    base_dir = Path(tempfile.mkdtemp(prefix="ddc_bench_", dir=args.dir))
+    try:
+        _make_synthetic_ddc(base_dir, args.files)
+        for label, workers in (("serial", 1), ("parallel", None)):
+            start = time.perf_counter()
+            count = len(scan_cache(base_dir, **({"max_workers": workers} if workers else {})))
+            print(f"{label + ' scan':<16} {count} file(s): {time.perf_counter() - start:.3f}s")
+
+        budget_gb = args.files * 1024 / 2 / 1024 ** 3
+        report = prune_cache(base_dir, budget_gb)
+        print(f"{'prune to 50%':<16} {report.summary()}")
+        if report.failed or len(scan_cache(base_dir)) > args.files // 2 + 1:
+            print("FAIL: the cache is still over budget")
+            return 1
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return 0
+
+
+def _make_synthetic_csv_capture(path: Path, frames: int, stats: int) -> None:
+    """A CSV profiler capture: header, one row per frame with an EVENTS column, trailing header and metadata."""
+    rng = random.Random(1)
+    names = ["FrameTime", "GameThreadTime", "RenderThreadTime", "GPUTime"] + [f"Stat{i}" for i in range(stats - 4)] + ["EVENTS"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(names) + "\n")
+        for frame in range(frames):
+            values = [f"{rng.lognormvariate(2.7, 0.3):.3f}" for _ in range(len(names) - 1)]
+            f.write(",".join(values) + ("," + "Hitch" if frame % 1000 == 999 else ",") + "\n")
+        f.write(",".join(names) + "\n")
+        f.write("[HasHeaderRowAtEnd],1,[platform],Windows,[config],Development\n")
+
+
+def benchmark_csvprofile(args: argparse.Namespace) -> int:
+    base_dir = Path(tempfile.mkdtemp(prefix="csvprofile_bench_", dir=args.dir))
+    try:
+        path = base_dir / "capture.csv"
+        _make_synthetic_csv_capture(path, args.frames, args.stats)
+        print(f"{args.frames} frames x {args.stats} stats, {path.stat().st_size / 1024 ** 2:.0f} MB")
+        results = {}
+        for label, use_numpy in (("numpy", True), ("pure python", False)):
+            if use_numpy and np is None:
+                print("numpy: not installed")
+                continue
+            start = time.perf_counter()
+            results[label] = analyze_capture(path, use_numpy=use_numpy)
+            print(f"{label:<12} {time.perf_counter() - start:.2f}s")
+        if len(results) == 2:
+            fast, slow = results["numpy"].stats, results["pure python"].stats
+            mismatched = [name for name in slow if abs(fast[name].p99 - slow[name].p99) > 1e-3 or fast[name].hitches != slow[name].hitches]
+            if mismatched:
+                print(f"FAIL: numpy and pure python disagree on {', '.join(mismatched[:5])}")
+                return 1
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmarks for the automation scripts")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    copy_parser = subparsers.add_parser("copy", help="Copy throughput on a synthetic tree")
+    copy_parser.add_argument("--small-files", type=int, default=5000)
+    copy_parser.add_argument("--small-kb", type=int, default=16)
+    copy_parser.add_argument("--large-files", type=int, default=2)
+    copy_parser.add_argument("--large-mb", type=int, default=2048)
+    copy_parser.add_argument("--dir", type=str, default=None, help="Folder to create the synthetic tree in")
+    copy_parser.set_defaults(func=benchmark_copy)
+
+    startup_parser = subparsers.add_parser("startup", help="Import and launch time of each entry point")
+    startup_parser.add_argument("--runs", type=int, default=5)
+    startup_parser.add_argument("--compare-ref", type=str, default=None,
+                                help="Git ref (e.g. a commit before a change) to measure alongside the working tree")
+    startup_parser.add_argument("--spawn-budget-ms", type=int, default=250,
+                                help="Fail if the headless RunEditor launch takes longer than this (includes interpreter start)")
+    startup_parser.set_defaults(func=benchmark_startup)
+
+    retarget_parser = subparsers.add_parser("retarget", help="Build receipt retargeting on a synthetic project")
+    retarget_parser.add_argument("--plugins", type=int, default=40)
+    retarget_parser.add_argument("--receipts-per-plugin", type=int, default=5)
+    retarget_parser.add_argument("--dir", type=str, default=None, help="Folder to create the synthetic project in")
+    retarget_parser.set_defaults(func=benchmark_retarget)
+
+    materialize_parser = subparsers.add_parser("materialize", help="Symlink materializing on a synthetic link-heavy tree")
+    materialize_parser.add_argument("--packages", type=int, default=50)
+    materialize_parser.add_argument("--files-per-package", type=int, default=40)
+    materialize_parser.add_argument("--links", type=int, default=2000)
+    materialize_parser.add_argument("--dir", type=str, default=None, help="Folder to create the synthetic tree in")
+    materialize_parser.set_defaults(func=benchmark_materialize)
+
+    clean_parser = subparsers.add_parser("clean", help="Serial vs parallel vs trash deletion of an Intermediate-like tree")
+    clean_parser.add_argument("--folders", type=int, default=200)
+    clean_parser.add_argument("--files-per-folder", type=int, default=100)
+    clean_parser.add_argument("--dir", type=str, default=None, help="Folder to create the synthetic tree in")
+    clean_parser.set_defaults(func=benchmark_clean)
+
+    ddc_parser = subparsers.add_parser("ddc", help="DDC scan (serial vs parallel) and LRU prune on a synthetic cache")
+    ddc_parser.add_argument("--files", type=int, default=50000)
+    ddc_parser.add_argument("--dir", type=str, default=None, help="Folder to create the synthetic cache in")
+    ddc_parser.set_defaults(func=benchmark_ddc)
+
+    csvprofile_parser = subparsers.add_parser("csvprofile", help="CSV profiler capture analysis, numpy vs pure python")
+    csvprofile_parser.add_argument("--frames", type=int, default=100000)
+    csvprofile_parser.add_argument("--stats", type=int, default=200)
+    csvprofile_parser.add_argument("--dir", type=str, default=None, help="Folder to write the synthetic capture to")
+    csvprofile_parser.set_defaults(func=benchmark_csvprofile)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    raise SystemExit(args.func(args))
@@ -0,0 +1,197 @@
+# /automation/utils/materialize_symlinks.py
+# Replaces symlinks and junctions below a folder with real copies of what they point to, so the folder
+# can be moved to another machine (npm workspaces fill node_modules with links into the source tree).
+# Usage:
+#   python materialize_symlinks.py [START_PATH] [--what-if] [--jobs N]
+#
+# The tree is walked once with os.scandir (without following links), every link target is resolved once,
+# and links sharing a target reuse its file listing. All files are then copied in one batch by fast_copy's
+# worker pool. Links inside copied targets are dereferenced, so the result contains no links at all.
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Resolve the parent folder and add it to sys.path once
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+sys.path.insert(0, PARENT_DIR)
+
+from common.fast_copy import DEFAULT_MAX_WORKERS, copy_files
+
+_FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+
+
+@dataclass
+class LinkInfo:
+    path: Path
+    # Fully resolved target, None if it is missing or can't be resolved
+    target: Optional[Path]
+    is_dir: bool
+
+
+@dataclass
+class MaterializeReport:
+    links: List[LinkInfo] = field(default_factory=list)
+    skipped: List[LinkInfo] = field(default_factory=list)
+    unique_targets: int = 0
+    files: int = 0
+    bytes: int = 0
+    failed: List[Tuple[Path, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (f"{len(self.links)} link(s) ({self.unique_targets} unique target(s)), {len(self.skipped)} skipped; "
+                f"{self.files} file(s), {self.bytes / (1024 * 1024):.1f} MB copied in {self.seconds:.2f}s"
+                + (f", {len(self.failed)} failed" if self.failed else ""))
+
+
+def _is_link(entry: os.DirEntry) -> bool:
+    if entry.is_symlink():
+        return True
+    # Junctions aren't symlinks to Python before 3.12; they are reparse points
+    attributes = getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+    return bool(attributes & _FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def _resolve_target(link_path: Path) -> Optional[Path]:
+    try:
+        target = Path(os.path.realpath(link_path))
+    except OSError:
+        return None
+    return target if target.exists() and target != link_path else None
+
+
+def find_links(start_path: Path) -> List[LinkInfo]:
+    """All symlinks/junctions below start_path; link targets are not entered."""
+    links: List[LinkInfo] = []
+    stack = [Path(start_path)]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    path = Path(entry.path)
+                    if _is_link(entry):
+                        target = _resolve_target(path)
+                        links.append(LinkInfo(path=path, target=target, is_dir=target is not None and target.is_dir()))
+                    elif entry.is_dir(follow_symlinks=False):
+                        stack.append(path)
+        except OSError as e:
+            print(f"[WARN] Can't read {folder}: {e}")
+    return sorted(links, key=lambda link: str(link.path))
+
+
+def _list_target_files(target: Path) -> Tuple[List[Tuple[str, Path]], List[str]]:
+    """
+    ([(relative path, real source file)], [relative folders]) below target, following links but not into their own
+    ancestors. Sources are real paths, so they stay valid while other links in the tree are being replaced.
+    """
+    files: List[Tuple[str, Path]] = []
+    folders: List[str] = []
+    stack: List[Tuple[Path, str, Tuple[Path, ...]]] = [(target, "", (target,))]
+    while stack:
+        folder, rel_folder, ancestors = stack.pop()
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                rel = f"{rel_folder}/{entry.name}" if rel_folder else entry.name
+                linked = _is_link(entry)
+                if entry.is_dir():
+                    real = Path(os.path.realpath(entry.path)) if linked else Path(entry.path)
+                    if real in ancestors:
+                        print(f"[WARN] Skipping link cycle at {entry.path}")
+                        continue
+                    folders.append(rel)
+                    stack.append((real, rel, ancestors + (real,)))
+                elif entry.is_file():
+                    files.append((rel, Path(os.path.realpath(entry.path)) if linked else Path(entry.path)))
+    return files, folders
+
+
+def _remove_link(link: LinkInfo) -> None:
+    try:
+        os.unlink(link.path)
+    except (IsADirectoryError, PermissionError):
+        # Directory symlinks and junctions on Windows are removed like empty folders
+        os.rmdir(link.path)
+
+
+def materialize_symlinks(
+    start_path: Path,
+    dry_run: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    verbose: bool = True,
+) -> MaterializeReport:
+    start = time.perf_counter()
+    start_path = Path(start_path).resolve()
+    report = MaterializeReport()
+    print(f"Scanning for links under: {start_path}")
+
+    listings: Dict[Path, Tuple[List[Tuple[str, Path]], List[str]]] = {}
+    for link in find_links(start_path):
+        if link.target is None:
+            print(f"[WARN] Skipping {link.path} -- target missing or unresolvable")
+            report.skipped.append(link)
+            continue
+        if link.is_dir and (link.target == start_path or link.target in link.path.parents):
+            print(f"[WARN] Skipping {link.path} -- points at its own parent folder {link.target}")
+            report.skipped.append(link)
+            continue
+        if link.is_dir and link.target not in listings:
+            listings[link.target] = _list_target_files(link.target)
+        report.links.append(link)
+        if verbose:
+            print(f"Materializing {'DIR ' if link.is_dir else 'FILE'} {link.path} --> {link.target}")
+    report.unique_targets = len({link.target for link in report.links})
+
+    pairs: List[Tuple[Path, Path]] = []
+    folders: List[Path] = []
+    for link in report.links:
+        if link.is_dir:
+            files, sub_folders = listings[link.target]
+            folders.append(link.path)
+            folders.extend(link.path / rel for rel in sub_folders)
+            pairs.extend((src, link.path / rel) for rel, src in files)
+        else:
+            pairs.append((link.target, link.path))
+
+    if dry_run:
+        report.files = len(pairs)
+        report.bytes = sum(os.stat(src).st_size for src, _ in pairs)
+        report.seconds = time.perf_counter() - start
+        print("[WhatIf] Nothing changed. " + report.summary().replace("copied", "would be copied"))
+        return report
+
+    # Every listing is taken before the first link is removed, so removing links can't change what gets copied
+    for link in report.links:
+        _remove_link(link)
+    for folder in folders:
+        folder.mkdir(parents=True, exist_ok=True)
+    stats = copy_files(pairs, max_workers=max_workers)
+
+    report.files = stats.files
+    report.bytes = stats.bytes
+    report.failed = stats.failed
+    report.seconds = time.perf_counter() - start
+    for src, error in report.failed:
+        print(f"[ERROR] Failed to copy {src}: {error}")
+    print(report.summary())
+    return report
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replace symlinks/junctions with copies of their targets")
+    parser.add_argument("start_path", nargs="?", default=".", help="Folder to process (default: current folder)")
+    parser.add_argument("--what-if", "--dry-run", dest="what_if", action="store_true", help="Only report what would be materialized")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_MAX_WORKERS, help="Parallel copy workers")
+    parser.add_argument("--quiet", action="store_true", help="Don't list every link")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = materialize_symlinks(Path(args.start_path), dry_run=args.what_if, max_workers=args.jobs, verbose=not args.quiet)
+    raise SystemExit(1 if result.failed else 0)
@@ -0,0 +1,43 @@
+# Summarizes a saved UAT/UBT log: per-phase durations, warning/error counts and the slowest cooked packages.
+# Usage:
+#   python parse_uat_log.py <log file> [--json OUTPUT.json] [--slowest N]
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Resolve the parent folder and add it to sys.path once
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+sys.path.insert(0, PARENT_DIR)
+
+from common.uat_log_parser import DEFAULT_SLOWEST_PACKAGES, parse_log_file, write_summary
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Per-phase summary of a UAT/UBT log")
+    parser.add_argument("log", type=str, help="Log file, e.g. Engine/Programs/AutomationTool/Saved/Logs/Log.txt")
+    parser.add_argument("--json", type=str, default=None, help="Also write the summary as JSON to this file")
+    parser.add_argument("--slowest", type=int, default=DEFAULT_SLOWEST_PACKAGES, help="Number of slowest cooked packages to list")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    log_path = Path(args.log)
+    if not log_path.is_file():
+        print(f"Log file not found: {log_path}")
+        return 1
+
+    summary = parse_log_file(log_path, slowest_packages=args.slowest)
+    print(summary.format())
+    if args.json:
+        write_summary(summary, Path(args.json))
+        print(f"Summary written to {args.json}")
+    return 0 if summary.succeeded is not False else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
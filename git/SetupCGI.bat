@@ -1 +1 @@
-CALL SetupBase.bat cgi
\ No newline at end of file
+CALL "%~dp0SetupBase.bat" cgi %*
\ No newline at end of file
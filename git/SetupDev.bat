@@ -1 +1 @@
-CALL SetupBase.bat dev
\ No newline at end of file
+CALL "%~dp0SetupBase.bat" dev %*
\ No newline at end of file
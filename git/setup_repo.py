@@ -0,0 +1,121 @@
+# Sets up (or clones, or syncs) a dev or CGI checkout for fast git + LFS: hooks, parallel LFS transfers, an optional
+# shared LFS object folder, sparse checkout of the [FilesToCopy] folders, fsmonitor/untracked cache, and the
+# Plugins/ContentPlugins submodule pulled in parallel. Prints the time every step took.
+# Usage:
+#   python setup_repo.py dev|cgi [--repo PATH]                          configure an existing checkout
+#   python setup_repo.py dev|cgi --clone URL --repo PATH [--branch B]   clone, configure and check out
+#   python setup_repo.py dev|cgi --sync [--repo PATH]                   fetch, fast-forward and pull LFS objects
+#   ... [--sparse | --no-sparse]    check out only the [FilesToCopy] folders (default: [GitSetup] SparseModes)
+#
+# --repo defaults to the project this script belongs to. Settings: [GitSetup] in automation/config/project.config
+# (optional). See automation/common/git_setup.py for what is configured and why.
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Resolve the automation folder and add it to sys.path once
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+AUTOMATION_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "automation"))
+sys.path.insert(0, AUTOMATION_DIR)
+
+from common.automation_common import get_project_context, get_project_root
+from common.git_setup import (
+    HOOKS_DIR,
+    MODES,
+    SUBMODULE_PATH,
+    StepTimer,
+    apply_sparse_checkout,
+    checkout,
+    clone,
+    configure_repo,
+    disable_sparse_checkout,
+    fast_forward,
+    git,
+    has_submodule,
+    lfs_available,
+    load_git_setup_settings,
+    pull_in_parallel,
+    read_sparse_folders,
+    uses_lfs,
+    with_submodule_folder,
+)
+
+
+def load_settings():
+    try:
+        config = get_project_context().project_config
+    except RuntimeError:
+        # A fresh machine without project.config: the defaults
+        config = None
+    return load_git_setup_settings(config)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Set up, clone or sync a dev/CGI checkout for fast git + LFS")
+    parser.add_argument("mode", choices=MODES, help="Which hooks (.githooks/<mode>) and defaults to use")
+    parser.add_argument("--repo", type=str, default=None, help="The checkout (default: this script's project)")
+    parser.add_argument("--clone", type=str, default=None, metavar="URL", help="Clone URL into --repo first")
+    parser.add_argument("--branch", type=str, default=None, help="Branch to clone (default: the remote's HEAD)")
+    parser.add_argument("--sync", action="store_true", help="Fetch, fast-forward and pull LFS objects")
+    sparse = parser.add_mutually_exclusive_group()
+    sparse.add_argument("--sparse", dest="sparse", action="store_true", default=None, help="Only check out the [FilesToCopy] folders")
+    sparse.add_argument("--no-sparse", dest="sparse", action="store_false", help="Check out everything")
+    return parser.parse_args()
+
+
+def main(args) -> int:
+    settings = load_settings()
+    if args.clone and not args.repo:
+        raise RuntimeError("--clone needs --repo (where to clone to)")
+    repo = Path(args.repo).resolve() if args.repo else get_project_root()
+    timer = StepTimer()
+
+    try:
+        if args.clone:
+            with timer.step("clone"):
+                clone(args.clone, repo, args.branch, settings.jobs)
+        elif not repo.is_dir() or git(["rev-parse", "--show-toplevel"], repo, check=False).returncode != 0:
+            raise RuntimeError(f"{repo} is not a git checkout")
+
+        with_lfs = uses_lfs(repo)
+        if with_lfs and not lfs_available():
+            raise RuntimeError("The repo uses LFS but git-lfs isn't installed (https://git-lfs.com)")
+
+        with timer.step("configure"):
+            configure_repo(repo, settings, with_lfs, hooks_mode=args.mode)
+
+        sparse = args.sparse if args.sparse is not None else args.mode in settings.sparse_modes
+        if sparse:
+            with timer.step("sparse checkout"):
+                folders = read_sparse_folders(repo)
+                if has_submodule(repo):
+                    folders = with_submodule_folder(folders, SUBMODULE_PATH)
+                apply_sparse_checkout(repo, folders, with_lfs)
+        elif args.sparse is False:
+            disable_sparse_checkout(repo)
+
+        if args.clone:
+            with timer.step("checkout"):
+                checkout(repo)
+        elif args.sync:
+            with timer.step("fetch + fast-forward"):
+                fast_forward(repo)
+        pull_in_parallel(repo, settings, with_lfs, timer)
+    finally:
+        if timer.steps:
+            print(timer.format())
+
+    print(f"Your project will use {HOOKS_DIR}/{args.mode} for its git hooks")
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        sys.exit(main(args))
+    except RuntimeError as e:
+        print(f"[Git setup] {e}")
+        sys.exit(1)
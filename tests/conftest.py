@@ -0,0 +1,36 @@
+# Tests import the automation modules the way the automation scripts do ("from common.x import ...")
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+TESTS_DIR = Path(__file__).resolve().parent
+AUTOMATION_DIR = TESTS_DIR.parent / "automation"
+FAKES_DIR = TESTS_DIR / "fakes"
+DATA_DIR = TESTS_DIR / "data"
+
+if str(AUTOMATION_DIR) not in sys.path:
+    sys.path.insert(0, str(AUTOMATION_DIR))
+
+
+def write_launcher(bin_dir: Path, name: str, script: Path) -> Path:
+    """An executable <name> in bin_dir that runs script with this interpreter, so it can be found on PATH."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    if sys.platform.startswith("win"):
+        launcher = bin_dir / f"{name}.bat"
+        launcher.write_text(f'@"{sys.executable}" "{script}" %*\n', encoding="utf-8")
+    else:
+        launcher = bin_dir / name
+        launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n', encoding="utf-8")
+        launcher.chmod(0o755)
+    return launcher
+
+
+@pytest.fixture
+def fake_bin(tmp_path, monkeypatch) -> Path:
+    """A folder in front of PATH for fake tools."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+    return bin_dir
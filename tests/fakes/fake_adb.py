@@ -0,0 +1,50 @@
+# Stands in for adb in the tests. The devices, the installed APK hashes and the devices whose install fails come
+# from the JSON file in FAKE_ADB_STATE; every call is appended to FAKE_ADB_LOG (one JSON argument list per line).
+#   {"devices": ["SERIAL device product:eureka model:Quest_3"], "installed": {"SERIAL": "<sha256>"}, "fail": ["SERIAL"]}
+import json
+import os
+import sys
+
+
+def main(args):
+    with open(os.environ["FAKE_ADB_STATE"], "r", encoding="utf-8") as f:
+        state = json.load(f)
+    with open(os.environ["FAKE_ADB_LOG"], "a", encoding="utf-8") as f:
+        f.write(json.dumps(args) + "\n")
+
+    if args[:1] == ["devices"]:
+        print("List of devices attached")
+        for line in state.get("devices", []):
+            print(line)
+        print()
+        return 0
+
+    if args[:1] != ["-s"] or len(args) < 3:
+        print(f"fake adb: unsupported command {args}", file=sys.stderr)
+        return 1
+    serial, command = args[1], args[2:]
+    installed = state.get("installed", {}).get(serial)
+
+    if command[:3] == ["shell", "pm", "path"]:
+        if installed is None:
+            return 1
+        print(f"package:/data/app/~~fake/{command[3]}-1/base.apk")
+        return 0
+    if command[:2] == ["shell", "sha256sum"]:
+        print(f"{installed}  {command[2]}")
+        return 0
+    if command[:1] == ["install"]:
+        print("Performing Streamed Install")
+        if serial in state.get("fail", []):
+            print("adb: failed to install: Failure [INSTALL_FAILED_INSUFFICIENT_STORAGE]")
+            # Older adb versions report failures with exit code 0
+            return 0
+        print("Success")
+        return 0
+
+    print(f"fake adb: unsupported command {args}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
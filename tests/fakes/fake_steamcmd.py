@@ -0,0 +1,51 @@
+# Stands in for steamcmd in the tests (steam_depot runs .py stand-ins with the current interpreter).
+# Understands "+login <user> +run_app_build <app_build.vdf> +quit". Every run is appended to FAKE_STEAMCMD_LOG as
+# JSON (arguments, AppID, depot IDs); FAKE_STEAMCMD_RESULT picks the outcome:
+#   success (default)   prints steamcmd's success line with BuildID FAKE_STEAMCMD_BUILD_ID (default 9001)
+#   error               prints an ERROR! line but exits with 0, like steamcmd does for failed commits
+#   exit                exits with code 7
+# FAKE_STEAMCMD_FAILING_BUILDS (comma separated build names, the folder of the app VDF) get "error" whatever the result.
+import json
+import os
+import re
+import sys
+
+
+def main(args):
+    if "+run_app_build" not in args or "+login" not in args:
+        print(f"fake steamcmd: unsupported command {args}")
+        return 1
+    app_vdf = args[args.index("+run_app_build") + 1]
+    with open(app_vdf, "r", encoding="utf-8") as f:
+        text = f.read()
+    app_id = re.search(r'"AppID" "(\d+)"', text).group(1)
+    depot_vdfs = re.findall(r'^\t\t"(\d+)" "(.+)"$', text, re.MULTILINE)
+    for depot_id, path in depot_vdfs:
+        if not os.path.isfile(path):
+            print(f"ERROR! Depot build VDF {path} of depot {depot_id} not found")
+            return 0
+
+    log_path = os.environ.get("FAKE_STEAMCMD_LOG")
+    if log_path:
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"args": args, "app_id": app_id, "depots": [depot_id for depot_id, _ in depot_vdfs],
+                                "preview": '"Preview" "1"' in text}) + "\n")
+
+    print("Redirecting stderr to 'logs/stderr.txt'")
+    print(f"Logging in user '{args[args.index('+login') + 1]}' to Steam Public...OK")
+    print(f"Building depot {depot_vdfs[0][0] if depot_vdfs else '?'}...")
+    result = os.environ.get("FAKE_STEAMCMD_RESULT", "success")
+    build_name = os.path.basename(os.path.dirname(os.path.abspath(app_vdf)))
+    if build_name in os.environ.get("FAKE_STEAMCMD_FAILING_BUILDS", "").split(","):
+        result = "error"
+    if result == "error":
+        print(f"ERROR! Failed to commit build for AppID {app_id} : Failure")
+        return 0
+    if result == "exit":
+        return 7
+    print(f"Successfully finished AppID {app_id} build (BuildID {os.environ.get('FAKE_STEAMCMD_BUILD_ID', '9001')}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
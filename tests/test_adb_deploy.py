@@ -0,0 +1,184 @@
+import configparser
+import json
+import types
+
+import pytest
+
+import package_content_only_android
+from common.adb_deploy import (
+    RESULT_FAILED,
+    RESULT_INSTALLED,
+    RESULT_SKIPPED,
+    file_sha256,
+    get_android_package_name,
+    install_apk,
+    list_devices,
+    parse_devices,
+    select_devices,
+)
+from common.content_fingerprint import ContentFingerprint
+from conftest import FAKES_DIR, write_launcher
+
+PACKAGE_NAME = "com.Studio.Game"
+DEVICES_OUTPUT = """List of devices attached
+* daemon started successfully
+1WMHH0000001   device product:eureka model:Quest_3 device:eureka transport_id:1
+1WMHH0000002   unauthorized usb:1-2 transport_id:2
+"""
+
+
+@pytest.fixture
+def fake_adb(tmp_path, fake_bin, monkeypatch):
+    """Puts the fake adb on PATH. Returns (write_state(state), read_calls())."""
+    write_launcher(fake_bin, "adb", FAKES_DIR / "fake_adb.py")
+    state_path = tmp_path / "adb_state.json"
+    log_path = tmp_path / "adb_calls.log"
+    monkeypatch.setenv("FAKE_ADB_STATE", str(state_path))
+    monkeypatch.setenv("FAKE_ADB_LOG", str(log_path))
+
+    def write_state(state: dict) -> None:
+        state_path.write_text(json.dumps(state), encoding="utf-8")
+
+    def read_calls() -> list:
+        if not log_path.exists():
+            return []
+        return [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+
+    return write_state, read_calls
+
+
+@pytest.fixture
+def apk(tmp_path):
+    path = tmp_path / "Game-arm64.apk"
+    path.write_bytes(b"apk contents" * 1000)
+    return path
+
+
+def _installs(calls: list) -> list:
+    return sorted(call[1] for call in calls if call[2:3] == ["install"])
+
+
+def test_parse_devices_reads_state_and_properties():
+    devices = parse_devices(DEVICES_OUTPUT)
+
+    assert [(device.serial, device.state) for device in devices] == [("1WMHH0000001", "device"), ("1WMHH0000002", "unauthorized")]
+    assert devices[0].model == "Quest_3"
+    assert devices[0].product == "eureka"
+    assert devices[0].label == "1WMHH0000001 (Quest_3)"
+    assert devices[1].label == "1WMHH0000002"
+
+
+def test_select_devices_only_takes_ready_devices():
+    devices = parse_devices(DEVICES_OUTPUT)
+
+    assert [device.serial for device in select_devices(devices)] == ["1WMHH0000001"]
+    assert [device.serial for device in select_devices(devices, ["1WMHH0000001"])] == ["1WMHH0000001"]
+    with pytest.raises(RuntimeError, match="unauthorized"):
+        select_devices(devices, ["1WMHH0000002"])
+    with pytest.raises(RuntimeError, match="not connected"):
+        select_devices(devices, ["UNKNOWN"])
+
+
+def test_get_android_package_name(tmp_path):
+    assert get_android_package_name(tmp_path, "Game") == "com.YourCompany.Game"
+
+    (tmp_path / "Config").mkdir()
+    (tmp_path / "Config" / "DefaultEngine.ini").write_text(
+        "[/Script/Engine.Engine]\nPackageName=com.wrong.section\n\n"
+        "[/Script/AndroidRuntimeSettings.AndroidRuntimeSettings]\nPackageName=\"com.Studio.[PROJECT]\"\n",
+        encoding="utf-8",
+    )
+    assert get_android_package_name(tmp_path, "Game") == "com.Studio.Game"
+
+
+def test_list_devices_runs_adb(fake_adb):
+    write_state, read_calls = fake_adb
+    write_state({"devices": ["SERIAL1 device product:eureka model:Quest_3", "SERIAL2 offline"]})
+
+    devices = list_devices()
+
+    assert [(device.serial, device.state) for device in devices] == [("SERIAL1", "device"), ("SERIAL2", "offline")]
+    assert read_calls() == [["devices", "-l"]]
+
+
+def test_install_apk_skips_up_to_date_devices_and_reports_failures(fake_adb, apk):
+    write_state, read_calls = fake_adb
+    write_state({
+        "devices": ["UPTODATE device model:Quest_3", "OUTDATED device model:Quest_3", "FULL device model:Quest_2"],
+        "installed": {"UPTODATE": file_sha256(apk), "OUTDATED": "0" * 64},
+        "fail": ["FULL"],
+    })
+    devices = select_devices(list_devices())
+
+    results = install_apk(apk, devices, package_name=PACKAGE_NAME, output=lambda line: None)
+
+    assert [(result.device.serial, result.status) for result in results] == [
+        ("UPTODATE", RESULT_SKIPPED), ("OUTDATED", RESULT_INSTALLED), ("FULL", RESULT_FAILED)]
+    assert "INSTALL_FAILED_INSUFFICIENT_STORAGE" in results[2].message
+    assert _installs(read_calls()) == ["FULL", "OUTDATED"]
+
+
+def test_install_apk_force_installs_everywhere(fake_adb, apk):
+    write_state, read_calls = fake_adb
+    write_state({"devices": ["A device", "B device"], "installed": {"A": file_sha256(apk)}})
+
+    results = install_apk(apk, select_devices(list_devices()), package_name=PACKAGE_NAME, force=True, output=lambda line: None)
+
+    assert [result.status for result in results] == [RESULT_INSTALLED, RESULT_INSTALLED]
+    # No hash lookups when forced
+    assert not [call for call in read_calls() if "sha256sum" in call]
+    assert _installs(read_calls()) == ["A", "B"]
+
+
+def test_install_apk_without_devices_fails(apk):
+    with pytest.raises(RuntimeError, match="No Android devices"):
+        install_apk(apk, [], package_name=PACKAGE_NAME, output=lambda line: None)
+
+
+# ---------------------------
+# package_and_install (cook skipped)
+# ---------------------------
+
+@pytest.fixture
+def content_only_project(tmp_path, monkeypatch):
+    """A project whose APK is up to date with its content, so package_and_install only installs."""
+    project_root = tmp_path / "Game"
+    ue_root = tmp_path / "UE"
+    (project_root / "Content").mkdir(parents=True)
+    (project_root / "Content" / "Map.umap").write_bytes(b"map")
+    (project_root / "Binaries" / "Android").mkdir(parents=True)
+    uproject = project_root / "Game.uproject"
+    uproject.write_text("{}", encoding="utf-8")
+    apk_path = project_root / "Binaries" / "Android" / "Game-arm64.apk"
+    apk_path.write_bytes(b"apk contents")
+
+    settings = {
+        "configuration": "Development",
+        "command": " ".join(package_content_only_android.build_content_only_command(ue_root, uproject, "Development")[1:]),
+    }
+    ContentFingerprint(project_root, ue_root, project_root / "Saved" / "Automation" / "ContentFingerprint",
+                       "content_only_android").save(settings, apk_path)
+
+    context = types.SimpleNamespace(project_root=project_root, uproject=uproject, ue_root=ue_root, project_name="Game",
+                                    project_config=configparser.ConfigParser())
+    monkeypatch.setattr(package_content_only_android, "get_project_context", lambda: context)
+    monkeypatch.setattr(package_content_only_android, "apply_ddc_environment", lambda settings: {})
+    monkeypatch.setattr("builtins.input", lambda prompt="": "")
+    return apk_path
+
+
+def test_package_and_install_returns_true_when_the_install_succeeds(fake_adb, content_only_project, capsys):
+    write_state, read_calls = fake_adb
+    write_state({"devices": ["SERIAL1 device model:Quest_3"]})
+
+    assert package_content_only_android.package_and_install("Development") is True
+    assert "Install completed (cook skipped)." in capsys.readouterr().out
+    assert _installs(read_calls()) == ["SERIAL1"]
+
+
+def test_package_and_install_returns_false_when_the_install_fails(fake_adb, content_only_project, capsys):
+    write_state, _ = fake_adb
+    write_state({"devices": ["SERIAL1 device model:Quest_3"], "fail": ["SERIAL1"]})
+
+    assert package_content_only_android.package_and_install("Development") is False
+    assert "Package and install failed: ADB install failed on 1 device(s): SERIAL1" in capsys.readouterr().out
@@ -0,0 +1,205 @@
+import argparse
+import configparser
+import importlib.util
+
+import pytest
+
+from common.git_setup import (
+    GitSetupSettings,
+    apply_sparse_checkout,
+    checkout,
+    clone,
+    configure_repo,
+    disable_sparse_checkout,
+    fast_forward,
+    git,
+    has_submodule,
+    load_git_setup_settings,
+    read_sparse_folders,
+    uses_lfs,
+    with_submodule_folder,
+)
+from conftest import TESTS_DIR
+
+BUILD_CONFIG = """[FilesToCopy]
+paths =
+    Content
+    Config/DefaultGame.ini
+    Game.uproject
+"""
+
+
+def _quiet(line: str) -> None:
+    pass
+
+
+def _load_setup_repo():
+    spec = importlib.util.spec_from_file_location("setup_repo", TESTS_DIR.parent / "git" / "setup_repo.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def git_env(tmp_path, monkeypatch):
+    """No user or system git config, a fixed identity."""
+    global_config = tmp_path / "gitconfig"
+    global_config.write_text("", encoding="utf-8")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(global_config))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for name in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(name, "Build Machine")
+    for name in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(name, "build@example.com")
+
+
+@pytest.fixture
+def remote(tmp_path, git_env):
+    """A bare remote ("git init --bare") with one commit of a small project, and the working copy that pushed it."""
+    bare = tmp_path / "remote.git"
+    git(["init", "--bare", "--initial-branch=main", str(bare)], tmp_path)
+    seed = tmp_path / "seed"
+    files = {
+        "Game.uproject": "{}",
+        "Config/DefaultGame.ini": "[/Script/EngineSettings.GeneralProjectSettings]\n",
+        "Config/automation/build_and_push_to_cgi.config": BUILD_CONFIG,
+        "Content/Maps/Arena.umap": "map",
+        "Source/Game/Game.cpp": "// code",
+    }
+    for rel, text in files.items():
+        (seed / rel).parent.mkdir(parents=True, exist_ok=True)
+        (seed / rel).write_text(text, encoding="utf-8")
+    git(["init", "--initial-branch=main"], seed)
+    git(["add", "-A"], seed)
+    git(["commit", "-m", "Initial"], seed)
+    git(["remote", "add", "origin", str(bare)], seed)
+    git(["push", "-u", "origin", "main"], seed)
+    return bare, seed
+
+
+def _checked_out_files(repo) -> list:
+    return sorted(str(path.relative_to(repo).as_posix()) for path in repo.rglob("*")
+                  if path.is_file() and ".git" not in path.relative_to(repo).parts)
+
+
+def test_load_git_setup_settings():
+    assert load_git_setup_settings(None) == GitSetupSettings()
+
+    config = configparser.ConfigParser()
+    config.read_string("[GitSetup]\nLfsConcurrentTransfers = 32\nFsmonitor = false\nJobs = 8\nSparseModes = cgi, dev\n")
+    settings = load_git_setup_settings(config)
+    assert (settings.lfs_concurrent_transfers, settings.fsmonitor, settings.jobs) == (32, False, 8)
+    assert settings.sparse_modes == ["cgi", "dev"]
+
+
+def test_with_submodule_folder():
+    assert with_submodule_folder(["Content", "Config"], "Plugins/ContentPlugins") == ["Content", "Config", "Plugins/ContentPlugins"]
+    assert with_submodule_folder(["Plugins"], "Plugins/ContentPlugins") == ["Plugins"]
+    assert with_submodule_folder(["Plugins/Other"], "Plugins/ContentPlugins") == ["Plugins/Other"]
+
+
+def test_sparse_clone_checks_out_only_the_files_to_copy(tmp_path, remote):
+    bare, _ = remote
+    repo = tmp_path / "cgi"
+
+    clone(str(bare), repo, "main", jobs=2, output=_quiet)
+    # Nothing is checked out yet: the folders come from HEAD
+    assert read_sparse_folders(repo) == ["Content", "Config"]
+    assert not uses_lfs(repo) and not has_submodule(repo)
+
+    apply_sparse_checkout(repo, read_sparse_folders(repo), with_lfs=False, output=_quiet)
+    checkout(repo, output=_quiet)
+
+    assert _checked_out_files(repo) == ["Config/DefaultGame.ini", "Config/automation/build_and_push_to_cgi.config",
+                                    "Content/Maps/Arena.umap", "Game.uproject"]
+
+    disable_sparse_checkout(repo, output=_quiet)
+    assert (repo / "Source" / "Game" / "Game.cpp").is_file()
+    assert git(["config", "--bool", "core.sparseCheckout"], repo, check=False).stdout.strip() == "false"
+
+
+def test_clone_refuses_a_non_empty_folder(tmp_path, remote):
+    bare, _ = remote
+    (tmp_path / "busy").mkdir()
+    (tmp_path / "busy" / "file.txt").write_text("x", encoding="utf-8")
+
+    with pytest.raises(RuntimeError, match="not empty"):
+        clone(str(bare), tmp_path / "busy", None, jobs=1, output=_quiet)
+
+
+def test_configure_repo_sets_hooks_and_performance_config(tmp_path, remote):
+    bare, _ = remote
+    repo = tmp_path / "dev"
+    clone(str(bare), repo, None, jobs=1, output=_quiet)
+    lines = []
+
+    configure_repo(repo, GitSetupSettings(checkout_workers=3, jobs=5), with_lfs=False, hooks_mode="dev", output=lines.append)
+
+    def config(key):
+        return git(["config", key], repo).stdout.strip()
+
+    assert config("core.hooksPath") == ".githooks/dev"
+    assert (config("core.untrackedCache"), config("checkout.workers"), config("fetch.parallel")) == ("true", "3", "5")
+    assert git(["config", "lfs.concurrenttransfers"], repo, check=False).returncode != 0
+    assert f"[{repo.name}] core.hooksPath = .githooks/dev" in lines
+
+
+def test_fast_forward_pulls_new_commits(tmp_path, remote):
+    bare, seed = remote
+    repo = tmp_path / "dev"
+    clone(str(bare), repo, "main", jobs=1, output=_quiet)
+    checkout(repo, output=_quiet)
+
+    (seed / "Content" / "Maps" / "Lobby.umap").write_text("lobby", encoding="utf-8")
+    git(["add", "-A"], seed)
+    git(["commit", "-m", "Lobby"], seed)
+    git(["push"], seed)
+
+    fast_forward(repo, output=_quiet)
+
+    assert (repo / "Content" / "Maps" / "Lobby.umap").read_text(encoding="utf-8") == "lobby"
+    assert git(["rev-parse", "HEAD"], repo).stdout == git(["rev-parse", "HEAD"], seed).stdout
+
+
+def test_fast_forward_refuses_diverged_history(tmp_path, remote):
+    bare, seed = remote
+    repo = tmp_path / "dev"
+    clone(str(bare), repo, "main", jobs=1, output=_quiet)
+    checkout(repo, output=_quiet)
+    (repo / "local.txt").write_text("local", encoding="utf-8")
+    git(["add", "-A"], repo)
+    git(["commit", "-m", "Local"], repo)
+    (seed / "remote.txt").write_text("remote", encoding="utf-8")
+    git(["add", "-A"], seed)
+    git(["commit", "-m", "Remote"], seed)
+    git(["push"], seed)
+
+    with pytest.raises(RuntimeError, match="merge --ff-only"):
+        fast_forward(repo, output=_quiet)
+
+
+def test_setup_repo_clones_a_cgi_checkout(tmp_path, remote, monkeypatch, capsys):
+    bare, _ = remote
+    setup_repo = _load_setup_repo()
+    monkeypatch.setattr(setup_repo, "load_settings", lambda: GitSetupSettings(jobs=2))
+    repo = tmp_path / "cgi"
+    args = argparse.Namespace(mode="cgi", repo=str(repo), clone=str(bare), branch=None, sync=False, sparse=None)
+
+    assert setup_repo.main(args) == 0
+
+    assert not (repo / "Source").exists()
+    assert (repo / "Content" / "Maps" / "Arena.umap").is_file()
+    assert git(["config", "core.hooksPath"], repo).stdout.strip() == ".githooks/cgi"
+    output = capsys.readouterr().out
+    assert "=== Git setup timings ===" in output
+    for step in ("clone", "configure", "sparse checkout", "checkout"):
+        assert f"  {step:<36} ok" in output
+
+
+def test_setup_repo_rejects_a_folder_that_is_not_a_checkout(tmp_path, git_env, monkeypatch):
+    setup_repo = _load_setup_repo()
+    monkeypatch.setattr(setup_repo, "load_settings", lambda: GitSetupSettings())
+    args = argparse.Namespace(mode="dev", repo=str(tmp_path), clone=None, branch=None, sync=False, sparse=None)
+
+    with pytest.raises(RuntimeError, match="is not a git checkout"):
+        setup_repo.main(args)
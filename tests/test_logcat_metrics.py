@@ -0,0 +1,142 @@
+import csv
+import json
+from datetime import datetime
+
+import pytest
+
+import quest_logcat
+from common.logcat_metrics import (
+    LogcatAnalyzer,
+    RotatingLogFile,
+    parse_logcat_line,
+    parse_metrics,
+    percentile,
+    session_to_dict,
+)
+from conftest import DATA_DIR
+
+# "adb logcat -v threadtime -s UE VrApi" of two app launches, with a streaming hitch in the first one
+CAPTURE = DATA_DIR / "quest_logcat_capture.log"
+YEAR = 2026
+
+
+def _capture_lines():
+    with open(CAPTURE, "r", encoding="utf-8") as f:
+        return f.readlines()
+
+
+@pytest.fixture
+def analyzed():
+    analyzer = LogcatAnalyzer(year=YEAR)
+    samples = [sample for sample in map(analyzer.feed, _capture_lines()) if sample is not None]
+    return samples, analyzer.finish()
+
+
+def test_parse_logcat_line():
+    line = parse_logcat_line(_capture_lines()[3], YEAR)
+
+    assert (line.pid, line.tid, line.level, line.tag) == (4321, 4400, "I", "VrApi")
+    assert line.time == datetime(YEAR, 10, 17, 12, 0, 0, 100000).timestamp()
+    assert line.message.startswith("FPS=72/72,")
+    assert parse_logcat_line("--------- beginning of main", YEAR) is None
+
+
+def test_parse_metrics_reads_every_field():
+    sample = parse_metrics(parse_logcat_line(_capture_lines()[3], YEAR))
+
+    assert (sample.fps, sample.target_fps, sample.stale) == (72, 72, 0)
+    assert (sample.cpu_level, sample.gpu_level) == (4, 4)
+    assert (sample.timewarp_ms, sample.app_gpu_ms, sample.frame_ms) == (2.93, 4.79, 10.2)
+    assert (sample.gpu_util, sample.cpu_util) == (0.71, 0.43)
+    assert (sample.temp_c, sample.free_mb) == (33.0, 2144)
+
+
+def test_parse_metrics_ignores_other_tags():
+    ue_line = parse_logcat_line(_capture_lines()[1], YEAR)
+    assert ue_line.tag == "UE"
+    assert parse_metrics(ue_line) is None
+
+
+def test_capture_splits_sessions_by_pid_and_gap(analyzed):
+    samples, sessions = analyzed
+
+    assert len(samples) == 9
+    assert [(session.index, session.pid, session.samples) for session in sessions] == [(1, 4321, 6), (2, 5555, 3)]
+    assert sessions[0].end - sessions[0].start == pytest.approx(5.0)
+
+
+def test_session_percentiles(analyzed):
+    _, sessions = analyzed
+    frame_ms = sessions[0].metrics["frame_ms"]
+    fps = sessions[0].metrics["fps"]
+
+    # Nearest rank of [10.0, 10.2, 10.3, 10.4, 13.1, 16.8]
+    assert (frame_ms["min"], frame_ms["p50"], frame_ms["p90"], frame_ms["p99"], frame_ms["max"]) == (10.0, 10.3, 16.8, 16.8, 16.8)
+    assert (fps["min"], fps["p50"], fps["max"]) == (58, 72, 72)
+    assert sessions[0].stale_frames == 2
+    assert sessions[1].metrics["cpu_level"]["max"] == 3
+
+
+def test_hitch_markers_carry_the_ue_context(analyzed):
+    _, sessions = analyzed
+    hitches = sessions[0].hitches
+
+    assert [hitch.reason.split(":")[0] for hitch in hitches] == ["58/72 FPS", "UE", "2 stale frame(s)"]
+    assert "Hitch detected: 212 ms" in hitches[1].reason
+    # The UE lines logged before the low-FPS second, oldest first
+    assert [line.split("]")[-1] for line in hitches[0].context] == [
+        "LogInit: Display: Engine is initialized.",
+        "LogStreaming: Display: Loading package /Game/Maps/Arena",
+    ]
+    assert "Hitch detected" in hitches[2].context[-1]
+    assert sessions[1].hitches == []
+
+
+def test_on_hitch_is_called_as_lines_arrive():
+    reported = []
+    analyzer = LogcatAnalyzer(year=YEAR, on_hitch=reported.append)
+    for line in _capture_lines():
+        analyzer.feed(line)
+
+    assert len(reported) == 3
+    assert reported == analyzer.finish()[0].hitches
+
+
+def test_session_to_dict_is_valid_json(analyzed):
+    _, sessions = analyzed
+    session = sessions[0]
+    session.metrics["empty"] = {"min": percentile([], 0), "p50": percentile([], 50)}
+
+    data = json.loads(json.dumps(session_to_dict(session), allow_nan=False))
+    assert data["samples"] == 6
+    assert data["metrics"]["empty"] == {"min": None, "p50": None}
+    assert data["hitches"][0]["reason"] == "58/72 FPS"
+
+
+def test_replay_writes_log_metrics_and_summary(tmp_path, capsys):
+    assert quest_logcat.run_replay(CAPTURE, tmp_path, max_file_mb=1, backups=2) == 0
+
+    assert (tmp_path / quest_logcat.LOG_FILE_NAME).read_text(encoding="utf-8").splitlines() == \
+        [line.rstrip("\n") for line in _capture_lines()]
+    with open(tmp_path / "metrics.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 9
+    assert rows[3]["fps"] == "58.0"
+    summary = json.loads((tmp_path / "summary.json").read_text(encoding="utf-8"))
+    assert [session["samples"] for session in summary["sessions"]] == [6, 3]
+    assert "[Hitch]" in capsys.readouterr().out
+
+
+def test_rotating_log_file_keeps_the_newest_backups(tmp_path):
+    path = tmp_path / "ue-quest.log"
+    log_file = RotatingLogFile(path, max_bytes=200, backups=2)
+    for line in _capture_lines():
+        log_file.write_line(line)
+    log_file.close()
+
+    assert path.stat().st_size <= 200 or len(path.read_text(encoding="utf-8").splitlines()) == 1
+    assert (tmp_path / "ue-quest.log.1").exists()
+    assert (tmp_path / "ue-quest.log.2").exists()
+    assert not (tmp_path / "ue-quest.log.3").exists()
+    # The last line of the capture is in the current file
+    assert path.read_text(encoding="utf-8").splitlines()[-1] == _capture_lines()[-1].rstrip("\n")
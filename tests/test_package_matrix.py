@@ -0,0 +1,55 @@
+import sys
+
+import pytest
+
+import package
+from common.step_scheduler import STATUS_FAILED, STATUS_SUCCEEDED, StepScheduler
+
+BUDGET = package.MatrixBudget(max_jobs=2, cpu=16, memory_gb=64, job_cpu=8, job_memory_gb=24)
+
+
+@pytest.fixture
+def project(tmp_path):
+    includes = tmp_path / "Game" / "Script" / "PackagingIncludes"
+    includes.mkdir(parents=True)
+    (includes / "readme.txt").write_text("include me", encoding="utf-8")
+    return package.GlobalData(project_root=str(tmp_path / "Game"), engine_root=str(tmp_path / "UE"),
+                              runuat_path=str(tmp_path / "UE" / "RunUAT.bat"), project_name="Game")
+
+
+def _steps(global_data, output_dir, lines):
+    jobs = package.plan_matrix(["Win64", "Android"], ["Development"], str(output_dir))
+    steps = package.create_matrix_steps(global_data, jobs, False, BUDGET, output=lines.append)
+    for step in steps:
+        # Stands in for BuildCookRun
+        step.command = [sys.executable, "-c", "pass"]
+    return steps
+
+
+def test_matrix_commands_wait_for_the_uat_and_ubt_mutex(project, tmp_path):
+    steps = package.create_matrix_steps(project, package.plan_matrix(["Win64"], ["Development"], str(tmp_path)), False, BUDGET)
+
+    assert steps[0].command.endswith(" -WaitForUATMutex -ubtargs=-WaitMutex")
+
+
+def test_matrix_jobs_copy_packaging_includes(project, tmp_path):
+    lines = []
+    steps = _steps(project, tmp_path / "Packaged", lines)
+
+    StepScheduler(steps, max_jobs=2, output=lines.append).run()
+
+    assert [step.status for step in steps] == [STATUS_SUCCEEDED, STATUS_SUCCEEDED]
+    assert (tmp_path / "Packaged" / "Win64_Development" / "readme.txt").read_text(encoding="utf-8") == "include me"
+
+
+def test_failed_packaging_includes_copy_fails_the_job(project, tmp_path):
+    # A file where the output folder should be: copying into it raises OSError
+    (tmp_path / "Packaged").write_text("not a folder", encoding="utf-8")
+    lines = []
+    steps = _steps(project, tmp_path / "Packaged", lines)
+
+    with pytest.raises(RuntimeError, match="failed"):
+        StepScheduler(steps, max_jobs=2, output=lines.append).run()
+
+    assert STATUS_FAILED in [step.status for step in steps]
+    assert any("Failed to copy PackagingIncludes" in line for line in lines)
@@ -0,0 +1,84 @@
+import json
+
+from common.receipt_retarget import find_project_roots, retarget_path, retarget_receipts, retarget_text
+
+PROJECT = r"D:\Proj\MyGame"
+ENGINE = r"D:\UE_5.5"
+# The Visual Studio default layout: "source" above the project folder
+FOREIGN_ROOT = r"C:\Users\bob\source\repos\MyGame"
+
+
+def _target(project_root: str, engine_root: str = r"C:\Program Files\Epic Games\UE_5.5") -> dict:
+    return {
+        "TargetName": "MyGame",
+        "Platform": "Android",
+        "ProjectFile": project_root + r"\MyGame.uproject",
+        "BuildProducts": [
+            {"Path": project_root + r"\Binaries\Android\MyGame-arm64.so", "Type": "DynamicLibrary"},
+            {"Path": project_root + r"\Plugins\Foo\Binaries\Android\libFoo.so", "Type": "DynamicLibrary"},
+        ],
+        "RuntimeDependencies": [
+            {"Path": engine_root + r"\Engine\Plugins\Runtime\OpenXR\Config\OpenXR.ini", "Type": "UFS"},
+        ],
+    }
+
+
+def test_find_project_roots():
+    assert find_project_roots(json.dumps(_target(FOREIGN_ROOT))) == [FOREIGN_ROOT]
+    assert find_project_roots(json.dumps({"Paths": ["$(ProjectDir)/MyGame.uproject", "MyGame.uproject"]})) == []
+
+
+def test_paths_below_the_foreign_project_root_keep_their_project_relative_tail():
+    roots = [FOREIGN_ROOT]
+
+    assert retarget_path(FOREIGN_ROOT + r"\Plugins\Foo\Source\Foo\Foo.Build.cs", PROJECT, ENGINE, roots) == \
+        PROJECT + r"\Plugins\Foo\Source\Foo\Foo.Build.cs"
+    assert retarget_path(FOREIGN_ROOT + r"\MyGame.uproject", PROJECT, ENGINE, roots) == PROJECT + r"\MyGame.uproject"
+    assert retarget_path(FOREIGN_ROOT, PROJECT, ENGINE, roots) == PROJECT
+    # Case and slashes don't matter on Windows; the original slash style is kept
+    assert retarget_path("c:/users/bob/SOURCE/repos/mygame/Binaries/Win64/MyGame.exe", "D:/Proj/MyGame", ENGINE, roots) == \
+        "D:/Proj/MyGame/Binaries/Win64/MyGame.exe"
+    # Only whole folder names: MyGame2 is not below MyGame
+    assert retarget_path(r"C:\Users\bob\source\repos\MyGame2\Content\A.uasset", PROJECT, ENGINE, roots) == \
+        PROJECT + r"\source\repos\MyGame2\Content\A.uasset"
+
+
+def test_anchors_still_apply_outside_the_project_root():
+    roots = [FOREIGN_ROOT]
+
+    assert retarget_path(r"C:\Program Files\Epic Games\UE_5.5\Engine\Plugins\Runtime\OpenXR\OpenXR.uplugin", PROJECT, ENGINE, roots) == \
+        ENGINE + r"\Engine\Plugins\Runtime\OpenXR\OpenXR.uplugin"
+    assert retarget_path(r"E:\Build\OtherGame\Plugins\Bar\Bar.uplugin", PROJECT, None, roots) == PROJECT + r"\Plugins\Bar\Bar.uplugin"
+    assert retarget_path(r"C:\Tools\clang\bin\clang.exe", PROJECT, ENGINE, roots) is None
+
+
+def test_retarget_text_takes_the_root_from_its_project_file():
+    text = json.dumps(_target(FOREIGN_ROOT), indent="\t")
+
+    new_text, changed, unmatched = retarget_text(text, PROJECT, ENGINE)
+
+    assert json.loads(new_text) == _target(PROJECT, ENGINE)
+    assert (changed, unmatched) == (4, [])
+
+
+def test_retarget_receipts_uses_the_target_root_for_modules_files(tmp_path):
+    project = tmp_path / "MyGame"
+    binaries = project / "Binaries" / "Android"
+    plugin_binaries = project / "Plugins" / "Foo" / "Binaries" / "Android"
+    binaries.mkdir(parents=True)
+    plugin_binaries.mkdir(parents=True)
+    (project / "Plugins" / "Foo" / "Foo.uplugin").write_text("{}", encoding="utf-8")
+    (binaries / "MyGame.target").write_text(json.dumps(_target(FOREIGN_ROOT), indent="\t"), encoding="utf-8")
+    # No ProjectFile in a .modules file
+    modules = {"BuildId": "1", "Modules": {"Foo": FOREIGN_ROOT + r"\Plugins\Foo\Binaries\Android\libFoo.so"}}
+    (plugin_binaries / "UnrealEditor.modules").write_text(json.dumps(modules, indent="\t"), encoding="utf-8")
+    mtime = (plugin_binaries / "UnrealEditor.modules").stat().st_mtime_ns
+
+    results = retarget_receipts(project, ENGINE)
+
+    assert [result.error for result in results] == [None, None]
+    written = json.loads((plugin_binaries / "UnrealEditor.modules").read_text(encoding="utf-8"))["Modules"]["Foo"]
+    # The receipt's backslashes are kept
+    assert written.replace("\\", "/") == project.as_posix() + "/Plugins/Foo/Binaries/Android/libFoo.so"
+    # Timestamps are kept, UBT compares them
+    assert (plugin_binaries / "UnrealEditor.modules").stat().st_mtime_ns == mtime
@@ -0,0 +1,293 @@
+import argparse
+import configparser
+import json
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+import steam_upload
+from common.steam_depot import (
+    CHUNK_SIZE,
+    diff_depot,
+    load_manifest,
+    load_steam_settings,
+    run_steamcmd,
+    save_manifest,
+    scan_depot,
+    steamcmd_command,
+    write_build_vdfs,
+)
+from conftest import FAKES_DIR
+
+FAKE_STEAMCMD = FAKES_DIR / "fake_steamcmd.py"
+
+
+def _project_config(text: str) -> configparser.ConfigParser:
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return config
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A project with one packaged depot folder and a [Steam] setup pointing at the fake steamcmd."""
+    root = tmp_path / "Game"
+    content = root / "Packaged" / "Windows"
+    (content / "Game" / "Content" / "Paks").mkdir(parents=True)
+    (content / "Game.exe").write_bytes(b"exe" * 1000)
+    (content / "Game.pdb").write_bytes(b"pdb")
+    (content / "Game" / "Content" / "Paks" / "Game-Windows.pak").write_bytes(bytes(range(256)) * (CHUNK_SIZE // 128 + 100))
+    config = _project_config(f"""
+[Steam]
+SteamCmd = {FAKE_STEAMCMD}
+Username = builder
+AppId = 480
+Description = Nightly
+
+[SteamDepot 481]
+ContentRoot = Packaged/Windows
+FileExclusions = *.pdb, Manifest_*.txt
+
+[SteamBuild beta]
+Depots = 481
+SetLive = beta
+""")
+    return root, config
+
+
+@pytest.fixture
+def steamcmd_log(tmp_path, monkeypatch):
+    """Runs of the fake steamcmd, as logged by it."""
+    log_path = tmp_path / "steamcmd_runs.log"
+    monkeypatch.setenv("FAKE_STEAMCMD_LOG", str(log_path))
+
+    def read_runs() -> list:
+        if not log_path.exists():
+            return []
+        return [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+
+    return read_runs
+
+
+# ---------------------------
+# Settings
+# ---------------------------
+
+def test_load_steam_settings(project):
+    root, config = project
+    settings = load_steam_settings(config, root)
+
+    assert (settings.app_id, settings.username, settings.max_parallel_uploads) == ("480", "builder", 1)
+    assert settings.depots["481"].content_root == root / "Packaged" / "Windows"
+    assert settings.depots["481"].exclusions == ["*.pdb", "Manifest_*.txt"]
+    assert [(build.name, build.depot_ids, build.set_live) for build in settings.builds] == [("beta", ["481"], "beta")]
+
+
+def test_load_steam_settings_without_builds_uploads_every_depot(tmp_path):
+    config = _project_config("[Steam]\nAppId = 480\nSetLive = staging\n[SteamDepot 481]\nContentRoot = A\n[SteamDepot 482]\nContentRoot = B\n")
+    settings = load_steam_settings(config, tmp_path)
+
+    assert [(build.name, build.depot_ids, build.set_live) for build in settings.builds] == [("default", ["481", "482"], "staging")]
+
+
+@pytest.mark.parametrize("text, error", [
+    ("[Other]\n", "No \\[Steam\\] section"),
+    ("[Steam]\nAppId = abc\n", "AppId must be a number"),
+    ("[Steam]\nAppId = 480\n", "No depots configured"),
+    ("[Steam]\nAppId = 480\n[SteamDepot 481]\n", "has no ContentRoot"),
+    ("[Steam]\nAppId = 480\n[SteamDepot 481]\nContentRoot = A\n[SteamBuild b]\nDepots = 999\n", "unknown depot"),
+])
+def test_load_steam_settings_errors(tmp_path, text, error):
+    with pytest.raises(RuntimeError, match=error):
+        load_steam_settings(_project_config(text), tmp_path)
+
+
+# ---------------------------
+# Manifests
+# ---------------------------
+
+def test_scan_depot_applies_exclusions_and_reuses_cached_digests(project):
+    root, config = project
+    depot = load_steam_settings(config, root).depots["481"]
+
+    files, hashed = scan_depot(depot, {})
+    assert sorted(files) == ["Game.exe", "Game/Content/Paks/Game-Windows.pak"]
+    assert hashed == sum(f.size for f in files.values())
+    # 2 MB and a bit: three chunks
+    assert len(files["Game/Content/Paks/Game-Windows.pak"].chunks) == 3
+
+    again, hashed_again = scan_depot(depot, files)
+    assert hashed_again == 0
+    assert again == files
+
+
+def test_manifest_round_trip(tmp_path, project):
+    root, config = project
+    files, _ = scan_depot(load_steam_settings(config, root).depots["481"], {})
+    path = tmp_path / "depot_481_uploaded.json"
+
+    save_manifest(path, files, build_id="9001")
+
+    assert load_manifest(path) == (files, {"build_id": "9001"})
+    assert load_manifest(tmp_path / "missing.json") == ({}, {})
+
+
+def test_diff_depot_counts_only_new_chunks(project):
+    root, config = project
+    depot = load_steam_settings(config, root).depots["481"]
+    uploaded, _ = scan_depot(depot, {})
+
+    first = diff_depot("481", None, uploaded)
+    assert first.first_upload and first.changed_bytes == first.total_bytes
+    assert not diff_depot("481", uploaded, uploaded).changed
+
+    # Change the second chunk of the pak, add a file and remove another
+    pak = depot.content_root / "Game" / "Content" / "Paks" / "Game-Windows.pak"
+    data = bytearray(pak.read_bytes())
+    data[CHUNK_SIZE + 10] ^= 0xFF
+    pak.write_bytes(bytes(data))
+    (depot.content_root / "Game.exe").unlink()
+    (depot.content_root / "readme.txt").write_text("hello", encoding="utf-8")
+    current, _ = scan_depot(depot, uploaded)
+
+    diff = diff_depot("481", uploaded, current)
+    assert (diff.added, diff.modified, diff.removed) == (["readme.txt"], ["Game/Content/Paks/Game-Windows.pak"], ["Game.exe"])
+    assert diff.changed_bytes == CHUNK_SIZE + len("hello")
+    assert "1 added, 1 modified, 1 removed" in diff.format()
+
+
+# ---------------------------
+# VDFs and steamcmd
+# ---------------------------
+
+def test_write_build_vdfs(tmp_path, project):
+    root, config = project
+    settings = load_steam_settings(config, root)
+    build_dir = tmp_path / "beta"
+
+    app_vdf = write_build_vdfs(settings, settings.builds[0], build_dir, "Nightly abc123")
+
+    text = app_vdf.read_text(encoding="utf-8")
+    assert '"AppID" "480"' in text and '"Desc" "Nightly abc123"' in text and '"SetLive" "beta"' in text
+    assert f'"481" "{build_dir / "depot_build_481.vdf"}"' in text
+    depot_text = (build_dir / "depot_build_481.vdf").read_text(encoding="utf-8")
+    assert f'"ContentRoot" "{root / "Packaged" / "Windows"}"' in depot_text
+    assert '"FileExclusion" "*.pdb"' in depot_text
+    # Preview builds never set a branch live
+    preview = write_build_vdfs(settings, settings.builds[0], build_dir, "Nightly", preview=True).read_text(encoding="utf-8")
+    assert '"Preview" "1"' in preview and "SetLive" not in preview
+    with pytest.raises(RuntimeError, match="double quotes"):
+        write_build_vdfs(settings, settings.builds[0], build_dir, 'say "hi"')
+
+
+def test_steamcmd_command_runs_py_stand_ins_with_this_interpreter(tmp_path, project):
+    root, config = project
+    settings = load_steam_settings(config, root)
+
+    assert steamcmd_command(settings, tmp_path / "app.vdf") == [
+        sys.executable, str(FAKE_STEAMCMD), "+login", "builder", "+run_app_build", str(tmp_path / "app.vdf"), "+quit"]
+    settings.username = ""
+    with pytest.raises(RuntimeError, match="No Username"):
+        steamcmd_command(settings, tmp_path / "app.vdf")
+
+
+@pytest.mark.parametrize("outcome, succeeded, build_id, returncode", [
+    ("success", True, "9001", 0),
+    ("error", False, "", 0),
+    ("exit", False, "", 7),
+])
+def test_run_steamcmd(tmp_path, project, steamcmd_log, monkeypatch, outcome, succeeded, build_id, returncode):
+    root, config = project
+    settings = load_steam_settings(config, root)
+    command = steamcmd_command(settings, write_build_vdfs(settings, settings.builds[0], tmp_path / "beta", "Nightly"))
+    monkeypatch.setenv("FAKE_STEAMCMD_RESULT", outcome)
+    lines = []
+
+    result = run_steamcmd("beta", command, output=lines.append)
+
+    assert (result.succeeded, result.build_id, result.returncode) == (succeeded, build_id, returncode)
+    assert all(line.startswith("[beta] ") for line in lines)
+    if outcome == "error":
+        assert result.errors == ["ERROR! Failed to commit build for AppID 480 : Failure"]
+    assert [run["depots"] for run in steamcmd_log()] == [["481"]]
+
+
+# ---------------------------
+# steam_upload.py
+# ---------------------------
+
+@pytest.fixture
+def upload(project, monkeypatch):
+    """Runs steam_upload.main for the project; returns (run(**args), the state folder)."""
+    root, config = project
+    context = types.SimpleNamespace(project_root=root, project_config=config)
+    monkeypatch.setattr(steam_upload, "get_project_context", lambda: context)
+
+    def run(**overrides) -> int:
+        args = argparse.Namespace(build=[], dry_run=False, preview=False, force=False, jobs=None, steamcmd=None)
+        for key, value in overrides.items():
+            setattr(args, key, value)
+        return steam_upload.main(args)
+
+    return run, root / "Saved" / "Automation" / "Steam"
+
+
+def test_upload_skips_unchanged_depots(upload, steamcmd_log, capsys):
+    run, state_dir = upload
+
+    assert run() == 0
+    _, info = load_manifest(state_dir / "beta" / "depot_481_uploaded.json")
+    assert (info["build_id"], info["branch"]) == ("9001", "beta")
+
+    assert run() == 0
+    assert len(steamcmd_log()) == 1
+    assert "[beta] Skipped: every depot is identical to its last upload" in capsys.readouterr().out
+
+    assert run(force=True) == 0
+    assert len(steamcmd_log()) == 2
+
+
+def test_failed_upload_keeps_the_previous_manifest(upload, steamcmd_log, monkeypatch):
+    run, state_dir = upload
+    monkeypatch.setenv("FAKE_STEAMCMD_RESULT", "error")
+
+    with pytest.raises(RuntimeError, match="Upload failed for: beta"):
+        run()
+    assert not (state_dir / "beta" / "depot_481_uploaded.json").exists()
+    assert len(steamcmd_log()) == 1
+
+
+def test_dry_run_and_preview_record_nothing(upload, steamcmd_log):
+    run, state_dir = upload
+
+    assert run(dry_run=True) == 0
+    assert steamcmd_log() == []
+    assert (state_dir / "beta" / "app_build.vdf").exists()
+
+    assert run(preview=True) == 0
+    assert [entry["preview"] for entry in steamcmd_log()] == [True]
+    assert not (state_dir / "beta" / "depot_481_uploaded.json").exists()
+
+
+def test_builds_sharing_a_depot_keep_their_own_last_upload(project, upload, steamcmd_log, monkeypatch, capsys):
+    root, config = project
+    config.read_string("[SteamBuild staging]\nDepots = 481\nSetLive = staging\n")
+    run, state_dir = upload
+    monkeypatch.setenv("FAKE_STEAMCMD_FAILING_BUILDS", "staging")
+
+    with pytest.raises(RuntimeError, match="Upload failed for: staging"):
+        run()
+    assert (state_dir / "beta" / "depot_481_uploaded.json").exists()
+    assert not (state_dir / "staging" / "depot_481_uploaded.json").exists()
+    capsys.readouterr()
+
+    # Only the build whose upload failed still has the change
+    monkeypatch.delenv("FAKE_STEAMCMD_FAILING_BUILDS")
+    assert run() == 0
+    # The app VDF's folder is the build
+    assert [Path(entry["args"][3]).parent.name for entry in steamcmd_log()] == ["beta", "staging", "staging"]
+    assert "[beta] Skipped: every depot is identical to its last upload" in capsys.readouterr().out
+    _, info = load_manifest(state_dir / "staging" / "depot_481_uploaded.json")
+    assert info["branch"] == "staging"
@@ -0,0 +1,88 @@
+import sys
+import threading
+
+import pytest
+
+from common.step_scheduler import (
+    STATUS_CACHED,
+    STATUS_CANCELLED,
+    STATUS_FAILED,
+    STATUS_SUCCEEDED,
+    Step,
+    StepScheduler,
+)
+
+
+def _python(code: str) -> list:
+    return [sys.executable, "-c", code]
+
+
+def _run(scheduler: StepScheduler, timeout: float = 30.0):
+    """Runs the scheduler in a thread, so a hang fails the test instead of blocking it."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["wall_clock"] = scheduler.run()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "StepScheduler.run() did not return"
+    return outcome
+
+
+def test_steps_run_in_order_and_succeed():
+    done = []
+    steps = [Step(name, _python("print('hi')"), on_success=lambda step: done.append(step.name)) for name in ("a", "b")]
+
+    outcome = _run(StepScheduler(steps, max_jobs=2, output=lambda line: None))
+
+    assert "error" not in outcome
+    assert [step.status for step in steps] == [STATUS_SUCCEEDED, STATUS_SUCCEEDED]
+    assert done == ["a", "b"]
+
+
+def test_skip_check_marks_the_step_cached():
+    step = Step("cached", _python("raise SystemExit(3)"), skip_check=lambda step: True)
+
+    assert "error" not in _run(StepScheduler([step], output=lambda line: None))
+    assert (step.status, step.returncode) == (STATUS_CACHED, 0)
+
+
+@pytest.mark.parametrize("error", [OSError("disk full"), ValueError("bad receipt")])
+def test_failing_on_success_fails_the_step_instead_of_hanging(error):
+    lines = []
+
+    def on_success(step):
+        raise error
+
+    first = Step("first", _python("pass"), on_success=on_success)
+    second = Step("second", _python("pass"))
+
+    outcome = _run(StepScheduler([first, second], output=lines.append))
+
+    assert "Build step 'first' failed" in str(outcome["error"])
+    assert (first.status, second.status) == (STATUS_FAILED, STATUS_CANCELLED)
+    assert f"[first] Failed: {error}" in lines
+
+
+def test_failing_skip_check_runs_the_step():
+    def skip_check(step):
+        raise OSError("cache unreadable")
+
+    step = Step("step", _python("pass"), skip_check=skip_check)
+
+    assert "error" not in _run(StepScheduler([step], output=lambda line: None))
+    assert step.status == STATUS_SUCCEEDED
+
+
+def test_failed_command_cancels_the_rest():
+    steps = [Step("fails", _python("raise SystemExit(2)")), Step("after", _python("pass"))]
+
+    outcome = _run(StepScheduler(steps, output=lambda line: None))
+
+    assert "failed with exit code 2" in str(outcome["error"])
+    assert [step.status for step in steps] == [STATUS_FAILED, STATUS_CANCELLED]